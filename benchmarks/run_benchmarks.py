@@ -0,0 +1,384 @@
+"""Benchmarks of the optimizer hot paths.
+
+Every benchmark is timed for all combinations of population sizes
+and genome lengths, skipping those with more genes than '--max-genes'.
+Benchmarks of BasePopulation and of evaluation by multiprocessing.Pool,
+which handle every genotype as a separate object, skip combinations
+with more than 1e7 genes.
+Results are written as JSON, with wall time, throughput and peak memory
+of every combination, and can be compared with results of another commit.
+
+Peak memory is the largest amount of memory allocated by the benchmarked
+call on top of the existing population, as traced by tracemalloc.
+Memory of worker processes used by parallel evaluation is not included.
+
+Examples
+--------
+Benchmark the checked out commit and compare it with earlier results::
+
+    python benchmarks/run_benchmarks.py --output new.json --compare old.json
+
+Quick run on small populations::
+
+    python benchmarks/run_benchmarks.py --sizes 1000 --lengths 10 100 --repeat 1
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+#Benchmarks always measure the checked out tree, not an installed package.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pystrand.fitnessfunctions import OneMaxFunction, PowerPolyFitnessFn  # noqa: E402
+from pystrand.operators.crossovers import UniformCrossover  # noqa: E402
+from pystrand.operators.mutations import PointMutation  # noqa: E402
+from pystrand.optimizers import BaseOptimizer  # noqa: E402
+from pystrand.populations import BasePopulation, MatrixPopulation  # noqa: E402
+
+POPULATION_SIZES = [1000, 10000, 100000, 1000000]
+GENOME_LENGTHS = [10, 100, 1000, 10000, 100000]
+MAX_GENES = 10**8
+MAX_OBJECT_GENES = 10**7
+
+
+class Benchmark:
+    """Base benchmark of an operation on a population of binary genomes.
+    Population is restored to the same evaluated state before every run.
+
+    Parameters
+    ----------
+    population_size : int
+    genome_length : int
+    n_workers : int
+        Number of workers used by parallel benchmarks.
+    """
+    name = None
+    population_type = MatrixPopulation
+    max_genes = MAX_GENES
+
+    def __init__(self, population_size, genome_length, n_workers=None):
+        self.population_size = population_size
+        self.genome_length = genome_length
+        self.n_workers = n_workers
+        self.population = self.population_type(
+            population_size, (genome_length,), random_init=True, seed=0)
+        self.optimizer = self._optimizer()
+        self.optimizer.evaluate_population()
+        self._state = [np.copy(array) for array in self.population.to_arrays()]
+
+    def _optimizer(self):
+        return BaseOptimizer(self.population, fitness_function=OneMaxFunction())
+
+    def setup(self):
+        """Restore evaluated population, before the run is timed.
+        """
+        self.optimizer.population.restore_arrays(
+            *[np.copy(array) for array in self._state])
+
+    def run(self):
+        raise NotImplementedError()
+
+    def close(self):
+        self.optimizer.close()
+
+
+class EvaluateSerial(Benchmark):
+    name = 'evaluate_population'
+
+    def run(self):
+        self.optimizer.evaluate_population()
+
+
+class EvaluateParallel(Benchmark):
+    name = 'evaluate_population_parallel'
+
+    def _optimizer(self):
+        optimizer = BaseOptimizer(
+            self.population,
+            fitness_function=OneMaxFunction(),
+            parallelize='shared_memory',
+            n_workers=self.n_workers,
+            evaluation_timeout=600)
+        #Worker processes are kept between runs, as during `fit`.
+        return optimizer.__enter__()
+
+    def run(self):
+        self.optimizer.evaluate_population()
+
+
+class EvaluatePool(Benchmark):
+    name = 'evaluate_population_pool'
+    max_genes = MAX_OBJECT_GENES
+
+    def _optimizer(self):
+        optimizer = BaseOptimizer(
+            self.population,
+            fitness_function=OneMaxFunction(),
+            parallelize=True,
+            n_workers=self.n_workers,
+            evaluation_timeout=600)
+        return optimizer.__enter__()
+
+    def run(self):
+        self.optimizer.evaluate_population()
+
+
+class SelectGenomes(Benchmark):
+    name = 'select_genomes'
+
+    def run(self):
+        self.optimizer.select_genomes()
+
+
+class MutateGenotypes(Benchmark):
+    name = 'mutate_genotypes'
+
+    def run(self):
+        self.optimizer.population.mutate_genotypes(mutation_ops=[PointMutation(0.01)])
+
+
+class CrossGenomes(Benchmark):
+    name = 'cross_genomes'
+
+    def run(self):
+        self.optimizer.population.cross_genomes(
+            crossover_prob=0.5, crossover_op=UniformCrossover())
+
+
+class RetrieveBest(Benchmark):
+    name = 'retrieve_best'
+
+    def run(self):
+        self.optimizer.population.retrieve_best()
+
+
+class EvaluateSerialBase(EvaluateSerial):
+    name = 'evaluate_population_base'
+    population_type = BasePopulation
+    max_genes = MAX_OBJECT_GENES
+
+
+class SelectGenomesBase(SelectGenomes):
+    name = 'select_genomes_base'
+    population_type = BasePopulation
+    max_genes = MAX_OBJECT_GENES
+
+
+class MutateGenotypesBase(MutateGenotypes):
+    name = 'mutate_genotypes_base'
+    population_type = BasePopulation
+    max_genes = MAX_OBJECT_GENES
+
+
+class CrossGenomesBase(CrossGenomes):
+    name = 'cross_genomes_base'
+    population_type = BasePopulation
+    max_genes = MAX_OBJECT_GENES
+
+
+class RetrieveBestBase(RetrieveBest):
+    name = 'retrieve_best_base'
+    population_type = BasePopulation
+    max_genes = MAX_OBJECT_GENES
+
+
+class PowerPolyEvaluation(Benchmark):
+    """Batch evaluation of polynomials with coefficients from [-1, 1],
+    on 16 samples.
+    """
+    name = 'power_poly_fitness'
+
+    def __init__(self, population_size, genome_length, n_workers=None):
+        self.population_size = population_size
+        self.genome_length = genome_length
+        self.genomes = np.random.default_rng(0).uniform(
+            -1.0, 1.0, (population_size, genome_length))
+        self.fitness_function = PowerPolyFitnessFn()
+        self.fitness_function.data = np.linspace(-1.0, 1.0, 16)
+        self.fitness_function.labels = self.fitness_function.data**2
+
+    def setup(self):
+        pass
+
+    def run(self):
+        self.fitness_function.evaluate_batch(self.genomes)
+
+    def close(self):
+        pass
+
+
+BENCHMARKS = {
+    benchmark.name: benchmark for benchmark in [
+        EvaluateSerial, EvaluateParallel, EvaluatePool, SelectGenomes, MutateGenotypes,
+        CrossGenomes, RetrieveBest, EvaluateSerialBase, SelectGenomesBase,
+        MutateGenotypesBase, CrossGenomesBase, RetrieveBestBase, PowerPolyEvaluation]}
+
+
+def measure(benchmark, repeat):
+    """Return times of 'repeat' runs of the benchmark, after a warm up run,
+    and peak memory allocated by one more run.
+    """
+    benchmark.setup()
+    benchmark.run()
+
+    times = []
+    for _ in range(repeat):
+        benchmark.setup()
+        start = time.perf_counter()
+        benchmark.run()
+        times.append(time.perf_counter() - start)
+
+    benchmark.setup()
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return times, peak_memory
+
+
+def run_benchmarks(names, sizes, lengths, repeat=3, max_genes=MAX_GENES, n_workers=None,
+                   verbose=1):
+    """Run benchmarks for every combination of population size and genome length.
+
+    Returns
+    -------
+    list
+        Dictionary of results for every benchmark and combination.
+    """
+    results = []
+    for name in names:
+        for size in sizes:
+            for length in lengths:
+                if size*length > min(max_genes, BENCHMARKS[name].max_genes):
+                    continue
+                benchmark = BENCHMARKS[name](size, length, n_workers=n_workers)
+                try:
+                    times, peak_memory = measure(benchmark, repeat)
+                finally:
+                    benchmark.close()
+
+                best = min(times)
+                result = {
+                    'benchmark': name,
+                    'population_size': size,
+                    'genome_length': length,
+                    'repeat': repeat,
+                    'seconds': best,
+                    'mean_seconds': sum(times) / len(times),
+                    'individuals_per_second': size / best if best > 0 else float('inf'),
+                    'genes_per_second': size*length / best if best > 0 else float('inf'),
+                    'peak_memory_bytes': peak_memory}
+                results.append(result)
+                if verbose > 0:
+                    print(
+                        "{benchmark:<30} {population_size:>8} x {genome_length:<7}"
+                        " {seconds:10.6f} s {individuals_per_second:14.1f} ind/s"
+                        " {peak_memory_bytes:>12} B".format(**result))
+
+    return results
+
+
+def environment():
+    """Return description of the benchmarked commit and the machine.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+            check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()}
+
+
+def compare(results, baseline, threshold):
+    """Print ratios of times to those of baseline results.
+    Return number of results slower than baseline by more than 'threshold'.
+    """
+    baseline_times = {
+        (result['benchmark'], result['population_size'], result['genome_length']):
+            result['seconds']
+        for result in baseline['results']}
+
+    regressions = 0
+    for result in results:
+        key = (result['benchmark'], result['population_size'], result['genome_length'])
+        if key not in baseline_times or baseline_times[key] <= 0:
+            continue
+        ratio = result['seconds'] / baseline_times[key]
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+        print("{:<30} {:>8} x {:<7} {:6.2f}x{}".format(
+            *key, ratio, "  REGRESSION" if regressed else ""))
+
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+        help="Benchmarks to run, all by default.")
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=POPULATION_SIZES,
+        help="Population sizes.")
+    parser.add_argument(
+        '--lengths', nargs='+', type=int, default=GENOME_LENGTHS,
+        help="Genome lengths.")
+    parser.add_argument(
+        '--max-genes', type=int, default=MAX_GENES,
+        help="Skip combinations with more genes in population.")
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help="Number of timed runs, the fastest one is reported.")
+    parser.add_argument(
+        '--n-workers', type=int, default=None,
+        help="Number of workers of parallel evaluation, by default number of CPUs.")
+    parser.add_argument(
+        '--output', default='benchmarks.json',
+        help="File to write results to.")
+    parser.add_argument(
+        '--compare', default=None,
+        help="Results of another commit to compare with.")
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help="Relative slowdown reported as regression.")
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(
+        args.benchmarks, args.sizes, args.lengths, repeat=args.repeat,
+        max_genes=args.max_genes, n_workers=args.n_workers)
+
+    with open(args.output, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
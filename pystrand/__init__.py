@@ -1,10 +1,25 @@
 """Pystrand main module.
+
+Submodules are imported on first access of the attribute of the same name,
+so that importing pystrand doesn't import every dependency.
 """
+import importlib
+
+__all__ = [
+    'genotypes',
+    'models',
+    'optimizers',
+    'populations',
+    'loggers',
+    'operators',
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
-from pystrand import genotypes
-from pystrand import models
-from pystrand import optimizers
-from pystrand import populations
-from pystrand import loggers
-from pystrand import operators
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,128 @@
+"""Caching of fitness values.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FitnessCache:
+    """Bounded cache of fitness values, keyed by genome contents.
+    When full, least recently used records are evicted first.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of stored fitness values.
+        Default is 1024.
+    """
+    def __init__(self, max_size=1024):
+        self._max_size = max_size
+        self._records = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def genome_key(genome):
+        """Return hashable key identifying contents of the genome.
+        Key consists of genome shape, dtype and digest of genome bytes.
+
+        Parameters
+        ----------
+        genome : np.ndarray
+
+        Returns
+        -------
+        tuple
+        """
+        genome = np.ascontiguousarray(genome)
+        digest = hashlib.blake2b(genome.tobytes(), digest_size=16).digest()
+
+        return (genome.shape, genome.dtype.str, digest)
+
+    def get(self, key):
+        """Return cached fitness for the key, or None if it isn't cached.
+        Retrieved record is marked as most recently used.
+        """
+        fitness = self._records.get(key)
+        if fitness is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._records.move_to_end(key)
+
+        return fitness
+
+    def put(self, key, fitness):
+        """Store fitness under the key, evicting least recently used
+        record if the cache is full.
+        """
+        self._records[key] = fitness
+        self._records.move_to_end(key)
+
+        while len(self._records) > self._max_size:
+            self._records.popitem(last=False)
+
+    def fill(self, genomes, fitness):
+        """Set fitness of genomes with cached fitness values.
+        Return dictionary mapping keys of genomes without cached fitness
+        to lists of indices of genomes sharing them.
+
+        Parameters
+        ----------
+        genomes : sequence
+            Genomes of individuals, indexed as 'fitness'.
+        fitness : np.ndarray
+            Fitness values of the individuals, filled in place.
+
+        Returns
+        -------
+        dict
+        """
+        missing = {}
+        for index, genome in enumerate(genomes):
+            key = self.genome_key(genome)
+            cached_fitness = self.get(key)
+            if cached_fitness is None:
+                missing.setdefault(key, []).append(index)
+            else:
+                fitness[index] = cached_fitness
+
+        return missing
+
+    def store(self, missing, results, fitness):
+        """Cache fitness of genomes grouped in 'missing', as returned by `fill`,
+        and set it for all individuals of their groups.
+        Groups without result are left as they are.
+        """
+        for (key, group), result in zip(missing.items(), results):
+            fitness[group] = result
+            self.put(key, float(result))
+
+    def clear(self):
+        """Remove all records and reset counters.
+        """
+        self._records.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def max_size(self):
+        """Return maximum number of stored fitness values.
+        """
+        return self._max_size
+
+    @property
+    def hits(self):
+        """Return number of successful lookups.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """Return number of failed lookups.
+        """
+        return self._misses
@@ -0,0 +1,163 @@
+"""Callbacks called by optimizers during the run.
+
+Callbacks subclass BaseCallback and override the methods of events
+they respond to. They can end the run by calling `stop_run`
+of the optimizer, which takes effect at the end of the generation.
+Callbacks keeping state between generations expose it through `get_state`
+and `set_state`, so that it's saved in checkpoints of the run.
+"""
+import numpy as np
+
+from pystrand.populations import MatrixPopulation
+
+
+def population_diversity(population):
+    """Return mean standard deviation of genes across individuals of population.
+    Diversity of population of identical genomes is 0,
+    that of binary genomes with equally frequent values is 0.5.
+
+    Parameters
+    ----------
+    population : Population
+        Population of genomes sharing one shape.
+
+    Returns
+    -------
+    float
+    """
+    if isinstance(population, MatrixPopulation):
+        genomes = population.genomes
+    else:
+        genomes = np.stack(population.genotypes)
+
+    if genomes.size == 0:
+        return 0.0
+
+    genomes = genomes.reshape(genomes.shape[0], -1)
+
+    return float(np.mean(np.std(genomes, axis=0)))
+
+
+class BaseCallback:
+    """Base callback class, doesn't respond to any event.
+    """
+
+    def on_run_start(self, optimizer):
+        """Called before the first generation of the run is evaluated.
+        """
+
+    def on_generation_start(self, optimizer, iteration):
+        """Called before population of the generation is evaluated.
+        """
+
+    def on_evaluation(self, optimizer, iteration):
+        """Called once population of the generation is evaluated,
+        before its statistics are recorded.
+        """
+
+    def on_generation_end(self, optimizer, iteration, statistics):
+        """Called after statistics of the generation are recorded,
+        before the next generation is bred.
+
+        Parameters
+        ----------
+        optimizer : BaseOptimizer
+        iteration : int
+        statistics : dict
+            Fitness statistics of the generation, as stored in history.
+        """
+
+    def get_state(self):
+        """Return JSON serializable state of the callback,
+        saved in checkpoints of the run. Stateless callbacks return None.
+        """
+        return None
+
+    def set_state(self, state):
+        """Restore state returned by `get_state`, when the run is resumed
+        from checkpoint. Called after `on_run_start`.
+        """
+
+
+class PlateauStopping(BaseCallback):
+    """Stops the run once a fitness statistic didn't improve
+    by more than 'tolerance' for 'patience' generations.
+
+    Parameters
+    ----------
+    patience : int
+        Number of generations without improvement, 10 by default.
+    tolerance : float
+        Smallest change considered an improvement, 0 by default.
+    key : str
+        Statistic to watch, 'max_fitness' by default.
+    """
+    def __init__(self, patience=10, tolerance=0.0, key='max_fitness'):
+        self.patience = patience
+        self.tolerance = tolerance
+        self.key = key
+        self._best = None
+        self._stalled = 0
+
+    def on_run_start(self, optimizer):
+        self._best = None
+        self._stalled = 0
+
+    def get_state(self):
+        return {
+            'best': None if self._best is None else float(self._best),
+            'stalled': self._stalled}
+
+    def set_state(self, state):
+        self._best = state['best']
+        self._stalled = state['stalled']
+
+    def on_generation_end(self, optimizer, iteration, statistics):
+        value = statistics[self.key]
+        if self._best is None or value > self._best + self.tolerance:
+            self._best = value
+            self._stalled = 0
+            return
+
+        self._stalled += 1
+        if self._stalled >= self.patience:
+            optimizer.stop_run(
+                "{} didn't improve for {} generations.".format(self.key, self._stalled))
+
+
+class DiversityStopping(BaseCallback):
+    """Stops the run once diversity of population, as measured
+    by `population_diversity`, stays below 'min_diversity'
+    for 'patience' generations.
+
+    Parameters
+    ----------
+    min_diversity : float
+        0.01 by default.
+    patience : int
+        Number of generations with low diversity, 1 by default.
+    """
+    def __init__(self, min_diversity=0.01, patience=1):
+        self.min_diversity = min_diversity
+        self.patience = patience
+        self._collapsed = 0
+
+    def on_run_start(self, optimizer):
+        self._collapsed = 0
+
+    def get_state(self):
+        return {'collapsed': self._collapsed}
+
+    def set_state(self, state):
+        self._collapsed = state['collapsed']
+
+    def on_evaluation(self, optimizer, iteration):
+        if population_diversity(optimizer.population) >= self.min_diversity:
+            self._collapsed = 0
+            return
+
+        self._collapsed += 1
+        if self._collapsed >= self.patience:
+            optimizer.stop_run(
+                "Diversity below {} for {} generations.".format(
+                    self.min_diversity, self._collapsed))
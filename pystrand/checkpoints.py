@@ -0,0 +1,244 @@
+"""Saving and loading of optimizer checkpoints.
+
+Checkpoint is a directory with two kinds of files. Genome matrix is stored
+in a .npy file, under a unique name starting with the iteration, which can
+be memory mapped when the checkpoint is loaded. Everything else, fitness
+values, protection flags, history and states of random generators,
+is stored in 'state.npz'.
+
+The state file is replaced atomically, after the genome matrix is written,
+and refers to its genome file by name. Checkpoint interrupted while
+being saved leaves the previous one intact. Genome files no longer referred
+to are removed after the state file is replaced.
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from pystrand.genotypes import INDIVIDUAL_DTYPE, Genotype
+
+STATE_FILE = 'state.npz'
+
+
+def generator_state(generator):
+    """Return state of numpy random Generator as a JSON serializable dictionary.
+    """
+    return generator.bit_generator.state
+
+
+def restore_generator_state(generator, state):
+    """Set state of numpy random Generator to one obtained from `generator_state`.
+    """
+    generator.bit_generator.state = state
+
+
+def component_generators(components):
+    """Return numpy random Generators held by 'components', in their order.
+    Generators are looked up in attributes '_rng' and '_random_generator'.
+    """
+    generators = []
+    for component in components:
+        for attribute in ('_rng', '_random_generator'):
+            if isinstance(getattr(component, attribute, None), np.random.Generator):
+                generators.append(getattr(component, attribute))
+
+    return generators
+
+
+def save_checkpoint(path, genomes, arrays, metadata):
+    """Save checkpoint into directory 'path', creating it if necessary.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory.
+    genomes : np.ndarray
+        Genome matrix, stored in separate file.
+    arrays : dict
+        Arrays stored in the state file.
+    metadata : dict
+        JSON serializable values stored in the state file,
+        under key 'iteration' is expected iteration of the optimizer.
+
+    Raises
+    ------
+    ValueError
+        If genome matrix holds Python objects.
+    """
+    if genomes.dtype.hasobject:
+        raise ValueError("Genomes of object type can't be saved.", genomes.dtype)
+    os.makedirs(path, exist_ok=True)
+
+    descriptor, genomes_path = tempfile.mkstemp(
+        suffix='.npy', prefix='genomes-{}-'.format(metadata['iteration']), dir=path)
+    with os.fdopen(descriptor, 'wb') as file:
+        np.save(file, genomes)
+        file.flush()
+        os.fsync(file.fileno())
+    genomes_file = os.path.basename(genomes_path)
+
+    temporary_path = os.path.join(path, STATE_FILE + '.tmp')
+    with open(temporary_path, 'wb') as file:
+        np.savez(
+            file,
+            genomes_file=np.array(genomes_file),
+            metadata=np.array(json.dumps(metadata)),
+            **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, os.path.join(path, STATE_FILE))
+
+    for file_name in os.listdir(path):
+        if file_name.startswith('genomes-') and file_name.endswith('.npy') \
+                and file_name != genomes_file:
+            try:
+                os.remove(os.path.join(path, file_name))
+            except FileNotFoundError:
+                pass
+
+
+def load_checkpoint(path, mmap_mode='c'):
+    """Load checkpoint saved by `save_checkpoint`.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory.
+    mmap_mode : str
+        Memory mapping mode of the genome matrix, as accepted by np.load.
+        'c' by default, the matrix can be altered without changing the file.
+        If None, the matrix is read into memory.
+
+    Returns
+    -------
+    tuple
+        Genome matrix, dictionary of arrays and metadata.
+    """
+    with np.load(os.path.join(path, STATE_FILE)) as state:
+        arrays = {key: state[key] for key in state.files}
+
+    genomes = np.load(
+        os.path.join(path, str(arrays.pop('genomes_file'))),
+        mmap_mode=mmap_mode)
+    metadata = json.loads(str(arrays.pop('metadata')))
+
+    return genomes, arrays, metadata
+
+
+def save_run(path, population, generators, history, metadata,
+             best_individual=None, callbacks=()):
+    """Save state of an optimizer run into checkpoint directory 'path'.
+    State includes population, history, the best individual found so far,
+    states of callbacks and of random generators, along with the global
+    numpy generator, used by BasePopulation and Genotype.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory.
+    population : Population
+        Population exposing `to_arrays`.
+    generators : list
+        Random generators of population and operators, in fixed order.
+    history : dict
+        Recorded part of the run history.
+    metadata : dict
+        JSON serializable values describing the run,
+        under key 'iteration' is expected iteration of the optimizer.
+    best_individual : np.void
+        Best individual of the run, None if there isn't one yet.
+    callbacks : list
+        Callbacks of the run, their states are obtained by `get_state`.
+    """
+    genomes, fitness, protected = population.to_arrays()
+    legacy_state = np.random.get_state()
+    arrays = {
+        'fitness': fitness,
+        'protected': protected,
+        'legacy_random_keys': legacy_state[1]}
+    for key, record in history.items():
+        arrays['history_' + key] = record
+    if best_individual is not None:
+        best_genotype = best_individual['genotype']
+        arrays['best_genome'] = np.asarray(best_genotype)
+        metadata = dict(metadata, best_individual={
+            'fitness': float(best_individual['fitness']),
+            'protected': bool(best_genotype.protected),
+            'gene_vals': np.asarray(best_genotype.gene_vals).tolist()})
+
+    save_checkpoint(
+        path,
+        genomes,
+        arrays,
+        dict(
+            metadata,
+            population=type(population).__name__,
+            callbacks=[callback.get_state() for callback in callbacks],
+            generators=[generator_state(generator) for generator in generators],
+            legacy_random_state=[
+                legacy_state[0], int(legacy_state[2]),
+                int(legacy_state[3]), float(legacy_state[4])]))
+
+
+def load_run(path, population, generators, callbacks=()):
+    """Restore population and states of random generators from checkpoint
+    saved by `save_run`. Return the saved history, metadata and best individual.
+    States of callbacks are returned in metadata, under key 'callbacks'.
+
+    Parameters
+    ----------
+    path : str
+        Checkpoint directory.
+    population : Population
+        Population of the same type as the saved one.
+    generators : list
+        Random generators matching those of the saved run.
+    callbacks : list
+        Callbacks matching those of the saved run.
+
+    Returns
+    -------
+    tuple
+        History, as dictionary of arrays, metadata and the best individual,
+        None if it wasn't saved.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint doesn't match the population, generators or callbacks.
+    """
+    genomes, arrays, metadata = load_checkpoint(path)
+
+    if metadata['population'] != type(population).__name__ \
+            or len(metadata['generators']) != len(generators):
+        raise ValueError(
+            "Checkpoint doesn't match population and operators of the optimizer.",
+            path)
+    if len(metadata['callbacks']) != len(callbacks):
+        raise ValueError("Checkpoint doesn't match callbacks of the optimizer.", path)
+
+    population.restore_arrays(genomes, arrays['fitness'], arrays['protected'])
+    for generator, state in zip(generators, metadata['generators']):
+        restore_generator_state(generator, state)
+    name, position, has_gauss, cached_gaussian = metadata['legacy_random_state']
+    np.random.set_state(
+        (name, arrays['legacy_random_keys'], position, has_gauss, cached_gaussian))
+
+    history = {
+        key[len('history_'):]: record
+        for key, record in arrays.items() if key.startswith('history_')}
+
+    best_individual = None
+    if 'best_genome' in arrays:
+        best = metadata['best_individual']
+        best_individual = np.empty(1, dtype=INDIVIDUAL_DTYPE)[0]
+        best_individual['fitness'] = best['fitness']
+        best_individual['genotype'] = Genotype(
+            arrays['best_genome'].shape,
+            gene_vals=best['gene_vals'],
+            default_genome=arrays['best_genome'],
+            protected=best['protected'])
+
+    return history, metadata, best_individual
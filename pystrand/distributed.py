@@ -0,0 +1,411 @@
+"""Evaluation of fitness functions by worker processes connected over TCP.
+
+Coordinator splits genome matrix into batches and sends them to connected
+workers, which reply with fitness values. Messages are framed by a fixed
+header, consisting of message type, batch identifier and payload size,
+followed by the payload. Arrays are sent as raw bytes preceded
+by their data type and shape.
+
+Workers are started with their own fitness function, only genomes
+and fitness values are sent over the network. Workers send heartbeats
+at regular intervals, batches of workers that disconnect or stop
+sending heartbeats are reassigned to other workers.
+"""
+import collections
+import multiprocessing as mp
+import selectors
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from pystrand.fitnessfunctions import supports_batch
+
+BATCH = 1
+RESULT = 2
+HEARTBEAT = 3
+ERROR = 4
+STOP = 5
+
+_FRAME_HEADER = struct.Struct('!BIQ')
+
+
+def _encode_array(array):
+    """Return bytes of array, preceded by its data type and shape.
+
+    Raises
+    ------
+    ValueError
+        If the array holds Python objects.
+    """
+    if array.dtype.hasobject:
+        raise ValueError("Arrays of objects can't be sent to workers.", array.dtype)
+    dtype = array.dtype.str.encode('ascii')
+
+    return b''.join([
+        struct.pack('!B', len(dtype)),
+        dtype,
+        struct.pack('!B%dQ' % array.ndim, array.ndim, *array.shape),
+        np.ascontiguousarray(array).tobytes()])
+
+
+def _decode_array(payload):
+    """Return array decoded from bytes produced by `_encode_array`.
+    """
+    dtype_size = payload[0]
+    dtype = np.dtype(bytes(payload[1:1 + dtype_size]).decode('ascii'))
+    offset = 1 + dtype_size
+    ndim = payload[offset]
+    shape = struct.unpack_from('!%dQ' % ndim, payload, offset + 1)
+    offset += 1 + 8*ndim
+
+    return np.frombuffer(
+        payload, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+
+
+def _frame(message_type, batch_id=0, payload=b''):
+    """Return message of given type, with header prepended to payload.
+    """
+    return _FRAME_HEADER.pack(message_type, batch_id, len(payload)) + payload
+
+
+class _FrameBuffer:
+    """Accumulates received bytes and splits them into messages.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        self._buffer += data
+
+    def messages(self):
+        """Yield (message_type, batch_id, payload) tuples
+        of completely received messages.
+        """
+        while len(self._buffer) >= _FRAME_HEADER.size:
+            message_type, batch_id, size = _FRAME_HEADER.unpack_from(self._buffer)
+            end = _FRAME_HEADER.size + size
+            if len(self._buffer) < end:
+                return
+            payload = bytes(self._buffer[_FRAME_HEADER.size:end])
+            del self._buffer[:end]
+            yield message_type, batch_id, payload
+
+
+def _receive_exactly(sock, size):
+    """Return exactly 'size' bytes received from 'sock',
+    or None if connection was closed.
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+
+    return bytes(data)
+
+
+def _evaluate_genomes(fitness_function, genomes):
+    """Return fitness values of genomes, with individuals along the first axis.
+    """
+    if supports_batch(fitness_function):
+        return fitness_function.evaluate_batch(genomes.reshape(genomes.shape[0], -1))
+
+    return [fitness_function(genome) for genome in genomes]
+
+
+def run_worker(address, fitness_function, heartbeat_interval=1.0, connect_timeout=10.0):
+    """Connect to coordinator at 'address' and evaluate batches of genomes
+    it sends, until it tells the worker to stop or closes the connection.
+
+    Parameters
+    ----------
+    address : tuple
+        Host and port of the coordinator.
+    fitness_function : BaseFunction
+        Function evaluating the genomes. Genome matrices are passed to
+        'evaluate_batch', if the function evaluates them in batches.
+    heartbeat_interval : float
+        Seconds between heartbeats sent to the coordinator.
+        1 by default.
+    connect_timeout : float
+        Seconds to keep trying to connect to the coordinator.
+        10 by default.
+
+    Raises
+    ------
+    ConnectionError
+        If the coordinator couldn't be reached in time.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address)
+            break
+        except ConnectionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    send_lock = threading.Lock()
+    stopped = threading.Event()
+
+    def send(message):
+        with send_lock:
+            sock.sendall(message)
+
+    def send_heartbeats():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send(_frame(HEARTBEAT))
+            except OSError:
+                return
+
+    heartbeat_thread = threading.Thread(target=send_heartbeats, daemon=True)
+    heartbeat_thread.start()
+
+    try:
+        while True:
+            header = _receive_exactly(sock, _FRAME_HEADER.size)
+            if header is None:
+                return
+            message_type, batch_id, size = _FRAME_HEADER.unpack(header)
+            payload = _receive_exactly(sock, size) if size else b''
+            if payload is None or message_type == STOP:
+                return
+            if message_type != BATCH:
+                continue
+
+            try:
+                fitness = np.asarray(
+                    _evaluate_genomes(fitness_function, _decode_array(payload)), dtype='d')
+            except Exception as exception:
+                send(_frame(ERROR, batch_id, repr(exception).encode('utf-8')))
+            else:
+                send(_frame(RESULT, batch_id, _encode_array(fitness)))
+    finally:
+        stopped.set()
+        sock.close()
+        heartbeat_thread.join()
+
+
+class _Worker:
+    """State of a worker connected to the coordinator.
+    """
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = _FrameBuffer()
+        self.batch = None
+        self.last_seen = time.monotonic()
+
+
+class DistributedEvaluator:
+    """Coordinator evaluating genome matrices by workers connected over TCP.
+    Workers are started by `run_worker`, on any machine able to reach
+    the coordinator, and may connect or disconnect at any time.
+
+    Batches of workers that disconnect, or don't send any message
+    for 'heartbeat_timeout' seconds, are reassigned to other workers.
+    Workers that are alive, but stuck evaluating a batch, are not detected.
+
+    Parameters
+    ----------
+    address : tuple
+        Host and port to listen on, by default ('127.0.0.1', 0),
+        with port chosen by the system.
+    batch_size : int
+        Number of genomes sent to a worker at once.
+        By default genomes are split evenly, into four batches per worker.
+    heartbeat_timeout : float
+        Seconds without a message after which a worker is considered lost.
+        5 by default.
+    """
+    def __init__(self, address=('127.0.0.1', 0), batch_size=None, heartbeat_timeout=5.0):
+        self._batch_size = batch_size
+        self._heartbeat_timeout = heartbeat_timeout
+        self._server = socket.create_server(address)
+        self._server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._workers = {}
+        self._next_batch_id = 0
+
+    def _accept(self):
+        """Accept pending worker connections.
+        """
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except BlockingIOError:
+                return
+            sock.setblocking(True)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._workers[sock] = _Worker(sock)
+            self._selector.register(sock, selectors.EVENT_READ)
+
+    def _drop(self, worker, queue):
+        """Disconnect worker and return its batch, if any, to the queue.
+        """
+        self._selector.unregister(worker.sock)
+        del self._workers[worker.sock]
+        worker.sock.close()
+        if worker.batch is not None:
+            queue.appendleft(worker.batch)
+
+    def _receive(self, worker, queue, pending, fitness):
+        """Process messages received from worker.
+
+        Raises
+        ------
+        RuntimeError
+            If the worker failed to evaluate a batch.
+        """
+        try:
+            data = worker.sock.recv(1 << 16)
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(worker, queue)
+            return
+
+        worker.last_seen = time.monotonic()
+        worker.buffer.feed(data)
+        for message_type, batch_id, payload in worker.buffer.messages():
+            if message_type == ERROR:
+                raise RuntimeError(
+                    "Worker failed to evaluate batch.", payload.decode('utf-8'))
+            if message_type != RESULT:
+                continue
+            if worker.batch is not None and worker.batch[0] == batch_id:
+                worker.batch = None
+            if batch_id in pending:
+                start, stop = pending.pop(batch_id)
+                fitness[start:stop] = _decode_array(payload)
+
+    def evaluate(self, genomes, genome_shape=None, timeout=None):
+        """Evaluate every genome of the matrix by connected workers.
+        Waits for workers to connect, if there are none.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Matrix of flattened genomes, one genome per row.
+        genome_shape : tuple
+            Shape of genomes passed to the fitness function,
+            if it doesn't evaluate them in batches, see `supports_batch`.
+            Flattened genomes are passed by default.
+        timeout : float
+            Seconds to wait for the workers.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of fitness values, one for each genome.
+
+        Raises
+        ------
+        multiprocessing.TimeoutError
+            If evaluation didn't finish in time.
+        RuntimeError
+            If a worker failed to evaluate a batch.
+        """
+        pop_size = genomes.shape[0]
+        if genome_shape is None:
+            genome_shape = genomes.shape[1:]
+        genomes = genomes.reshape((pop_size,) + tuple(genome_shape))
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        self._accept()
+        batch_size = self._batch_size or max(
+            1, -(-pop_size // (4*max(len(self._workers), 1))))
+
+        queue = collections.deque()
+        pending = {}
+        for start in range(0, pop_size, batch_size):
+            batch = (self._next_batch_id, start, min(start + batch_size, pop_size))
+            self._next_batch_id = (self._next_batch_id + 1) % (1 << 32)
+            queue.append(batch)
+            pending[batch[0]] = batch[1:]
+
+        fitness = np.zeros(pop_size)
+        try:
+            while pending:
+                for worker in list(self._workers.values()):
+                    if not queue:
+                        break
+                    if worker.batch is None:
+                        batch_id, start, stop = worker.batch = queue.popleft()
+                        try:
+                            worker.sock.sendall(
+                                _frame(BATCH, batch_id, _encode_array(genomes[start:stop])))
+                        except OSError:
+                            self._drop(worker, queue)
+                        else:
+                            worker.last_seen = time.monotonic()
+
+                wait = self._heartbeat_timeout / 4
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        raise mp.TimeoutError(
+                            "{} of {} genomes not evaluated in time.".format(
+                                sum(stop - start for start, stop in pending.values()),
+                                pop_size))
+
+                for key, _ in self._selector.select(wait):
+                    if key.fileobj is self._server:
+                        self._accept()
+                    elif key.fileobj in self._workers:
+                        self._receive(self._workers[key.fileobj], queue, pending, fitness)
+
+                now = time.monotonic()
+                for worker in list(self._workers.values()):
+                    if worker.batch is not None \
+                            and now - worker.last_seen > self._heartbeat_timeout:
+                        self._drop(worker, queue)
+        finally:
+            #Results of abandoned batches are ignored once they arrive.
+            for worker in self._workers.values():
+                if worker.batch is not None and worker.batch[0] in pending:
+                    worker.batch = None
+
+        return fitness
+
+    def close(self, terminate=False):
+        """Tell workers to stop and close all connections.
+        """
+        for worker in list(self._workers.values()):
+            try:
+                worker.sock.sendall(_frame(STOP))
+            except OSError:
+                pass
+            self._selector.unregister(worker.sock)
+            worker.sock.close()
+        self._workers.clear()
+
+        self._selector.unregister(self._server)
+        self._selector.close()
+        self._server.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def address(self):
+        """Return host and port the coordinator is listening on.
+        """
+        return self._server.getsockname()[:2]
+
+    @property
+    def n_workers(self):
+        """Return number of connected workers.
+        """
+        self._accept()
+        return len(self._workers)
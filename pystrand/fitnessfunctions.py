@@ -1,31 +1,112 @@
 """Fitness function and metrics for use by the Optimizer classes.
 """
+import asyncio
+import threading
+
 import numpy as np
 
 class MSELoss:
     """Simple MSE function.
     """
-    def __call__(self, y, yprime):
-        return np.square(np.subtract(yprime, y)).mean()
+    def __call__(self, y, yprime, axis=None):
+        return np.square(np.subtract(yprime, y)).mean(axis=axis)
 
 class MAXLoss:
     """Simple Max function.
     """
-    def __call__(self, y, yprime):
-        return np.abs(np.subtract(yprime, y)).max()
+    def __call__(self, y, yprime, axis=None):
+        return np.abs(np.subtract(yprime, y)).max(axis=axis)
 
 METRICS = {
     'mse': MSELoss(),
     'max': MAXLoss(),
 }
 
+_POPCOUNT_TABLE = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(packed, axis=-1):
+    """Count set bits of packed binary genomes along given axis.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        Array of uint8, as produced by np.packbits.
+    axis : int
+        Axis along which to count, the last one by default.
+
+    Returns
+    -------
+    np.ndarray
+        Number of set bits.
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed).sum(axis=axis, dtype=np.int64)
+    return _POPCOUNT_TABLE[packed].sum(axis=axis, dtype=np.int64)
+
+
+def hamming_distance(packed, other, axis=-1):
+    """Return number of differing bits of packed binary genomes.
+
+    Parameters
+    ----------
+    packed : np.ndarray
+    other : np.ndarray
+        Packed genomes, broadcastable with 'packed'.
+    axis : int
+        Axis along which to count, the last one by default.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    return popcount(np.bitwise_xor(packed, other), axis=axis)
+
+
+def _packed_dot(packed_genomes, vector):
+    """Return dot products of packed binary genomes with a vector.
+    Bits are processed one plane at a time, so only one eighth
+    of the unpacked genomes is converted to floats at once.
+    """
+    coefficients = np.zeros(packed_genomes.shape[1] * 8)
+    coefficients[:vector.size] = vector
+    coefficients = coefficients.reshape(-1, 8)
+
+    result = np.zeros(packed_genomes.shape[0])
+    for bit in range(8):
+        result += ((packed_genomes >> (7 - bit)) & 1) @ coefficients[:, bit]
+
+    return result
+
+
 class BaseFunction:
     """Base class of test functions.
     """
     def __init__(self, inverted=False):
         self._evaluated = 0
+        self._evaluated_lock = threading.Lock()
         self.inverted = inverted
 
+    def __getstate__(self):
+        """Return state for pickling, without the lock of the counter.
+        """
+        state = self.__dict__.copy()
+        state.pop('_evaluated_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._evaluated_lock = threading.Lock()
+
+    def _count_evaluations(self, n_evaluations):
+        """Add evaluations to the counter.
+        The counter is guarded by a lock, as chunks of population
+        can be evaluated by several threads at once.
+        """
+        with self._evaluated_lock:
+            self._evaluated += n_evaluations
+
     def __call__(self, values):
         """Evaluate function and increment evaluation counter.
         Interface is common to all subclasses of `BaseFunction`,
@@ -43,7 +124,7 @@ class BaseFunction:
             but most usually corresponds to <0,1>
         """
         evaluation = self.__evaluate__(values)
-        self._evaluated += 1
+        self._count_evaluations(1)
 
         if self.inverted:
             evaluation = 1 / (1 + evaluation)
@@ -67,6 +148,92 @@ class BaseFunction:
         """
         return 0.0
 
+    def evaluate_batch(self, genomes):
+        """Evaluate function for every genome in matrix
+        and increment evaluation counter accordingly.
+        The heavy lifting is performed by the __evaluate_batch__ method.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Matrix of flattened genomes, one genome per row.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of evaluations, one for each genome.
+        """
+        evaluation = np.asarray(self.__evaluate_batch__(genomes), dtype='d')
+        self._count_evaluations(genomes.shape[0])
+
+        if self.inverted:
+            evaluation = 1 / (1 + evaluation)
+
+        return evaluation
+
+    def evaluate_packed(self, packed_genomes, genome_size):
+        """Evaluate function for every bit-packed binary genome
+        and increment evaluation counter accordingly.
+        The heavy lifting is performed by the __evaluate_packed__ method.
+
+        Parameters
+        ----------
+        packed_genomes : np.ndarray
+            Matrix of genomes packed by np.packbits, one genome per row.
+        genome_size : int
+            Number of genes in a genome, excluding padding bits.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of evaluations, one for each genome.
+        """
+        evaluation = np.asarray(
+            self.__evaluate_packed__(packed_genomes, genome_size), dtype='d')
+        self._count_evaluations(packed_genomes.shape[0])
+
+        if self.inverted:
+            evaluation = 1 / (1 + evaluation)
+
+        return evaluation
+
+    def __evaluate_packed__(self, packed_genomes, genome_size):
+        """Evaluate the function for every bit-packed genome.
+        Falls back to unpacking genomes and calling __evaluate_batch__,
+        subclasses can override it with a version working on packed bits.
+
+        Parameters
+        ----------
+        packed_genomes : np.ndarray
+            Matrix of genomes packed by np.packbits, one genome per row.
+        genome_size : int
+            Number of genes in a genome, excluding padding bits.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of evaluations, one for each genome.
+        """
+        return self.__evaluate_batch__(
+            np.unpackbits(packed_genomes, axis=1, count=genome_size))
+
+    def __evaluate_batch__(self, genomes):
+        """Evaluate the function for every genome in matrix.
+        Falls back to calling __evaluate__ on each row,
+        subclasses can override it with vectorized version.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Matrix of flattened genomes, one genome per row.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of evaluations, one for each genome.
+        """
+        return [self.__evaluate__(genome) for genome in genomes]
+
     def _optima(self, values):
         """Checks that provided values are among the known optimal points
         (minima or maxima depending on the function and task).
@@ -106,6 +273,147 @@ class BaseFunction:
         return self._optima(values)
 
 
+def _run_coroutine(coroutine):
+    """Run coroutine in a new event loop, blocking until it is done.
+
+    Raises
+    ------
+    RuntimeError
+        If an event loop is already running in the current thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    coroutine.close()
+    raise RuntimeError(
+        "Asynchronous function can't be evaluated synchronously "
+        "while an event loop is running, await 'evaluate_async' instead.")
+
+
+class AsyncBaseFunction(BaseFunction):
+    """Base class of functions evaluated by coroutines,
+    such as those waiting on a simulator service.
+
+    Subclasses implement the coroutine function __evaluate_async__.
+    Optimizers running `fit_async` evaluate multiple genotypes concurrently.
+    Synchronous evaluation, by calling the function, runs the coroutine
+    in a new event loop and can't be used while one is running in the same thread.
+    """
+    async def evaluate_async(self, values):
+        """Await evaluation of the function and increment evaluation counter.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Genotype submitted for evaluation
+
+        Returns
+        -------
+        float
+        """
+        evaluation = await self.__evaluate_async__(values)
+        self._count_evaluations(1)
+
+        if self.inverted:
+            evaluation = 1 / (1 + evaluation)
+
+        return evaluation
+
+    def __evaluate__(self, values):
+        """Evaluate the function in a new event loop, blocking until it is done.
+
+        Raises
+        ------
+        RuntimeError
+            If an event loop is running in the current thread.
+        """
+        return _run_coroutine(self.__evaluate_async__(values))
+
+    def __evaluate_batch__(self, genomes):
+        """Evaluate genomes one after another, in a new event loop.
+
+        Raises
+        ------
+        RuntimeError
+            If an event loop is running in the current thread.
+        """
+        async def evaluate_all():
+            return [await self.__evaluate_async__(genome) for genome in genomes]
+
+        return _run_coroutine(evaluate_all())
+
+    async def __evaluate_async__(self, values):
+        """Evaluate the function at a given point.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Genotype submitted for evaluation
+
+        Returns
+        -------
+        float
+        """
+        return 0.0
+
+
+_FALLBACK_BATCH_EVALUATIONS = (
+    BaseFunction.__evaluate_batch__, AsyncBaseFunction.__evaluate_batch__)
+
+
+def supports_batch(fitness_function):
+    """Return True if fitness function evaluates matrices of flattened genomes
+    by its own `evaluate_batch`. Subclasses of BaseFunction qualify only if they
+    override `__evaluate_batch__` or `evaluate_batch`, the fallback of BaseFunction
+    loses genome shape and bypasses `__call__`. Such functions, like any function
+    without `evaluate_batch`, are called on each genome instead.
+
+    Parameters
+    ----------
+    fitness_function : callable
+
+    Returns
+    -------
+    bool
+    """
+    if not hasattr(fitness_function, 'evaluate_batch'):
+        return False
+    if not isinstance(fitness_function, BaseFunction):
+        return True
+
+    function_type = type(fitness_function)
+
+    return function_type.evaluate_batch is not BaseFunction.evaluate_batch \
+        or function_type.__evaluate_batch__ not in _FALLBACK_BATCH_EVALUATIONS
+
+
+def supports_packed(fitness_function):
+    """Return True if fitness function evaluates bit-packed genomes
+    by its own `evaluate_packed`, or by unpacking them for its own
+    `__evaluate_batch__`.
+
+    Parameters
+    ----------
+    fitness_function : callable
+
+    Returns
+    -------
+    bool
+    """
+    if not hasattr(fitness_function, 'evaluate_packed'):
+        return False
+    if not isinstance(fitness_function, BaseFunction):
+        return True
+
+    function_type = type(fitness_function)
+
+    return function_type.evaluate_packed is not BaseFunction.evaluate_packed \
+        or function_type.__evaluate_packed__ is not BaseFunction.__evaluate_packed__ \
+        or function_type.__evaluate_batch__ not in _FALLBACK_BATCH_EVALUATIONS
+
+
 class SquashedDimsFunction(BaseFunction):
     """
     """
@@ -120,6 +428,12 @@ class SquashedDimsFunction(BaseFunction):
             values = np.sum(values, 1)
         return super().__call__(values)
 
+    def evaluate_batch(self, genomes):
+        if self._squash_strategy == 'splitsum':
+            genomes = np.reshape(genomes, (genomes.shape[0], self._final_dimension, -1))
+            genomes = np.sum(genomes, 2)
+        return super().evaluate_batch(genomes)
+
 
 class DataFitnessFn(BaseFunction):
     """Measure fitness of with against supplied samples and labels.
@@ -169,3 +483,95 @@ class PowerPolyFitnessFn(DataFitnessFn):
     def _get_phenotype(self, genotype):
         phenotype = np.polynomial.Polynomial(genotype)
         return phenotype
+
+    def __evaluate_batch__(self, genomes):
+        """Evaluate polynomials of all genomes on data at once.
+        """
+        predictions = np.polynomial.polynomial.polyval(
+            np.asarray(self.data),
+            np.transpose(genomes))
+
+        return self._metric(predictions, self.labels, axis=1)
+
+
+class OneMaxFunction(BaseFunction):
+    """Fraction of genes matching the target binary genome.
+    Without target, fraction of genes set to 1, known as OneMax.
+
+    Packed genomes are evaluated by counting bits,
+    without unpacking them.
+
+    Parameters
+    ----------
+    target : np.ndarray
+        Binary genome to match, None by default.
+    inverted : bool
+    """
+    def __init__(self, target=None, inverted=False):
+        self._target = None if target is None else np.ravel(target).astype(np.uint8)
+        self._packed_target = None if target is None else np.packbits(self._target)
+        super().__init__(inverted=inverted)
+
+    def __evaluate__(self, values):
+        values = np.ravel(values)
+        if self._target is None:
+            return float(np.count_nonzero(values)) / max(values.size, 1)
+        return float(np.count_nonzero(values == self._target)) / max(values.size, 1)
+
+    def __evaluate_batch__(self, genomes):
+        if self._target is None:
+            matches = np.count_nonzero(genomes, axis=1)
+        else:
+            matches = np.count_nonzero(genomes == self._target, axis=1)
+        return matches / max(genomes.shape[1], 1)
+
+    def __evaluate_packed__(self, packed_genomes, genome_size):
+        if self._target is None:
+            matches = popcount(packed_genomes, axis=1)
+        else:
+            matches = genome_size - hamming_distance(
+                packed_genomes, self._packed_target, axis=1)
+        return matches / max(genome_size, 1)
+
+    def _optima(self, values):
+        return self.__evaluate__(values) == 1.0
+
+
+class KnapsackFunction(BaseFunction):
+    """Weighted sum of selected items, as in the knapsack problem.
+    Each gene of binary genome determines whether an item is selected.
+    Fitness is sum of values of selected items, divided by sum of all values.
+    Selections exceeding the capacity have fitness 0.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Value of every item.
+    weights : np.ndarray
+        Weight of every item, None by default, capacity is not checked.
+    capacity : float
+        Maximum sum of weights of selected items.
+    inverted : bool
+    """
+    def __init__(self, values, weights=None, capacity=None, inverted=False):
+        self._values = np.asarray(values, dtype='d')
+        self._weights = None if weights is None else np.asarray(weights, dtype='d')
+        self._capacity = capacity
+        self._total_value = max(float(np.abs(self._values).sum()), np.finfo('d').tiny)
+        super().__init__(inverted=inverted)
+
+    def __evaluate__(self, values):
+        return float(self.__evaluate_batch__(np.ravel(values)[None, :])[0])
+
+    def __evaluate_batch__(self, genomes):
+        genomes = np.asarray(genomes, dtype=np.uint8)
+        evaluation = (genomes @ self._values) / self._total_value
+        if self._weights is not None and self._capacity is not None:
+            evaluation[(genomes @ self._weights) > self._capacity] = 0.0
+        return evaluation
+
+    def __evaluate_packed__(self, packed_genomes, genome_size):
+        evaluation = _packed_dot(packed_genomes, self._values) / self._total_value
+        if self._weights is not None and self._capacity is not None:
+            evaluation[_packed_dot(packed_genomes, self._weights) > self._capacity] = 0.0
+        return evaluation
@@ -3,6 +3,55 @@
 
 import numpy as np
 
+COMPACT_INT_DTYPES = [np.uint8, np.int8, np.int16, np.int32, np.int64]
+
+#Structured dtype of individuals, pairing fitness with a Genotype.
+INDIVIDUAL_DTYPE = np.dtype([('fitness', 'd'), ('genotype', 'O')])
+
+
+def gene_dtype(gene_vals):
+    """Return the most compact dtype able to represent all gene values exactly.
+    Integral values are stored in the smallest fitting integer type,
+    other values in float32, if it doesn't alter them, or in float64.
+
+    Parameters
+    ----------
+    gene_vals : list
+
+    Returns
+    -------
+    np.dtype
+    """
+    gene_vals = np.asarray(gene_vals)
+
+    if gene_vals.size == 0:
+        return np.dtype(np.float64)
+
+    if np.issubdtype(gene_vals.dtype, np.integer) or (
+            np.isfinite(gene_vals).all() and np.array_equal(gene_vals, np.round(gene_vals))):
+        for dtype in COMPACT_INT_DTYPES:
+            limits = np.iinfo(dtype)
+            if gene_vals.min() >= limits.min and gene_vals.max() <= limits.max:
+                return np.dtype(dtype)
+
+    if np.array_equal(gene_vals.astype(np.float32), gene_vals):
+        return np.dtype(np.float32)
+
+    return np.dtype(np.float64)
+
+
+def resolve_dtype(dtype, gene_vals):
+    """Return dtype of genomes with given gene values.
+    If dtype is 'auto' the most compact one is chosen, see `gene_dtype`.
+    None is returned unchanged.
+    """
+    if dtype is None:
+        return None
+    if isinstance(dtype, str) and dtype == 'auto':
+        return gene_dtype(gene_vals)
+    return np.dtype(dtype)
+
+
 class Genotype(np.ndarray):
     """
     Genotype class, inherits from numpy ndarray and, in many ways,
@@ -17,6 +66,7 @@ class Genotype(np.ndarray):
             seed=0,
             default_genome=None,
             protected=False,
+            dtype=None,
             **kwargs):
         """
         Sets up the instance of the Genotype.
@@ -33,6 +83,10 @@ class Genotype(np.ndarray):
         seed : integer
         default_genome : ndarray
         protected : bool
+        dtype : str, np.dtype
+            Data type of genes. If 'auto' the most compact type
+            able to represent all gene_vals is chosen.
+            None by default, type is inferred by numpy.
 
         Returns
         -------
@@ -41,14 +95,17 @@ class Genotype(np.ndarray):
         """
         if gene_vals is None:
             gene_vals = [0, 1]
+        dtype = resolve_dtype(dtype, gene_vals)
 
         if random_init:
             random_generator = np.random.default_rng(seed=seed)
-            genome = random_generator.choice(gene_vals, shape)
+            genome = random_generator.choice(np.asarray(gene_vals, dtype=dtype), shape)
         elif default_genome is not None:
             genome = default_genome
+            if dtype is not None:
+                genome = np.asarray(genome).astype(dtype, copy=False)
         else:
-            genome = np.zeros(shape)
+            genome = np.zeros(shape, dtype=dtype)
 
         genome = genome.view(cls)
         genome._gene_vals = gene_vals
@@ -112,7 +169,7 @@ class Genotype(np.ndarray):
         """
         if mask is None:
             #Random mask is used if none defined.
-            mask = np.ndarray(self.shape, dtype=bool)
+            mask = np.random.random_sample(self.shape) < 0.5
 
         descendant_genome = self.copy()
         descendant_genome[mask] = partner_genotype[mask]
@@ -125,6 +182,12 @@ class Genotype(np.ndarray):
         """
         return self._gene_vals
 
+    @gene_vals.setter
+    def gene_vals(self, new_value):
+        """Set _gene_vals attribute, possible values of genes.
+        """
+        self._gene_vals = new_value
+
     @property
     def fitness(self):
         """Return _genotype_fitness attribute.
@@ -0,0 +1,99 @@
+"""Histories of optimizer runs.
+
+History is a dictionary of arrays, holding fitness statistics,
+and optionally durations of generation phases, with one record
+for every generation of the run.
+"""
+import contextlib
+import time
+
+import numpy as np
+
+HISTORY_CAPACITY = 64
+
+PHASES = ('evaluation', 'selection', 'mutation', 'crossover', 'logging')
+
+TIMING_KEYS = tuple(phase + '_time' for phase in PHASES) + ('evaluations_per_second',)
+
+
+def allocate_history(capacity, timed=False):
+    """Return history of a run, with records preallocated
+    for 'capacity' generations. If 'timed', history includes
+    durations of generation phases.
+    """
+    history = {
+        "iteration" : np.zeros(capacity, dtype=int),
+        "max_fitness" : np.zeros(capacity),
+        "min_fitness" : np.zeros(capacity),
+        "fitness_avg" : np.zeros(capacity),
+        "fitness_std" : np.zeros(capacity)}
+
+    if timed:
+        for key in TIMING_KEYS:
+            history[key] = np.zeros(capacity)
+
+    return history
+
+
+def restore_history(saved_history, capacity, timed=False):
+    """Return history allocated by `allocate_history`, holding the last
+    'capacity' records of 'saved_history'. Records of keys missing
+    from 'saved_history' are zero.
+    """
+    history = allocate_history(capacity, timed)
+    for key, record in history.items():
+        if key in saved_history:
+            saved = saved_history[key][-capacity:]
+            record[:saved.size] = saved
+
+    return history
+
+
+def grow_history(history):
+    """Return history with doubled capacity of records.
+    """
+    return {
+        key: np.concatenate((record, np.zeros_like(record)))
+        for key, record in history.items()}
+
+
+class PhaseTimer:
+    """Accumulates wall time spent in phases of generations,
+    and number of evaluations, between records of history.
+    """
+    def __init__(self):
+        self._durations = dict.fromkeys(PHASES, 0.0)
+        self._n_evaluations = 0
+
+    def reset(self):
+        """Clear durations of phases and the count of evaluations.
+        """
+        self._durations = dict.fromkeys(PHASES, 0.0)
+        self._n_evaluations = 0
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        """Add wall time spent in the context to the duration of given phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._durations[phase] += time.perf_counter() - start
+
+    def count_evaluations(self, n_evaluations):
+        """Add evaluations to the count.
+        """
+        self._n_evaluations += n_evaluations
+
+    def timings(self):
+        """Return durations of phases and evaluations per second,
+        keyed as in history.
+        """
+        timings = {
+            phase + '_time': duration for phase, duration in self._durations.items()}
+        evaluation_time = self._durations['evaluation']
+        timings['evaluations_per_second'] = \
+            self._n_evaluations / evaluation_time if evaluation_time > 0 else 0.0
+
+        return timings
@@ -0,0 +1,355 @@
+"""Island model, evolving several populations in parallel processes
+with individuals migrating between them.
+"""
+import multiprocessing as mp
+import uuid
+
+import numpy as np
+
+from pystrand.history import allocate_history
+from pystrand.optimizers import BaseOptimizer
+from pystrand.loggers.csv_logger import CsvLogger
+
+MIGRATION_TOPOLOGIES = ('ring', 'random')
+
+
+def _run_island(connection, population, fitness_function, optimizer_kwargs, seed_sequence):
+    """Evolve population of a single island in worker process,
+    following commands received through 'connection'.
+
+    Commands are tuples, starting with command name:
+    ('evolve', n_generations, immigrants, n_emigrants)
+        Replace worst individuals by immigrants, if the population
+        was already evaluated, and evolve it for 'n_generations'.
+        Replies with history of the generations, emigrants and a flag
+        indicating whether the maximal fitness was reached.
+    ('population',)
+        Replies with the current population.
+    ('stop',)
+        Ends the worker.
+
+    Exceptions are sent back as ('error', message) instead of reply.
+    """
+    optimizer = None
+    try:
+        optimizer = BaseOptimizer(
+            population,
+            fitness_function=fitness_function,
+            **optimizer_kwargs)
+        optimizer.seed_generators(seed_sequence)
+        iteration = 0
+        evaluated = False
+
+        while True:
+            command = connection.recv()
+            if command[0] == 'evolve':
+                n_generations, immigrants, n_emigrants = command[1:]
+                if evaluated and immigrants is not None and immigrants.size > 0:
+                    optimizer.population.replace_worst(immigrants)
+
+                records = []
+                for _ in range(n_generations):
+                    records.append(optimizer.step(iteration, breed=evaluated))
+                    evaluated = True
+                    iteration += 1
+                    if records[-1]["max_fitness"] == 1.0:
+                        break
+
+                connection.send((
+                    'evolved',
+                    {key: np.array([record[key] for record in records])
+                     for key in records[0]},
+                    optimizer.population.retrieve_best(n_emigrants),
+                    records[-1]["max_fitness"] == 1.0))
+            elif command[0] == 'population':
+                connection.send(('population', optimizer.population))
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception as exception:
+        connection.send(('error', repr(exception)))
+    finally:
+        if optimizer is not None:
+            optimizer.close()
+        connection.close()
+
+
+def _combine_histories(histories, population_sizes):
+    """Return history of all islands, with statistics of the islands
+    combined as if they formed a single population.
+    Histories are truncated to the shortest one.
+    """
+    n_records = min(history["iteration"].size for history in histories)
+    sizes = np.asarray(population_sizes, dtype='d')[:, None]
+
+    def stack(key):
+        return np.stack([history[key][:n_records] for history in histories])
+
+    averages = stack("fitness_avg")
+    fitness_avg = (sizes * averages).sum(axis=0) / sizes.sum()
+    variances = np.square(stack("fitness_std")) + np.square(averages - fitness_avg)
+
+    return {
+        "iteration": histories[0]["iteration"][:n_records],
+        "max_fitness": stack("max_fitness").max(axis=0),
+        "min_fitness": stack("min_fitness").min(axis=0),
+        "fitness_avg": fitness_avg,
+        "fitness_std": np.sqrt((sizes * variances).sum(axis=0) / sizes.sum())}
+
+
+class IslandOptimizer:
+    """Island model optimizer.
+    Evolves several populations, or islands, in separate worker processes.
+    Every 'migration_interval' generations the islands are synchronized
+    and best individuals of each island migrate to another one,
+    where they replace the worst individuals.
+
+    Islands are evolved by BaseOptimizer instances, constructed
+    in the worker processes with supplied keyword arguments.
+    Population and operators of every island get independent random streams.
+
+    Parameters
+    ----------
+    populations : list
+        Initial populations, one for each island.
+    max_iterations : int
+        Number of generations, negative for unlimited run.
+        0 by default.
+    fitness_function : BaseFunction
+        Has to be picklable, unless processes are started by forking.
+    migration_interval : int
+        Number of generations between migrations.
+        10 by default.
+    migration_size : int
+        Number of individuals leaving each island during migration.
+        1 by default.
+    topology : str
+        Either 'ring', with migrants moving to the next island,
+        or 'random', with migrants moving to a randomly chosen other island,
+        such that every island receives migrants of exactly one island.
+        'ring' by default.
+    seed : int
+        Seed of random streams of the islands and the topology.
+    log_path : str
+        Path for saving history of the combined islands.
+    **kwargs
+        Passed to BaseOptimizer of every island.
+
+    Raises
+    ------
+    ValueError
+        If no populations were supplied.
+        If supplied unknown topology or invalid migration interval.
+    """
+
+    def __init__(self,
+                 populations,
+                 max_iterations=0,
+                 fitness_function=None,
+                 migration_interval=10,
+                 migration_size=1,
+                 topology='ring',
+                 seed=None,
+                 log_path=None,
+                 **kwargs):
+        if len(populations) == 0:
+            raise ValueError("At least one population is required.")
+        if topology not in MIGRATION_TOPOLOGIES:
+            raise ValueError(
+                'Unknown migration topology.',
+                topology)
+        if migration_interval < 1:
+            raise ValueError(
+                'Migration interval must be positive.',
+                migration_interval)
+
+        self._optimizer_uuid = str(uuid.uuid1())
+        self._populations = list(populations)
+        self._max_iterations = max_iterations
+        self._fitness_function = fitness_function
+        self._migration_interval = migration_interval
+        self._migration_size = migration_size
+        self._topology = topology
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seed_sequence.spawn(1)[0])
+        self._optimizer_kwargs = kwargs
+        self._island_histories = []
+        self.logger = CsvLogger(log_path=log_path) if log_path else None
+
+    def _destinations(self):
+        """Return index of destination island for migrants of every island.
+        """
+        n_islands = len(self._populations)
+        if self._topology == 'ring' or n_islands < 2:
+            return (np.arange(n_islands) + 1) % n_islands
+
+        #Random cyclic order of the islands, every island receives
+        #migrants of exactly one other island.
+        order = self._rng.permutation(n_islands)
+        destinations = np.empty(n_islands, dtype=int)
+        destinations[order] = np.roll(order, -1)
+        return destinations
+
+    @staticmethod
+    def _receive(connection, expected):
+        """Return reply received through 'connection'.
+
+        Raises
+        ------
+        RuntimeError
+            If the island failed, or ended unexpectedly.
+        """
+        try:
+            reply = connection.recv()
+        except EOFError as exception:
+            raise RuntimeError("Island worker ended unexpectedly.") from exception
+        if reply[0] != expected:
+            raise RuntimeError("Island worker failed.", *reply[1:])
+        return reply[1:]
+
+    def fit(self, fitnes_function=None, verbose=1):
+        """Evolve the islands, migrating individuals between them.
+        Run ends once 'max_iterations' generations were evolved,
+        or maximal fitness was reached on any island.
+        Return statistics of all islands combined, as dictionary of arrays.
+
+        Parameters
+        ----------
+        fitness_function: BaseFunction
+
+        verbose : int
+            If not '0' outputs combined statistics using print after every migration.
+            Default is 1.
+
+        Raises
+        ------
+        RuntimeError
+            If no fitness function was supplied, or an island failed.
+        """
+        if fitnes_function:
+            self._fitness_function = fitnes_function
+        elif not self._fitness_function:
+            raise RuntimeError("No fitness function supplied")
+
+        run_id = uuid.uuid1()
+        n_islands = len(self._populations)
+        island_seeds = self._seed_sequence.spawn(n_islands)
+        connections = []
+        workers = []
+
+        try:
+            for population, island_seed in zip(self._populations, island_seeds):
+                connection, worker_connection = mp.Pipe()
+                worker = mp.Process(
+                    target=_run_island,
+                    args=(
+                        worker_connection, population, self._fitness_function,
+                        self._optimizer_kwargs, island_seed),
+                    daemon=True)
+                worker.start()
+                worker_connection.close()
+                connections.append(connection)
+                workers.append(worker)
+
+            histories = [[] for _ in range(n_islands)]
+            immigrants = [None] * n_islands
+            iteration = 0
+            solved = False
+
+            while iteration != self._max_iterations and not solved:
+                n_generations = self._migration_interval
+                if self._max_iterations > 0:
+                    n_generations = min(n_generations, self._max_iterations - iteration)
+
+                for connection, island_immigrants in zip(connections, immigrants):
+                    connection.send(
+                        ('evolve', n_generations, island_immigrants, self._migration_size))
+
+                emigrants = []
+                for island, connection in enumerate(connections):
+                    history, island_emigrants, island_solved = self._receive(
+                        connection, 'evolved')
+                    histories[island].append(history)
+                    emigrants.append(island_emigrants)
+                    solved = solved or island_solved
+
+                immigrants = [None] * n_islands
+                for source, destination in enumerate(self._destinations()):
+                    immigrants[destination] = emigrants[source]
+
+                iteration += n_generations
+
+                if verbose > 0:
+                    combined = _combine_histories(
+                        [history[-1] for history in histories],
+                        [population.population_size for population in self._populations])
+                    print(" // ".join(
+                        [key + ": " + str(record[-1]) for key, record in combined.items()]))
+
+            for connection in connections:
+                connection.send(('population',))
+            self._populations = [
+                self._receive(connection, 'population')[0] for connection in connections]
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(('stop',))
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+
+        self._island_histories = [
+            {key: np.concatenate([record] + [chunk[key] for chunk in chunks])
+             for key, record in allocate_history(0).items()}
+            for chunks in histories]
+        history = _combine_histories(
+            self._island_histories,
+            [population.population_size for population in self._populations])
+
+        if self.logger:
+            self.logger.save_history(history, run_id=run_id)
+
+        return history
+
+    def retrieve_best(self, size=1):
+        """Return 'n' individuals with highest value of fitness,
+        from all islands, ordered by ascending fitness.
+
+        Parameters
+        ----------
+        size : int
+
+        Returns
+        -------
+        np.ndarray
+        """
+        best = np.concatenate([
+            population.retrieve_best(size) for population in self._populations])
+
+        order = np.argsort(best['fitness'], kind='stable')
+
+        return best[order[order.size - min(max(size, 0), order.size):]]
+
+    @property
+    def populations(self):
+        """Return populations of the islands.
+        """
+        return self._populations
+
+    @property
+    def island_histories(self):
+        """Return statistics of the last run, separately for every island.
+        """
+        return self._island_histories
+
+    @property
+    def optimizer_uuid(self):
+        """Return uuid of the optimizer.
+        """
+        return self._optimizer_uuid
@@ -1,5 +1,34 @@
 """Module for loggers.
+
+Logger classes are imported from their submodules on first access.
 """
-from .base import BaseLogger
-from .csv_logger import CsvLogger
-from .details import RunDetails
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+#Declares the lazily provided names for static analysis, without importing them.
+if TYPE_CHECKING:
+    from .base import BaseLogger
+    from .csv_logger import CsvLogger
+    from .details import RunDetails
+    from .stream_logger import StreamLogger
+
+_LOGGERS = {
+    'BaseLogger': 'base',
+    'CsvLogger': 'csv_logger',
+    'RunDetails': 'details',
+    'StreamLogger': 'stream_logger',
+}
+
+__all__ = list(_LOGGERS)
+
+
+def __getattr__(name):
+    if name in _LOGGERS:
+        return getattr(importlib.import_module('.' + _LOGGERS[name], __name__), name)
+    if name in _LOGGERS.values():
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LOGGERS) | set(_LOGGERS.values()))
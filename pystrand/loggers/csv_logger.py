@@ -1,5 +1,4 @@
 import os
-import pandas as pd
 
 from pystrand.loggers.base import BaseLogger
 
@@ -20,6 +19,9 @@ class CsvLogger(BaseLogger):
 
         path_to_file = os.path.join(self.log_path, log_file_name)
 
+        #pandas is imported only once history is saved.
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
         log = pd.DataFrame(data=data)
 
         try:
@@ -24,6 +24,9 @@ class RunDetails(BaseLogger):
             if '_selection_prob' in dir(selection_op):
                 details['selection_prob'] = selection_op._selection_prob
 
+            if '_tournament_size' in dir(selection_op):
+                details['tournament_size'] = selection_op._tournament_size
+
             return details
 
         run_details = {
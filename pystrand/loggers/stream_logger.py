@@ -0,0 +1,90 @@
+import csv
+import os
+import time
+
+from pystrand.loggers.base import BaseLogger
+
+class StreamLogger(BaseLogger):
+    """Appends history to a csv file one generation at a time,
+    while the run is in progress.
+
+    Rows are written through a buffered file and flushed to disk
+    at most every 'flush_interval' seconds, so that the log can be
+    followed during the run. Only the write buffer is held in memory.
+    Files have the same layout as those written by CsvLogger,
+    with row numbers in the first column.
+
+    Parameters
+    ----------
+    log_path : str
+        Directory of the log files.
+    log_file_name : str
+        Prefix of the log file names, 'history' by default.
+    flush_interval : float
+        Seconds between flushes of the buffered rows.
+        1 by default, if 0 every row is flushed as soon as it is written.
+    buffer_size : int
+        Size of the write buffer in bytes, by default chosen by `open`.
+    """
+    def __init__(self, log_path, log_file_name='history', flush_interval=1.0, buffer_size=-1):
+        super().__init__(log_path, log_file_name)
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._file = None
+        self._writer = None
+        self._n_rows = 0
+        self._last_flush = 0.0
+
+    def open(self, run_id, fieldnames):
+        """Create log file for run with given id and write the header.
+        Previously opened file is closed.
+        Raises PermissionError if denied access.
+        """
+        self.close()
+
+        log_file_name = "{0}_{1}.log".format(
+            self.log_file_name,
+            run_id)
+
+        self._file = open(
+            os.path.join(self.log_path, log_file_name),
+            'w',
+            buffering=self.buffer_size,
+            newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([''] + list(fieldnames))
+        self._n_rows = 0
+        self._last_flush = time.monotonic()
+
+    def write_record(self, record):
+        """Append row of values to the open log file,
+        flushing the buffer if the flush interval elapsed.
+        """
+        self._writer.writerow([self._n_rows] + list(record))
+        self._n_rows += 1
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def flush(self):
+        """Write buffered rows to the log file.
+        """
+        if self._file is not None:
+            self._file.flush()
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush buffered rows and close the log file, if one is open.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    @property
+    def is_open(self):
+        """Return True if a log file is open for writing.
+        """
+        return self._file is not None
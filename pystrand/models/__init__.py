@@ -1,4 +1,17 @@
 """Model classes with fit/predict interface
+
+Submodules are imported on first access.
 """
-from . import polymodels
-from . import base_models
+import importlib
+
+__all__ = ['polymodels', 'base_models']
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
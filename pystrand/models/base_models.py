@@ -21,11 +21,13 @@ class BaseModel:
         gene_vals = kwargs.get('gene_vals', inferred_parameters['gene_vals'])
         kwargs['parallelize'] = kwargs.get('parallelize', True)
         max_iterations = kwargs.pop('max_iterations', -1)
+        dtype = kwargs.pop('dtype', None)
 
         population = BasePopulation(
             population_size,
             genome_shapes=genome_shapes,
-            gene_vals=gene_vals)
+            gene_vals=gene_vals,
+            dtype=dtype)
 
         self._optimizer = BaseOptimizer(
             population,
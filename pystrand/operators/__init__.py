@@ -2,9 +2,13 @@
 
 Contains genetic operators used by optimizers.
 """
+from .crossovers import (
+    BaseCrossover, UniformCrossover, OnePointCrossover,
+    TwoPointCrossover)
 from .mutations import (
     BaseMutation, PermutationMutation, PointMutation,
     BlockMutation, ShiftMutation)
 from .selections import (
     BaseSelection, RandomSelection, RouletteSelection,
+    StochasticUniversalSelection, TournamentSelection,
     ElitismSelection)
@@ -0,0 +1,218 @@
+"""Crossover operators
+"""
+import numpy as np
+
+
+class BaseCrossover:
+    """Defines base crossover operator.
+    Individuals are paired with randomly chosen partners and replaced
+    by their offspring. Offspring inherits genes of the partner
+    on positions where crossover mask is True, and genes of the
+    original individual everywhere else.
+
+    Subclasses define shape of the mask by implementing __mask__.
+    """
+    def __init__(self):
+        """Set up random generator to be used by crossover operator.
+        """
+        self._random_generator = np.random.default_rng()
+
+    def __mask__(self, n_offspring, genome_size):
+        """Return boolean crossover masks for 'n_offspring' flattened genomes.
+        """
+        raise NotImplementedError()
+
+    def mask(self, n_offspring, genome_size):
+        """Generate crossover masks for all offspring at once.
+
+        Parameters
+        ----------
+        n_offspring : int
+        genome_size : int
+            Number of genes in flattened genome.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array of shape (n_offspring, genome_size).
+        """
+        return self.__mask__(n_offspring, genome_size)
+
+    def __packed_mask__(self, n_offspring, genome_size):
+        """Return crossover masks for 'n_offspring' bit-packed genomes.
+        Default implementation packs masks generated by __mask__.
+        """
+        return np.packbits(self.mask(n_offspring, genome_size), axis=1)
+
+    def cross_batch(self, genomes, crossover_prob, protected=None, partner_genomes=None):
+        """Cross genomes of the whole population at once.
+        Every genome is replaced by offspring with probability 'crossover_prob',
+        protected genomes are left unchanged.
+        Partners are drawn from the genomes as they were before the crossover.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            C-contiguous array of genomes, with individuals along the first axis.
+            Genomes are altered in place.
+        crossover_prob : float
+        protected : np.ndarray
+            Boolean vector of protection flags, one for each genome.
+            None by default, every genome can be crossed.
+        partner_genomes : np.ndarray
+            Array of genomes to draw partners from.
+            None by default, partners are drawn from 'genomes'.
+
+        Raises
+        ------
+        ValueError
+            If genomes array isn't C-contiguous.
+        """
+        if not genomes.flags.c_contiguous:
+            raise ValueError("Genomes array must be C-contiguous.")
+        if genomes.size == 0:
+            return
+
+        flat_genomes = genomes.reshape(genomes.shape[0], -1)
+        if partner_genomes is None:
+            flat_partners = flat_genomes
+        else:
+            flat_partners = partner_genomes.reshape(partner_genomes.shape[0], -1)
+
+        selected = self._random_generator.random(genomes.shape[0]) < crossover_prob
+        if protected is not None:
+            selected &= ~protected
+
+        indices = np.flatnonzero(selected)
+        partners = self._random_generator.integers(flat_partners.shape[0], size=indices.size)
+
+        flat_genomes[indices] = np.where(
+            self.mask(indices.size, flat_genomes.shape[1]),
+            flat_partners[partners],
+            flat_genomes[indices])
+
+    def cross_packed(
+            self,
+            packed_genomes,
+            genome_size,
+            crossover_prob,
+            protected=None,
+            partner_genomes=None):
+        """Cross bit-packed binary genomes of the whole population at once.
+        Offspring is blended from parents with bitwise operations,
+        taking bits of the partner where the packed mask is set.
+
+        Parameters
+        ----------
+        packed_genomes : np.ndarray
+            C-contiguous matrix of genomes packed by np.packbits, one genome per row.
+            Genomes are altered in place.
+        genome_size : int
+            Number of genes in a genome, excluding padding bits.
+        crossover_prob : float
+        protected : np.ndarray
+            Boolean vector of protection flags, one for each genome.
+            None by default, every genome can be crossed.
+        partner_genomes : np.ndarray
+            Matrix of packed genomes to draw partners from.
+            None by default, partners are drawn from 'packed_genomes'.
+
+        Raises
+        ------
+        ValueError
+            If genomes array isn't C-contiguous.
+        """
+        if not packed_genomes.flags.c_contiguous:
+            raise ValueError("Genomes array must be C-contiguous.")
+        if packed_genomes.size == 0:
+            return
+        if partner_genomes is None:
+            partner_genomes = packed_genomes
+
+        selected = self._random_generator.random(packed_genomes.shape[0]) < crossover_prob
+        if protected is not None:
+            selected &= ~protected
+
+        indices = np.flatnonzero(selected)
+        partners = self._random_generator.integers(partner_genomes.shape[0], size=indices.size)
+
+        own = packed_genomes[indices]
+        packed_genomes[indices] = own ^ (
+            (own ^ partner_genomes[partners]) & self.__packed_mask__(indices.size, genome_size))
+
+
+class UniformCrossover(BaseCrossover):
+    """Uniform crossover operator.
+    Every gene is inherited from the partner with given probability.
+
+    Parameters
+    ----------
+    swap_prob : float
+        Probability of inheriting a gene from the partner.
+        Default is 0.5
+    """
+    def __init__(self, swap_prob=0.5):
+        self._swap_probability = swap_prob
+        super().__init__()
+
+    def __mask__(self, n_offspring, genome_size):
+        return self._random_generator.random((n_offspring, genome_size)) < self._swap_probability
+
+
+class OnePointCrossover(BaseCrossover):
+    """One-point crossover operator.
+    Genes following a randomly chosen point of the flattened genome
+    are inherited from the partner.
+    """
+    def __mask__(self, n_offspring, genome_size):
+        points = self._random_generator.integers(
+            1, max(genome_size, 2),
+            size=(n_offspring, 1))
+
+        return np.arange(genome_size) >= points
+
+
+class TwoPointCrossover(BaseCrossover):
+    """Two-point crossover operator.
+    Genes between two randomly chosen points of the flattened genome
+    are inherited from the partner.
+    """
+    def __mask__(self, n_offspring, genome_size):
+        points = np.sort(
+            self._random_generator.integers(0, genome_size + 1, size=(n_offspring, 2)),
+            axis=1)
+        positions = np.arange(genome_size)
+
+        return (positions >= points[:, :1]) & (positions < points[:, 1:])
+
+
+CROSSOVER_OPS = {
+    'uniform': UniformCrossover,
+    'one_point': OnePointCrossover,
+    'two_point': TwoPointCrossover,
+}
+
+
+def get_crossover(crossover_op):
+    """Return crossover operator, given either as instance
+    of BaseCrossover subclass or name from CROSSOVER_OPS.
+
+    Raises
+    ------
+    ValueError
+        If supplied unknown name of crossover operator.
+    TypeError
+        If supplied operator not subclassing BaseCrossover.
+    """
+    if isinstance(crossover_op, str):
+        if crossover_op not in CROSSOVER_OPS:
+            raise ValueError(
+                'Unknown crossover operator name.',
+                crossover_op)
+        return CROSSOVER_OPS[crossover_op]()
+    if isinstance(crossover_op, BaseCrossover):
+        return crossover_op
+
+    raise TypeError(
+        'Invalid crossover operator.',
+        type(crossover_op))
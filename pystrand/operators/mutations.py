@@ -2,6 +2,8 @@
 """
 import numpy as np
 
+from pystrand.genotypes import Genotype
+
 class BaseMutation:
     """Defines base mutation operator.
     Returning genotype unchanged.
@@ -24,6 +26,28 @@ class BaseMutation:
         """
         raise NotImplementedError()
 
+    def __mutate_batch__(self, genomes, indices, gene_vals):
+        """Apply mutation operator on genomes at given indices.
+        Genomes are altered in place.
+
+        Default implementation passes Genotype views of the selected
+        genomes to the __mutate__ method, one at a time.
+        Subclasses should override it with a vectorized version.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Array of genomes, with individuals along the first axis.
+        indices : np.ndarray
+            Indices of genomes to mutate.
+        gene_vals : np.ndarray
+            Possible values of genes.
+        """
+        for index in indices:
+            genotype = genomes[index].view(Genotype)
+            genotype.gene_vals = gene_vals
+            self.__mutate__(genotype)
+
     def _check_mutation(self, genotype):
         """Determine whether or not to apply mutation
         to the genotype.
@@ -37,7 +61,7 @@ class BaseMutation:
         """
         return (
             genotype.size != 0 \
-            and self._random_generator.random() > self._mutation_probability)
+            and self._random_generator.random() < self._mutation_probability)
 
     def __call__(self, genotype):
         """Pass genotype to the __mutate__ method.
@@ -50,6 +74,97 @@ class BaseMutation:
         if self._check_mutation(genotype):
             self.__mutate__(genotype)
 
+    def mutate_batch(self, genomes, gene_vals, protected=None):
+        """Apply mutation operator on the whole population at once.
+        Every genome is mutated with the probability given during initialization,
+        protected genomes are left unchanged.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            C-contiguous array of genomes, with individuals along the first axis.
+            Genomes are altered in place.
+        gene_vals : list
+            Possible values of genes, converted to data type of genomes.
+        protected : np.ndarray
+            Boolean vector of protection flags, one for each genome.
+            None by default, every genome can be mutated.
+
+        Raises
+        ------
+        ValueError
+            If genomes array isn't C-contiguous.
+        """
+        if not genomes.flags.c_contiguous:
+            raise ValueError("Genomes array must be C-contiguous.")
+        if genomes.size == 0:
+            return
+
+        indices = self._selected_indices(genomes.shape[0], protected)
+        if indices.size > 0:
+            self.__mutate_batch__(genomes, indices, np.asarray(gene_vals, dtype=genomes.dtype))
+
+    def __mutate_packed__(self, packed_genomes, indices, genome_size):
+        """Apply mutation operator on bit-packed binary genomes at given indices.
+        Genomes are altered in place.
+
+        Default implementation unpacks the selected genomes,
+        passes them to the __mutate_batch__ method and packs them again.
+        Subclasses should override it with a version working on packed bits.
+
+        Parameters
+        ----------
+        packed_genomes : np.ndarray
+            Matrix of genomes packed by np.packbits, one genome per row.
+        indices : np.ndarray
+            Indices of genomes to mutate.
+        genome_size : int
+            Number of genes in a genome, excluding padding bits.
+        """
+        genomes = np.unpackbits(packed_genomes[indices], axis=1, count=genome_size)
+        self.__mutate_batch__(genomes, np.arange(indices.size), np.array([0, 1], dtype=np.uint8))
+        packed_genomes[indices] = np.packbits(genomes, axis=1)
+
+    def mutate_packed(self, packed_genomes, genome_size, protected=None):
+        """Apply mutation operator on the whole bit-packed binary population at once.
+        Every genome is mutated with the probability given during initialization,
+        protected genomes are left unchanged.
+
+        Parameters
+        ----------
+        packed_genomes : np.ndarray
+            C-contiguous matrix of genomes packed by np.packbits, one genome per row.
+            Genomes are altered in place.
+        genome_size : int
+            Number of genes in a genome, excluding padding bits.
+        protected : np.ndarray
+            Boolean vector of protection flags, one for each genome.
+            None by default, every genome can be mutated.
+
+        Raises
+        ------
+        ValueError
+            If genomes array isn't C-contiguous.
+        """
+        if not packed_genomes.flags.c_contiguous:
+            raise ValueError("Genomes array must be C-contiguous.")
+        if packed_genomes.size == 0 or genome_size == 0:
+            return
+
+        indices = self._selected_indices(packed_genomes.shape[0], protected)
+        if indices.size > 0:
+            self.__mutate_packed__(packed_genomes, indices, genome_size)
+
+    def _selected_indices(self, n_genomes, protected=None):
+        """Return indices of genomes chosen for mutation,
+        skipping the protected ones.
+        """
+        selected = self._random_generator.random(n_genomes) < self._mutation_probability
+        if protected is not None:
+            selected &= ~protected
+
+        return np.flatnonzero(selected)
+
 
 class PointMutation(BaseMutation):
     """
@@ -79,6 +194,38 @@ class PointMutation(BaseMutation):
         gene_vals_subset = np.setdiff1d(genotype.gene_vals, [genotype.flat[position]])
         genotype.flat[position] = self._random_generator.choice(gene_vals_subset)
 
+    def __mutate_batch__(self, genomes, indices, gene_vals):
+        """Apply point mutation on genomes at given indices.
+
+        Replacement symbols are drawn for all genomes at once,
+        by offsetting position of the current symbol in sorted gene_vals.
+        Symbols not present in gene_vals are replaced by any of them.
+        """
+        gene_vals = np.unique(gene_vals)
+        if gene_vals.size < 2:
+            return
+
+        flat_genomes = genomes.reshape(genomes.shape[0], -1)
+        positions = self._random_generator.integers(flat_genomes.shape[1], size=indices.size)
+        current_vals = flat_genomes[indices, positions]
+
+        current_positions = np.searchsorted(gene_vals, current_vals).clip(max=gene_vals.size-1)
+        offsets = self._random_generator.integers(1, gene_vals.size, size=indices.size)
+        new_positions = np.where(
+            gene_vals[current_positions] == current_vals,
+            (current_positions + offsets) % gene_vals.size,
+            self._random_generator.integers(gene_vals.size, size=indices.size))
+
+        flat_genomes[indices, positions] = gene_vals[new_positions]
+
+    def __mutate_packed__(self, packed_genomes, indices, genome_size):
+        """Flip a single random bit of genomes at given indices,
+        by XOR with a one-bit mask.
+        """
+        positions = self._random_generator.integers(genome_size, size=indices.size)
+        packed_genomes[indices, positions >> 3] ^= (
+            np.uint8(0x80) >> (positions & 7).astype(np.uint8))
+
 
 class BlockMutation(BaseMutation):
     """Defines block mutation operator. Subclasses the BaseMutation.
@@ -111,6 +258,21 @@ class BlockMutation(BaseMutation):
             position = (position+1)%genotype.size
             position_counter -= 1
 
+    def __mutate_batch__(self, genomes, indices, gene_vals):
+        """Apply block mutation on genomes at given indices.
+        Blocks wrap around the end of flattened genome.
+        """
+        flat_genomes = genomes.reshape(genomes.shape[0], -1)
+        genome_size = flat_genomes.shape[1]
+        block_size = min(self._block_size, genome_size)
+
+        starts = self._random_generator.integers(genome_size, size=(indices.size, 1))
+        positions = (starts + np.arange(block_size)) % genome_size
+
+        flat_genomes[indices[:, None], positions] = self._random_generator.choice(
+            gene_vals,
+            positions.shape)
+
 
 class PermutationMutation(BaseMutation):
     """Defines Permutation mutation operator.
@@ -150,6 +312,20 @@ class PermutationMutation(BaseMutation):
         """
         self._random_generator.shuffle(genotype, axis=self._axis)
 
+    def __mutate_batch__(self, genomes, indices, gene_vals):
+        """Changes order of genome subarrays along the given axis.
+        Every genome gets its own permutation, obtained by sorting random keys.
+        """
+        axis = self._axis % (genomes.ndim - 1) + 1
+        keys = self._random_generator.random((indices.size, genomes.shape[axis]))
+
+        order_shape = [1] * genomes.ndim
+        order_shape[0] = indices.size
+        order_shape[axis] = genomes.shape[axis]
+        order = np.argsort(keys, axis=1).reshape(order_shape)
+
+        genomes[indices] = np.take_along_axis(genomes[indices], order, axis=axis)
+
 
 class ShiftMutation(BaseMutation):
     """Defines Shift mutation operator.
@@ -173,7 +349,38 @@ class ShiftMutation(BaseMutation):
         super(ShiftMutation, self).__init__(probability)
 
     def __mutate__(self, genotype):
-        np.roll(genotype, self._shift_scale)
+        genotype[...] = np.roll(genotype, self._shift_scale)
         genotype.flat[:self._shift_scale] = self._random_generator.choice(
             genotype.gene_vals,
             self._shift_scale)
+
+    def __mutate_batch__(self, genomes, indices, gene_vals):
+        flat_genomes = genomes.reshape(genomes.shape[0], -1)
+        shift_scale = min(self._shift_scale, flat_genomes.shape[1])
+
+        flat_genomes[indices] = np.roll(flat_genomes[indices], shift_scale, axis=1)
+        flat_genomes[indices, :shift_scale] = self._random_generator.choice(
+            gene_vals,
+            (indices.size, shift_scale))
+
+
+def get_mutations(mutation_ops, mutation_prob):
+    """Return list of mutation operators, given either as instance
+    of BaseMutation subclass or list of them.
+    If no operators are given, PointMutation with 'mutation_prob' is used.
+
+    Raises
+    ------
+    TypeError
+        If supplied operator not subclassing BaseMutation.
+    """
+    if not mutation_ops:
+        return [PointMutation(mutation_prob)]
+    if isinstance(mutation_ops, list):
+        return mutation_ops
+    if isinstance(mutation_ops, BaseMutation):
+        return [mutation_ops]
+
+    raise TypeError(
+        'Invalid mutation operator.',
+        type(mutation_ops))
@@ -2,11 +2,43 @@
 """
 import numpy as np
 
+from pystrand.genotypes import INDIVIDUAL_DTYPE
+
+
+def _individual_indices(population, individuals):
+    """Return indices of individuals in population, found by their genomes.
+    Individuals with identical genomes are interchangeable.
+
+    Raises
+    ------
+    ValueError
+        If genome of an individual isn't found in the population.
+    """
+    positions = {}
+    for index, genotype in enumerate(population.genotypes):
+        positions.setdefault(np.ascontiguousarray(genotype).tobytes(), index)
+
+    try:
+        return np.array(
+            [positions[np.ascontiguousarray(genotype).tobytes()]
+             for genotype in individuals['genotype']],
+            dtype=int)
+    except KeyError:
+        raise ValueError("Selected individual isn't a member of the population.") from None
+
 
 class BaseSelection:
     """Base selection operator class.
     Doesn't apply any criteria and selects all individuals by default.
+
+    Attributes
+    ----------
+    protects_selected : bool
+        If True, selected individuals are protected from alteration
+        by the genetic operators.
     """
+    protects_selected = False
+
     def __init__(
             self,
             **kwargs):
@@ -14,7 +46,32 @@ class BaseSelection:
         self._rng = np.random.default_rng()
 
     def __select__(self, population):
-        return population.individuals
+        return population.individuals[self.__select_indices__(population)]
+
+    def __select_indices__(self, population):
+        """Return indices of selected individuals.
+        Selections overriding only __select__ have the individuals
+        they select mapped back to indices, by their genomes.
+        Otherwise all individuals are selected.
+        """
+        if type(self).__select__ is BaseSelection.__select__:
+            return np.arange(population.population_size)
+
+        return _individual_indices(population, self.__select__(population))
+
+    def select_indices(self, population):
+        """Return indices of selected individuals, without copying them.
+
+        Parameters
+        ----------
+        population : Population
+            Population on which the operator will be applied.
+
+        Returns
+        -------
+        np.ndarray : array of indices
+        """
+        return self.__select_indices__(population)
 
     def select(self, population):
         """Public select method.
@@ -30,7 +87,7 @@ class BaseSelection:
         """
         return np.array(
             self.__select__(population),
-            dtype=population.individuals.dtype)
+            dtype=INDIVIDUAL_DTYPE)
 
 
 class RandomSelection(BaseSelection):
@@ -48,19 +105,23 @@ class RandomSelection(BaseSelection):
 
         super().__init__(*args, **kwargs)
 
-    def __select__(self, population):
+    def __select_indices__(self, population):
 
-        selected_individuals = self._rng.choice(
-            population.individuals,
-            size=int(self._selection_prob*population.individuals.size))
+        selected_indices = self._rng.choice(
+            population.population_size,
+            size=int(self._selection_prob*population.population_size))
 
-        return selected_individuals
+        return selected_indices
 
 
 class RouletteSelection(BaseSelection):
     """
-    Naive implementation of Roulette selection (or Fitness proportionate selection).
+    Roulette selection (or Fitness proportionate selection).
     Checks for case of maximum fitness = 0 and assignes equal probability to all individuals.
+    Negative fitness values are shifted, so that the lowest one is 0.
+
+    Individuals are drawn by binary search in the table of cumulative fitness,
+    taking O(n + k log n) time for k selected out of n individuals.
 
     Parameters
     ----------
@@ -77,23 +138,91 @@ class RouletteSelection(BaseSelection):
 
         super().__init__(*args, **kwargs)
 
-    def __select__(self, population):
+    def _cumulative_fitness(self, population):
+        """Return cumulative sums of non-negative fitness values.
+        """
+        fitness = population.fitness
+        if fitness.min() < 0.0:
+            fitness = fitness - fitness.min()
+
+        return np.cumsum(fitness)
+
+    def _pointers(self, n_selected, total_fitness):
+        """Return positions on the wheel of cumulative fitness
+        that determine selected individuals.
+        """
+        return self._rng.random(n_selected) * total_fitness
+
+    def __select_indices__(self, population):
+        if population.population_size == 0:
+            return np.empty(0, dtype=int)
+
         n_selected = int(population.population_size*self._selected_population_fraction)
-        probs = population.individuals["fitness"]
-        if probs.min() < 0.0:
-            probs = probs - probs.min()
-        if probs.max() > 0.0:
-            scaling = lambda x: x / np.sum(probs)
-            probs = np.apply_along_axis(scaling, 0, probs)
+        cumulative_fitness = self._cumulative_fitness(population)
+
+        if cumulative_fitness[-1] > 0.0:
+            pointers = self._pointers(n_selected, cumulative_fitness[-1])
+            selected_indices = np.searchsorted(cumulative_fitness, pointers, side='right')
+            selected_indices = selected_indices.clip(max=population.population_size-1)
         else:
-            probs = np.full(probs.shape, 1.0/probs.size)
+            selected_indices = self._rng.integers(
+                population.population_size,
+                size=n_selected)
 
-        selected_individuals = self._rng.choice(
-            population.individuals,
-            size=n_selected,
-            p=probs)
+        return selected_indices
 
-        return selected_individuals
+
+class StochasticUniversalSelection(RouletteSelection):
+    """Stochastic universal sampling.
+    Variant of Roulette selection using evenly spaced pointers
+    with single random offset, instead of independent draws.
+    Number of copies of each individual is thus close to its expected value.
+
+    Parameters
+    ----------
+    selected_population_fraction : float, required
+    """
+
+    def _pointers(self, n_selected, total_fitness):
+        spacing = total_fitness / max(n_selected, 1)
+        return (self._rng.random() + np.arange(n_selected)) * spacing
+
+
+class TournamentSelection(BaseSelection):
+    """Tournament selection.
+    Each selected individual is the fittest one among 'tournament_size'
+    individuals drawn at random, with replacement.
+    All tournaments of a generation are drawn at once.
+
+    Parameters
+    ----------
+    selected_population_fraction : float, required
+    tournament_size : int
+        Number of individuals competing in each tournament.
+        Default is 2.
+    """
+
+    def __init__(
+            self,
+            selected_population_fraction,
+            *args,
+            tournament_size=2,
+            **kwargs):
+
+        self._selected_population_fraction = selected_population_fraction
+        self._tournament_size = tournament_size
+
+        super().__init__(*args, **kwargs)
+
+    def __select_indices__(self, population):
+        n_selected = int(population.population_size*self._selected_population_fraction)
+        competitors = self._rng.integers(
+            population.population_size,
+            size=(n_selected, self._tournament_size))
+
+        winners = np.argmax(population.fitness[competitors], axis=1)
+
+        return competitors[np.arange(n_selected), winners]
 
 
 class ElitismSelection(BaseSelection):
@@ -103,6 +232,8 @@ class ElitismSelection(BaseSelection):
     ----------
     selected_population_fraction : float, required
     """
+    protects_selected = True
+
     def __init__(
             self,
             selected_population_fraction,
@@ -113,6 +244,11 @@ class ElitismSelection(BaseSelection):
 
         super().__init__(*args, **kwargs)
 
+    def __select_indices__(self, population):
+        n_selected = int(population.population_size*self._selected_population_fraction)
+
+        return population.best_indices(n_selected)
+
     def __select__(self, population):
         n_selected = int(population.population_size*self._selected_population_fraction)
         selected_individuals = population.retrieve_best(n_selected)
@@ -121,3 +257,44 @@ class ElitismSelection(BaseSelection):
             individual.protected = True
 
         return selected_individuals
+
+
+SELECTION_OPS = {
+    'roulette': RouletteSelection,
+    'sus': StochasticUniversalSelection,
+    'tournament': TournamentSelection,
+    'elitism': ElitismSelection,
+}
+
+
+def get_selections(selection_ops, selected_fraction):
+    """Return list of selection operators, given either as instances
+    of BaseSelection subclasses or names from SELECTION_OPS.
+    Named operators select 'selected_fraction' of population.
+
+    Raises
+    ------
+    ValueError
+        If supplied unknown name of selection algorithm.
+    TypeError
+        If supplied operator not subclassing BaseSelection.
+    """
+    if not isinstance(selection_ops, list):
+        selection_ops = [selection_ops]
+
+    selection_methods = []
+    for selection_method in selection_ops:
+        if isinstance(selection_method, str):
+            if selection_method not in SELECTION_OPS:
+                raise ValueError(
+                    'Unknown selection algorithm name.',
+                    selection_method)
+            selection_methods.append(SELECTION_OPS[selection_method](selected_fraction))
+        elif isinstance(selection_method, BaseSelection):
+            selection_methods.append(selection_method)
+        else:
+            raise TypeError(
+                'Invalid selection type.',
+                type(selection_method))
+
+    return selection_methods
@@ -1,11 +1,27 @@
+import asyncio
 import multiprocessing as mp
+import time
 import uuid
 
-from pystrand.populations import BasePopulation
-from pystrand.operators.selections import RouletteSelection, ElitismSelection, BaseSelection
-from pystrand.operators.mutations import BaseMutation, PointMutation
+import numpy as np
+
+from pystrand.cache import FitnessCache
+from pystrand.callbacks import BaseCallback
+from pystrand.checkpoints import (
+    save_run, load_run, component_generators, generator_state, restore_generator_state)
+from pystrand.distributed import DistributedEvaluator
+from pystrand.fitnessfunctions import supports_batch, supports_packed
+from pystrand.history import (
+    HISTORY_CAPACITY, PhaseTimer, allocate_history, grow_history, restore_history)
+from pystrand.populations import MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+from pystrand.parallel import start_worker_pool, close_worker_pool, _evaluate_in_worker
+from pystrand.operators.selections import get_selections
+from pystrand.operators.mutations import get_mutations
+from pystrand.operators.crossovers import get_crossover
 from pystrand.loggers.csv_logger import CsvLogger
 from pystrand.loggers.details import RunDetails
+from pystrand.loggers.stream_logger import StreamLogger
 
 
 class BaseOptimizer:
@@ -27,17 +43,104 @@ class BaseOptimizer:
         None by default.
     crossover_prob : float
         0.0 by default, no crossover will take place
-    selection_ops :
+    crossover_op : str, BaseCrossover
+        Crossover operator, either instance of BaseCrossover subclass
+        or one of the names 'uniform', 'one_point' and 'two_point'.
+        'uniform' by default.
+    selection_ops : str, BaseSelection, list
+        Selection operators, either instances of BaseSelection subclasses
+        or names 'roulette', 'sus', 'tournament' and 'elitism'. 'roulette' by default.
     selected_fraction :
     log_path :
-    parallelize : bool
+    parallelize : bool, str, DistributedEvaluator
         Use multiprocessing to evaluate genomes in parallel?
+        If 'shared_memory', genomes of MatrixPopulation are passed to workers
+        through shared memory, instead of being pickled.
+        If 'threads', chunks of population are evaluated by a pool of threads,
+        which is efficient only for fitness functions releasing the GIL.
+        Workers are kept for the whole run of `fit`,
+        or until `close` is called when the optimizer is used as a context manager.
+        If DistributedEvaluator, genomes of MatrixPopulation are evaluated
+        by workers connected to it over TCP, using their own fitness functions.
+        The evaluator is not closed by the optimizer.
+    n_workers : int
+        Number of worker processes, by default number of CPUs.
+    chunk_size : int
+        Number of genotypes sent to a worker at once.
+        None by default, chunk size is determined by the multiprocessing.Pool,
+        or population is split into four chunks per worker.
+    evaluation_timeout : float
+        Seconds to wait for parallel or asynchronous evaluation of population.
+        5 by default.
+    cache_size : int
+        Maximum number of fitness values kept in cache, keyed by genome contents.
+        Individuals with cached fitness, such as elites and clones, are not evaluated again.
+        0 by default, fitness values are not cached.
+    max_concurrency : int
+        Maximum number of evaluations awaited at once by `fit_async`.
+        100 by default.
+    checkpoint_path : str
+        Directory for checkpoints of the run, from which it can be resumed
+        by `fit` with 'resume_from'. None by default, no checkpoints are saved.
+    checkpoint_interval : int
+        Number of generations between checkpoints.
+        0 by default, no checkpoints are saved.
+    stream_history : bool
+        If True, history is appended to the log in 'log_path' every generation,
+        instead of being saved once the run ends. False by default.
+    flush_interval : float
+        Seconds between flushes of the streamed history.
+        1 by default.
+    keep_history : bool
+        If False, only the statistics of the last generation are kept in memory
+        and returned by `fit`, full history is available only in the streamed log.
+        True by default.
+    phase_timing : bool
+        If True, history includes wall time spent in every phase of a generation,
+        under keys 'evaluation_time', 'selection_time', 'mutation_time',
+        'crossover_time' and 'logging_time', and 'evaluations_per_second'.
+        Record of a generation holds time spent since the previous record,
+        logging time is therefore that of the previous generation.
+        False by default.
+    timing_hook : callable
+        Called with iteration and dictionary of phase timings,
+        with the same keys, whenever a generation is recorded.
+        None by default.
+    callbacks : list
+        Instances of BaseCallback subclasses, called by `fit` and `fit_async`
+        in the order given, at the start of the run and at every
+        generation. None by default.
+    time_limit : float
+        Seconds after which the run is stopped, measured from its start.
+        Resumed run continues with the time left at its checkpoint.
+        None by default, run time isn't limited.
+    max_evaluations : int
+        Number of fitness evaluations after which the run is stopped.
+        Every individual passed to the fitness function counts, including
+        those evaluated by workers, whose counts in 'evaluated'
+        of the fitness function are not visible to the optimizer.
+        Resumed run continues with the evaluations left at its checkpoint.
+        None by default, number of evaluations isn't limited.
+    limit_check_size : int
+        Number of individuals evaluated between checks of the time limit
+        and evaluation budget, within a generation. Generation is cut short
+        once a limit is reached, individuals left unevaluated get fitness -inf.
+        Applies only to sequential evaluation by `fit`. None by default,
+        limits are checked between generations and the last generation
+        may exceed them.
 
     Raises
     ------
     TypeError
         If supplied wrong selection method type.
         If supplied mutation_op not subclassing BaseMutation.
+        If supplied crossover_op not subclassing BaseCrossover.
+        If supplied callback not subclassing BaseCallback.
+        If shared memory or distributed evaluation is requested
+        for population other than MatrixPopulation.
+    ValueError
+        If supplied unknown name of selection or crossover operator.
+        If supplied unknown parallelization mode.
 
     """
 
@@ -48,33 +151,41 @@ class BaseOptimizer:
                  mutation_prob=0.01,
                  mutation_ops=None,
                  crossover_prob=0.5,
+                 crossover_op='uniform',
                  selection_ops='roulette',
                  selected_fraction=0.1,
                  log_path=None,
                  parallelize=False,
+                 n_workers=None,
+                 chunk_size=None,
+                 evaluation_timeout=5,
+                 cache_size=0,
+                 max_concurrency=100,
+                 checkpoint_path=None,
+                 checkpoint_interval=0,
+                 stream_history=False,
+                 flush_interval=1.0,
+                 keep_history=True,
+                 phase_timing=False,
+                 timing_hook=None,
+                 callbacks=None,
+                 time_limit=None,
+                 max_evaluations=None,
+                 limit_check_size=None,
                  **kwargs):
-        """For each element in list of selection methods we check the type.
-        Only Selection and string are accepted, other types raise TypeError.
-        The strings must be reckognized as names of algorithm,
-        any other string will result in ValueError.
-        """
         self._optimizer_uuid = str(uuid.uuid1())
         self._fitness_function = fitness_function
 
-        if mutation_ops:
-            if isinstance(mutation_ops, list):
-                self._mutation_ops = mutation_ops
-            elif issubclass(type(mutation_ops), BaseMutation):
-                self._mutation_ops = [mutation_ops]
-            else:
-                raise TypeError(
-                    'Invalid mutation operator.',
-                    type(mutation_ops))
-        else:
-            self._mutation_ops = [PointMutation(mutation_prob)]
+        self._mutation_ops = get_mutations(mutation_ops, mutation_prob)
 
+        self.stream_logger = None
         if log_path:
-            self.logger = CsvLogger(log_path=log_path)
+            if stream_history:
+                self.logger = None
+                self.stream_logger = StreamLogger(
+                    log_path=log_path, flush_interval=flush_interval)
+            else:
+                self.logger = CsvLogger(log_path=log_path)
 
             if kwargs.get('save_details'):
                 self.details_logger = RunDetails(log_path=log_path)
@@ -85,66 +196,368 @@ class BaseOptimizer:
             self.details_logger = None
 
         self._crossover_probability = crossover_prob
-        self._selection_methods = []
+
+        self._crossover_op = get_crossover(crossover_op)
+
+        if isinstance(parallelize, str):
+            if parallelize not in ('shared_memory', 'threads'):
+                raise ValueError(
+                    'Unknown parallelization mode.',
+                    parallelize)
+            if parallelize == 'shared_memory' \
+                    and not isinstance(population, MatrixPopulation):
+                raise TypeError(
+                    'Shared memory evaluation requires MatrixPopulation.',
+                    type(population))
+
+        if isinstance(parallelize, DistributedEvaluator) \
+                and not isinstance(population, MatrixPopulation):
+            raise TypeError(
+                'Distributed evaluation requires MatrixPopulation.',
+                type(population))
+
         self._parallelize = parallelize
+        self._n_workers = n_workers
+        self._chunk_size = chunk_size
+        self._evaluation_timeout = evaluation_timeout
+        self._worker_pool = None
+        self._worker_pool_function = None
+        self._keep_workers = False
+        self._fitness_cache = FitnessCache(cache_size) if cache_size > 0 else None
+        self._max_concurrency = max_concurrency
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_interval = checkpoint_interval
+        self._keep_history = keep_history
+        self._phase_timing = phase_timing
+        self._timing_hook = timing_hook
+        self._timer = PhaseTimer()
+
+        self._callbacks = list(callbacks) if callbacks else []
+        for callback in self._callbacks:
+            if not isinstance(callback, BaseCallback):
+                raise TypeError(
+                    'Invalid callback type.',
+                    type(callback))
+        self._stop_reason = None
+        self._stop_requested = False
+
+        self._time_limit = time_limit
+        self._max_evaluations = max_evaluations
+        self._limit_check_size = limit_check_size
+        self._run_start = 0.0
+        self._limits_active = False
+        self._run_evaluations = 0
+        self._evaluation_cut = False
+        self._best_individual = None
         self._population = population
         self._max_iterations = max_iterations
 
-        #First we turn selection_methods into list, in case it isn't.
-        if not isinstance(selection_ops, list):
-            selection_ops = [selection_ops]
-
-        for selection_method in selection_ops:
-            if isinstance(selection_method, str):
-                if selection_method == 'roulette':
-                    self._selection_methods += [RouletteSelection(selected_fraction)]
-                elif selection_method == 'elitism':
-                    self._selection_methods += [ElitismSelection(selected_fraction)]
-                else:
-                    raise ValueError(
-                        'Unknown selection algorithm name.',
-                        selection_method)
-            elif isinstance(selection_method, BaseSelection):
-                self._selection_methods += [selection_method]
-            else:
-                raise TypeError(
-                    'Invalid selection type.',
-                    type(selection_method))
+        self._selection_methods = get_selections(selection_ops, selected_fraction)
 
     def evaluate_individual(self, individual):
         """Return fitness value of the given individual.
         """
         return self._fitness_function(individual)
 
+    def _get_worker_pool(self):
+        """Return pool of worker processes, starting it if necessary.
+        Fitness function is sent to the workers only when the pool starts.
+        The pool is restarted if the fitness function was replaced.
+
+        Depending on the parallelization mode the pool is either
+        multiprocessing.Pool, SharedMemoryEvaluator or ThreadPoolEvaluator.
+        """
+        if self._worker_pool is not None \
+                and self._worker_pool_function is not self._fitness_function:
+            self._close_worker_pool()
+
+        if self._worker_pool is None:
+            self._worker_pool = start_worker_pool(
+                self._parallelize,
+                self._fitness_function,
+                n_workers=self._n_workers,
+                chunk_size=self._chunk_size)
+            self._worker_pool_function = self._fitness_function
+
+        return self._worker_pool
+
+    def _close_worker_pool(self, terminate=False):
+        """Shut down pool of worker processes, if it is running.
+        Workers are given time to finish their tasks, unless 'terminate' is True.
+        """
+        if self._worker_pool is None:
+            return
+
+        close_worker_pool(self._worker_pool, terminate=terminate)
+
+        self._worker_pool = None
+        self._worker_pool_function = None
+
+    def close(self):
+        """Release resources held by the optimizer, such as worker processes.
+        """
+        self._keep_workers = False
+        self._close_worker_pool()
+
+    def __enter__(self):
+        """Keep worker processes running between `fit` calls,
+        until the context is exited.
+        """
+        self._keep_workers = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def evaluate_population(self):
         """Apply set fitness function to every individual in _population
         in either sequential or parallel manner depending on value of
         the _paralelize attribute. And store result in the 'fitness' field.
+
+        Sequential evaluation of MatrixPopulation, or of any population of genomes
+        sharing one shape, is performed on the whole genome matrix at once,
+        if the fitness function evaluates genomes in batches, see `supports_batch`.
+        Genomes of PackedBinaryPopulation are passed to 'evaluate_packed' without
+        unpacking, if the fitness function supports it. Other functions are called
+        on every genotype.
+
+        With fitness cache enabled, only genomes without cached fitness are evaluated.
+
+        If 'limit_check_size' is set, evaluation stops once the time limit
+        or evaluation budget is reached, and the remaining individuals get fitness -inf.
         """
-        evaluated_individuals = self._population.individuals
-        if self._parallelize:
-            with mp.Pool() as worker_pool:
-                result = worker_pool.map_async(
-                    self._fitness_function,
-                    evaluated_individuals['genotype']).get(5)
-                evaluated_individuals['fitness'] = result
+        self._evaluation_cut = False
+        fitness = self._population.fitness
+        if self._fitness_cache is None:
+            results = self._evaluate_within_limits(slice(None))
+            fitness[:len(results)] = results
+            if len(results) < fitness.size:
+                fitness[len(results):] = -np.inf
+                self._evaluation_cut = True
+            return
+
+        missing = self._fill_cached_fitness()
+        if missing:
+            #Identical genomes are evaluated only once.
+            representatives = np.array([group[0] for group in missing.values()])
+            results = self._evaluate_within_limits(representatives)
+            self._fitness_cache.store(missing, results, fitness)
+            for group in list(missing.values())[len(results):]:
+                fitness[group] = -np.inf
+                self._evaluation_cut = True
+
+    async def evaluate_population_async(self):
+        """Apply set fitness function to every individual in _population,
+        awaiting up to 'max_concurrency' evaluations at once.
+        And store result in the 'fitness' field.
+
+        Fitness functions without 'evaluate_async' are evaluated
+        the same way as by `evaluate_population`.
+
+        With fitness cache enabled, only genomes without cached fitness are evaluated.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If evaluation doesn't finish in 'evaluation_timeout' seconds.
+        """
+        if self._fitness_cache is None:
+            self._population.fitness[:] = await self._evaluate_individuals_async(
+                slice(None))
+            self._count_evaluations(self._population.population_size)
+            return
+
+        missing = self._fill_cached_fitness()
+        if missing:
+            representatives = np.array([group[0] for group in missing.values()])
+            self._fitness_cache.store(
+                missing,
+                await self._evaluate_individuals_async(representatives),
+                self._population.fitness)
+            self._count_evaluations(len(missing))
+
+    def _fill_cached_fitness(self):
+        """Set fitness of individuals with cached fitness values.
+        Return dictionary mapping genome keys without cached fitness
+        to lists of indices of individuals sharing them.
+        """
+        if isinstance(self._population, PackedBinaryPopulation):
+            genomes = self._population.packed_genomes
+        elif isinstance(self._population, MatrixPopulation):
+            genomes = self._population.genomes
         else:
-            evaluated_individuals['fitness'] = [
-                self._fitness_function(individual)
-                for individual
-                in evaluated_individuals['genotype']]
+            genomes = self._population.genotypes
 
-        self._population.replace_individuals(evaluated_individuals)
+        return self._fitness_cache.fill(genomes, self._population.fitness)
+
+    def _evaluate_within_limits(self, indices):
+        """Return fitness values of individuals at given indices,
+        evaluated in chunks of 'limit_check_size' individuals, for as long
+        as the time limit and evaluation budget allow. Values are returned
+        only for the evaluated individuals, which come first.
+        Parallel evaluation, evaluation without 'limit_check_size',
+        and evaluation outside of a run, isn't split into chunks.
+        """
+        if not self._limit_check_size or self._parallelize or not self._limits_active:
+            results = self._evaluate_individuals(indices)
+            self._count_evaluations(len(results))
+            return results
+
+        if isinstance(indices, slice):
+            indices = np.arange(self._population.population_size)[indices]
+
+        results = []
+        start = 0
+        while start < indices.size and not self._limit_reached():
+            stop = start + self._limit_check_size
+            if self._max_evaluations is not None:
+                stop = min(stop, start + self._max_evaluations - self._run_evaluations)
+            chunk = np.asarray(self._evaluate_individuals(indices[start:stop]), dtype='d')
+            self._count_evaluations(chunk.size)
+            results.append(chunk)
+            start += chunk.size
+
+        return np.concatenate(results) if results else np.empty(0)
+
+    def _count_evaluations(self, n_evaluations):
+        """Add evaluations to counts of the generation and of the run.
+        """
+        self._timer.count_evaluations(n_evaluations)
+        self._run_evaluations += n_evaluations
+
+    def _limit_reached(self):
+        """Return True, and stop the run, if the time limit
+        or evaluation budget was reached. Limits apply only during a run.
+        """
+        if not self._limits_active:
+            return False
+        if self._time_limit is not None \
+                and time.monotonic() - self._run_start >= self._time_limit:
+            self.stop_run("Time limit of {} s reached.".format(self._time_limit))
+        elif self._max_evaluations is not None \
+                and self._run_evaluations >= self._max_evaluations:
+            self.stop_run("Budget of {} evaluations exhausted.".format(self._max_evaluations))
+        else:
+            return False
+
+        return True
+
+    def _track_best(self):
+        """Keep copy of the best individual of the run,
+        if the evaluated population contains a better one.
+        """
+        fitness = self._population.fitness
+        if fitness.size == 0:
+            return
+        max_fitness = fitness.max()
+        if max_fitness > -np.inf and (
+                self._best_individual is None
+                or max_fitness > self._best_individual['fitness']):
+            self._best_individual = self._population.retrieve_best()[0]
+
+    def _evaluate_individuals(self, indices):
+        """Return fitness values of individuals at given indices.
+        """
+        if isinstance(self._parallelize, DistributedEvaluator):
+            return self._parallelize.evaluate(
+                self._population.genomes[indices],
+                genome_shape=self._population.genome_shape,
+                timeout=self._evaluation_timeout)
+        if self._parallelize == 'shared_memory':
+            return self._get_worker_pool().evaluate(
+                self._population.genomes[indices],
+                genome_shape=self._population.genome_shape,
+                timeout=self._evaluation_timeout)
+        if self._parallelize == 'threads':
+            return self._get_worker_pool().evaluate(
+                self._evaluated_genomes(indices),
+                self._evaluate_genomes,
+                timeout=self._evaluation_timeout)
+        if self._parallelize:
+            return self._get_worker_pool().map_async(
+                _evaluate_in_worker,
+                self._population.genotypes[indices],
+                chunksize=self._chunk_size).get(self._evaluation_timeout)
+
+        return self._evaluate_genomes(self._evaluated_genomes(indices))
+
+    def _evaluation_mode(self):
+        """Return 'packed' if genomes are evaluated without unpacking,
+        'batch' if genome matrix is evaluated at once and 'single' otherwise.
+        """
+        if isinstance(self._population, PackedBinaryPopulation) \
+                and supports_packed(self._fitness_function):
+            return 'packed'
+        if supports_batch(self._fitness_function) and (
+                isinstance(self._population, MatrixPopulation)
+                or len({genotype.shape for genotype in self._population.genotypes}) == 1):
+            return 'batch'
+        return 'single'
+
+    def _evaluated_genomes(self, indices):
+        """Return genomes of individuals at given indices,
+        in the form expected by `_evaluate_genomes`.
+        """
+        mode = self._evaluation_mode()
+        if mode == 'packed':
+            return self._population.packed_genomes[indices]
+        if mode == 'batch':
+            return self._population.genomes[indices]
+        return self._population.genotypes[indices]
+
+    def _evaluate_genomes(self, genomes):
+        """Return fitness values of genomes obtained from `_evaluated_genomes`.
+        """
+        mode = self._evaluation_mode()
+        if mode == 'packed':
+            return self._fitness_function.evaluate_packed(
+                genomes, self._population.genome_size)
+        if mode == 'batch':
+            return self._fitness_function.evaluate_batch(genomes)
+
+        return [
+            self._fitness_function(individual)
+            for individual
+            in genomes]
+
+    async def _evaluate_individuals_async(self, indices):
+        """Return fitness values of individuals at given indices,
+        awaiting evaluations concurrently.
+        """
+        if not hasattr(self._fitness_function, 'evaluate_async'):
+            return self._evaluate_individuals(indices)
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def evaluate(genotype):
+            async with semaphore:
+                return await self._fitness_function.evaluate_async(genotype)
+
+        return await asyncio.wait_for(
+            asyncio.gather(*[
+                evaluate(genotype)
+                for genotype in self._population.genotypes[indices]]),
+            self._evaluation_timeout)
 
     def select_genomes(self):
         """Create new population by sequentially applying selection operators
         in the order they were given to __init__.
         Expand the new population to match the original one.
+
+        MatrixPopulation is replaced in place, using indices of selected individuals.
         """
-        new_population = BasePopulation(
+        if isinstance(self._population, MatrixPopulation):
+            self._population.replace_generation([
+                (selection_method.select_indices(self._population),
+                 selection_method.protects_selected)
+                for selection_method in self._selection_methods])
+            return
+
+        new_population = type(self._population)(
             0,
             self._population.genome_shapes,
-            self._population.gene_values)
+            gene_vals=self._population.gene_values,
+            dtype=self._population.genome_dtype)
 
         for selection_method in self._selection_methods:
             new_population.append_individuals(
@@ -155,67 +568,396 @@ class BaseOptimizer:
 
         self._population = new_population
 
-    def fit(self, fitnes_function=None, verbose=1):
+    def fit(self, fitnes_function=None, verbose=1, resume_from=None):
         """Main training loop.
-        Return statistics of the run as dictionary of lists.
+        Return statistics of the run as dictionary of arrays.
+
+        Run ends after 'max_iterations' generations, once fitness 1.0 is reached,
+        when a callback calls `stop_run`, or once the time limit or evaluation
+        budget is reached. Generation cut short by the limits isn't recorded
+        in history, but its evaluated individuals are considered
+        by 'best_individual'.
+
+        History arrays are preallocated for 'max_iterations' generations,
+        or grown geometrically if the number of iterations isn't limited.
+        If the optimizer doesn't keep history, only the last generation is returned.
+
+        Parameters
+        ----------
+        fitness_function: BaseFunction
+
+        verbose : int
+            If not '0' outputs statistics using print every generation.
+            Default is 1.
+
+        resume_from : str
+            Checkpoint directory of interrupted run. Population, history
+            and random generators are restored, and the run continues
+            as if it was never interrupted. Optimizer has to be set up
+            with the same operators, in the same order, as the original one.
+            None by default, new run is started.
+
+        """
+        self._set_fitness_function(fitnes_function)
+
+        run_id = uuid.uuid1()
+
+        history, n_records, iteration = self._start_run(resume_from)
+        self._open_history_stream(history, n_records, run_id)
+
+        try:
+            while self._max_iterations < 0 or iteration < self._max_iterations:
+                if self._limit_reached():
+                    break
+                self._run_callbacks('on_generation_start', iteration)
+                try:
+                    with self._timer.phase('evaluation'):
+                        self.evaluate_population()
+                except mp.TimeoutError as timeoutException:
+                    print(
+                        "Population evaluation timed out, with exception {}.".format(
+                            timeoutException))
+                    self._close_worker_pool(terminate=True)
+                    break
+                history, n_records, finished = self._complete_generation(
+                    history, n_records, iteration, verbose)
+                if finished:
+                    break
+                iteration += 1
+        finally:
+            self._end_run()
+
+        return self._finish_run(history, n_records, run_id)
+
+    async def fit_async(self, fitnes_function=None, verbose=1, resume_from=None):
+        """Main training loop, for fitness functions evaluated by coroutines.
+        Up to 'max_concurrency' evaluations are awaited at once.
+        Return statistics of the run as dictionary of arrays.
 
         Parameters
         ----------
         fitness_function: BaseFunction
+            Function providing 'evaluate_async', such as subclasses
+            of AsyncBaseFunction. Other functions are evaluated as by `fit`.
 
         verbose : int
             If not '0' outputs statistics using print every generation.
             Default is 1.
 
+        resume_from : str
+            Checkpoint directory of interrupted run, see `fit`.
+
+        """
+        self._set_fitness_function(fitnes_function)
+
+        run_id = uuid.uuid1()
+
+        history, n_records, iteration = self._start_run(resume_from)
+        self._open_history_stream(history, n_records, run_id)
+
+        try:
+            while self._max_iterations < 0 or iteration < self._max_iterations:
+                if self._limit_reached():
+                    break
+                self._run_callbacks('on_generation_start', iteration)
+                try:
+                    with self._timer.phase('evaluation'):
+                        await self.evaluate_population_async()
+                except (mp.TimeoutError, asyncio.TimeoutError) as timeoutException:
+                    print(
+                        "Population evaluation timed out, with exception {}.".format(
+                            timeoutException))
+                    self._close_worker_pool(terminate=True)
+                    break
+                history, n_records, finished = self._complete_generation(
+                    history, n_records, iteration, verbose)
+                if finished:
+                    break
+                iteration += 1
+        finally:
+            self._end_run()
+
+        return self._finish_run(history, n_records, run_id)
+
+    def _start_run(self, resume_from=None):
+        """Return history, number of its records and iteration to start run from.
+        Run is either new, or resumed from checkpoint directory 'resume_from'.
+        """
+        self._timer.reset()
+        self._stop_reason = None
+        self._stop_requested = False
+        self._run_start = time.monotonic()
+        self._limits_active = True
+        self._run_evaluations = 0
+        self._evaluation_cut = False
+        self._best_individual = None
+        if resume_from is not None:
+            return self._load_checkpoint(resume_from)
+        self._run_callbacks('on_run_start')
+
+        return allocate_history(self._history_capacity(), self._phase_timing), 0, 0
+
+    def _complete_generation(self, history, n_records, iteration, verbose):
+        """Record the evaluated generation and breed the next one,
+        unless the run ends with it. Return history, number of its records
+        and True if the run ended.
+        """
+        self._track_best()
+        if self._evaluation_cut:
+            return history, n_records, True
+        self._run_callbacks('on_evaluation', iteration)
+
+        history, statistics = self._record_generation(
+            history, n_records, iteration, verbose)
+        n_records += 1
+        self._run_callbacks('on_generation_end', iteration, statistics)
+
+        if statistics["max_fitness"] == 1.0 or self._stop_requested:
+            return history, n_records, True
+
+        self.breed_generation()
+        self._checkpoint_generation(history, n_records, iteration + 1)
+
+        return history, n_records, False
+
+    def _end_run(self):
+        """Release workers, unless they are kept, and close the streamed log.
+        Called even if the run ends by exception.
+        """
+        if not self._keep_workers:
+            self._close_worker_pool()
+        if self.stream_logger:
+            self.stream_logger.close()
+        self._limits_active = False
+
+    def _run_callbacks(self, event, *args):
+        """Call method 'event' of every callback.
+        """
+        for callback in self._callbacks:
+            getattr(callback, event)(self, *args)
+
+    def stop_run(self, reason=None):
+        """Stop the run once the current generation is recorded.
+        Meant to be called by callbacks.
+
+        Parameters
+        ----------
+        reason : str
+            Reason for stopping, available as 'stop_reason'.
+        """
+        self._stop_requested = True
+        self._stop_reason = reason
+
+    def _history_capacity(self, n_records=0):
+        """Return number of records to allocate for history
+        holding at least 'n_records' records.
+        """
+        if not self._keep_history:
+            return 1
+
+        return max(
+            self._max_iterations if self._max_iterations > 0 else HISTORY_CAPACITY,
+            n_records)
+
+    def _open_history_stream(self, history, n_records, run_id):
+        """Open streamed log of the run, if streaming logger is set,
+        and write records already present in the history.
+        """
+        if not self.stream_logger:
+            return
+
+        self.stream_logger.open(run_id, history.keys())
+        for index in range(min(n_records, history["iteration"].size)):
+            self.stream_logger.write_record(
+                [record[index] for record in history.values()])
+
+    def _checkpoint_generation(self, history, n_records, iteration):
+        """Save checkpoint, if one is due after given iteration.
+        Time spent saving it counts as logging.
+        """
+        if self._checkpoint_path and self._checkpoint_interval > 0 \
+                and iteration % self._checkpoint_interval == 0:
+            with self._timer.phase('logging'):
+                self._save_checkpoint(self._checkpoint_path, history, n_records, iteration)
+
+    def _random_generators(self):
+        """Return random generators of population and operators, in fixed order.
+        """
+        return component_generators(
+            [self._population, self._crossover_op] + self._mutation_ops + self._selection_methods)
+
+    def _save_checkpoint(self, path, history, n_records, iteration):
+        """Save population, history, iteration and states of random generators
+        into checkpoint directory 'path'.
+        """
+        save_run(
+            path,
+            self._population,
+            self._random_generators(),
+            {key: record[:n_records] for key, record in history.items()},
+            {
+                'iteration': iteration,
+                'n_records': n_records,
+                'evaluations': self._run_evaluations,
+                'elapsed_time': time.monotonic() - self._run_start},
+            best_individual=self._best_individual,
+            callbacks=self._callbacks)
+
+    def _load_checkpoint(self, path):
+        """Restore population and states of random generators from checkpoint
+        directory 'path', along with the best individual and states of callbacks,
+        which are restored after their `on_run_start`. Return history,
+        number of its records and iteration. Evaluations and time spent
+        before the checkpoint count towards the limits.
+
+        Raises
+        ------
+        ValueError
+            If the checkpoint doesn't match population, operators
+            or callbacks of the optimizer.
+        """
+        saved_history, metadata, self._best_individual = load_run(
+            path, self._population, self._random_generators(), self._callbacks)
+        self._run_evaluations = metadata.get('evaluations', 0)
+        self._run_start -= metadata.get('elapsed_time', 0.0)
+
+        n_records = metadata['n_records']
+        history = restore_history(
+            saved_history, self._history_capacity(n_records), self._phase_timing)
+        self._run_callbacks('on_run_start')
+        for callback, state in zip(self._callbacks, metadata['callbacks']):
+            if state is not None:
+                callback.set_state(state)
+
+        return history, n_records, metadata['iteration']
+
+    def _set_fitness_function(self, fitnes_function):
+        """Replace fitness function, if supplied, and check that one is set.
+        Fitness cache is cleared when the function changes.
+        Distributed evaluation doesn't need the function,
+        workers use their own.
         """
         if fitnes_function:
+            if self._fitness_cache is not None \
+                    and fitnes_function is not self._fitness_function:
+                self._fitness_cache.clear()
             self._fitness_function = fitnes_function
-        elif not self._fitness_function:
+        elif not self._fitness_function \
+                and not isinstance(self._parallelize, DistributedEvaluator):
             raise RuntimeError("No fitness function supplied")
 
-        run_id = uuid.uuid1()
-
-        history = {
-            "iteration" : [],
-            "max_fitness" : [],
-            "min_fitness" : [],
-            "fitness_avg" : [],
-            "fitness_std" : []}
-
-        iteration = 0
-
-        while iteration != self._max_iterations:
-            try:
-                self.evaluate_population()
-            except mp.TimeoutError as timeoutException:
-                print(
-                    "Population evaluation timed out, with exception {}.".format(
-                        timeoutException))
-                break
-
-            history["iteration"].append(iteration)
-            history["max_fitness"].append(self._population.max_fitness)
-            history["min_fitness"].append(self._population.min_fitness)
-            history["fitness_avg"].append(self._population.avg_fitness)
-            history["fitness_std"].append(self._population.fitness_std)
+    def _record_generation(self, history, n_records, iteration, verbose):
+        """Store fitness statistics of evaluated population as record
+        number 'n_records' of the history, growing it if necessary,
+        and append them to the streamed log, if one is open.
+        If history isn't kept, the only record is overwritten instead.
+        Phase timings are stored, if the history includes them,
+        and passed to the timing hook. Time spent here counts as logging.
+        Return the history and the statistics.
+        """
+        #Timer is reset inside, so the time counts into the next record.
+        with self._timer.phase('logging'):
+            if not self._keep_history:
+                n_records = 0
+            elif n_records == history["iteration"].size:
+                history = grow_history(history)
+
+            statistics = self._population.fitness_statistics()
+            history["iteration"][n_records] = iteration
+            for key, value in statistics.items():
+                history[key][n_records] = value
+
+            if self._phase_timing or self._timing_hook:
+                timings = self._timer.timings()
+                if self._phase_timing:
+                    for key, value in timings.items():
+                        history[key][n_records] = value
+                if self._timing_hook:
+                    self._timing_hook(iteration, timings)
+            self._timer.reset()
+
+            if self.stream_logger and self.stream_logger.is_open:
+                self.stream_logger.write_record(
+                    [record[n_records] for record in history.values()])
 
             if verbose > 0:
                 print(" // ".join(
-                    [key + ": " + str(record[-1]) for key, record in history.items()]
+                    [key + ": " + str(record[n_records]) for key, record in history.items()]
                     ))
 
-            if self._population.max_fitness == 1.0:
-                break
+        return history, statistics
 
+    def breed_generation(self):
+        """Replace evaluated population by the next generation,
+        produced by selection, mutation and crossover.
+        """
+        with self._timer.phase('selection'):
             self.select_genomes()
 
+        with self._timer.phase('mutation'):
             self._population.mutate_genotypes(mutation_ops=self._mutation_ops)
 
-            if self._crossover_probability > 0.0:
+        if self._crossover_probability > 0.0:
+            with self._timer.phase('crossover'):
                 self._population.cross_genomes(
-                    crossover_prob=self._crossover_probability)
+                    crossover_prob=self._crossover_probability,
+                    crossover_op=self._crossover_op)
+
+    def step(self, iteration=0, breed=False, verbose=0):
+        """Evolve a single generation, outside of `fit`.
+        Population is evaluated and its fitness statistics are recorded,
+        along with phase timings, if the optimizer times phases.
+        Meant for code driving the optimizer generation by generation,
+        such as the island model.
+
+        Parameters
+        ----------
+        iteration : int
+            Iteration stored with the statistics.
+        breed : bool
+            If True, the next generation is bred from the evaluated
+            population first. False by default.
+        verbose : int
+            If not '0' outputs statistics using print.
+            Default is 0.
+
+        Returns
+        -------
+        dict
+            Statistics of the generation, keyed as in history.
+        """
+        if breed:
+            self.breed_generation()
+
+        with self._timer.phase('evaluation'):
+            self.evaluate_population()
+
+        history, _ = self._record_generation(
+            allocate_history(1, self._phase_timing), 0, iteration, verbose)
+
+        return {key: record[0] for key, record in history.items()}
 
-            iteration += 1
+    def seed_generators(self, seed_sequence):
+        """Give population and operators independent random streams
+        spawned from 'seed_sequence'. Legacy global numpy generator,
+        used by BasePopulation and Genotype, is seeded as well.
+
+        Parameters
+        ----------
+        seed_sequence : np.random.SeedSequence
+        """
+        generators = self._random_generators()
+        seeds = seed_sequence.spawn(len(generators) + 1)
+
+        np.random.seed(seeds[0].generate_state(1)[0])
+        for generator, seed in zip(generators, seeds[1:]):
+            restore_generator_state(generator, generator_state(np.random.default_rng(seed)))
+
+    def _finish_run(self, history, n_records, run_id):
+        """Trim history to recorded generations and save it,
+        along with run details, if loggers are set.
+        """
+        history = {key: record[:n_records] for key, record in history.items()}
 
         if self.logger:
             self.logger.save_history(history, run_id=run_id)
@@ -225,12 +967,32 @@ class BaseOptimizer:
 
         return history
 
+    @property
+    def best_individual(self):
+        """Return copy of the individual with highest fitness
+        evaluated during the last run, or None if there was none.
+        """
+        return self._best_individual
+
+    @property
+    def stop_reason(self):
+        """Return reason given to `stop_run` during the last run,
+        or None if the run wasn't stopped by it.
+        """
+        return self._stop_reason
+
     @property
     def population(self):
         """Return optimized population.
         """
         return self._population
 
+    @property
+    def fitness_cache(self):
+        """Return fitness cache, or None if caching is disabled.
+        """
+        return self._fitness_cache
+
     @property
     def optimizer_uuid(self):
         """Return uuid of the optimizer.
@@ -0,0 +1,186 @@
+"""Populations of binary genomes packed into bits.
+"""
+import numpy as np
+from pystrand.operators.crossovers import UniformCrossover
+from pystrand.populations import MatrixPopulation
+
+
+class PackedBinaryPopulation(MatrixPopulation):
+    """Population of binary genomes, with genes stored as single bits.
+
+    Genomes are flattened and packed by np.packbits into a matrix of uint8,
+    with one row per individual. Rows are padded by zero bits
+    to a whole number of bytes. Mutation operators flip bits with XOR masks
+    and crossover operators blend parents with bitwise operations.
+
+    Unpacked genomes, genotypes and individuals are copies,
+    their changes are not reflected in the population.
+
+    Parameters
+    ----------
+    pop_size : int
+        number of individuals in given population
+    genome_shapes : tuple, list
+        shape of individual genomes, all shapes in list must be equal
+    random_init : bool
+        if the genomes are supposed to be randomized
+    gene_vals : list
+        possible values of genes, only [0, 1] is supported
+    seed : int
+    default_genome : Genotype
+        used as genome for entire population,
+        if random_init = False
+    seed_individuals : Population
+        numpy array of evaluated inidividuals
+    double_buffered : bool
+        If True, new generations are written into preallocated buffers,
+        which are then swapped with the current ones.
+        Default is False.
+
+    Raises
+    ------
+    ValueError
+        If supplied genome shapes differ.
+        If gene values other than 0 and 1 are requested.
+    """
+
+    def __init__(self,
+                 pop_size,
+                 genome_shapes,
+                 random_init=None,
+                 gene_vals=None,
+                 seed=None,
+                 default_genome=None,
+                 seed_individuals=None,
+                 double_buffered=False,
+                 **kwargs):
+        if gene_vals is not None and sorted(np.unique(gene_vals).tolist()) != [0, 1]:
+            raise ValueError(
+                "PackedBinaryPopulation supports only gene values 0 and 1.",
+                gene_vals)
+        kwargs.pop('dtype', None)
+
+        super().__init__(
+            pop_size,
+            genome_shapes,
+            random_init=random_init,
+            gene_vals=[0, 1],
+            seed=seed,
+            default_genome=default_genome,
+            seed_individuals=seed_individuals,
+            dtype=np.uint8,
+            double_buffered=double_buffered,
+            **kwargs)
+
+    def _new_genomes(self, size):
+        """Return packed matrix of 'size' new genomes, created according
+        to the population settings.
+        """
+        if self._random_init:
+            genomes = self._rng.integers(
+                0, 256, (size, self._packed_size), dtype=np.uint8)
+            if self.genome_size % 8:
+                genomes[:, -1] &= np.uint8(0xFF << (8 - self.genome_size % 8) & 0xFF)
+            return genomes
+
+        return self._pack(super()._new_genomes(size))
+
+    def _set_individuals(self, individuals):
+        super()._set_individuals(individuals)
+        self._genomes = self._pack(self._genomes)
+
+    def _genome_matrix(self, genotypes):
+        return self._pack(np.array(
+            [np.asarray(genotype) for genotype in genotypes],
+            dtype=np.uint8).reshape(len(genotypes), self.genome_size))
+
+    def _pack(self, genomes):
+        """Return packed matrix of binary 'genomes'.
+        """
+        return np.packbits(
+            genomes.reshape(genomes.shape[0], self.genome_size) != 0, axis=1)
+
+    def _unpack(self, packed_genomes):
+        """Return matrix of flattened genomes unpacked from 'packed_genomes'.
+        """
+        return np.unpackbits(packed_genomes, axis=1, count=self.genome_size)
+
+    def _genotypes(self, genomes, protected=None):
+        """Return object array of Genotypes unpacked from 'genomes' matrix rows.
+        """
+        genomes = np.asarray(genomes, dtype=np.uint8).reshape(-1, self._packed_size)
+        return super()._genotypes(
+            self._unpack(genomes).reshape((-1,) + self._genome_shape), protected)
+
+    def mutate_genotypes(self, mutation_ops):
+        """Apply mutation operators to individuals in order provided.
+        Each operator is applied on the whole packed genome matrix at once.
+
+        Parameters
+        ----------
+        mutation_ops : list
+            List of mutation operators
+        """
+        for mutation_op in mutation_ops:
+            mutation_op.mutate_packed(self._genomes, self.genome_size, self._protected)
+
+    def cross_genomes(
+            self,
+            secondary_population=None,
+            crossover_prob=0.0,
+            crossover_op=None):
+        """Crosses genome of inidividuals with those in 'secondary_population'.
+        Offspring of the whole population is blended from packed parents at once.
+
+        Parameters
+        ----------
+        secondary_population : MatrixPopulation
+        crossover_prob : float
+        crossover_op : BaseCrossover
+            Operator generating crossover masks.
+            If None, UniformCrossover is used.
+        """
+        if crossover_op is None:
+            crossover_op = UniformCrossover()
+        partner_genomes = None
+        if isinstance(secondary_population, PackedBinaryPopulation):
+            partner_genomes = secondary_population.packed_genomes
+        elif secondary_population is not None:
+            partner_genomes = self._pack(secondary_population.genomes)
+
+        crossover_op.cross_packed(
+            self._genomes,
+            self.genome_size,
+            crossover_prob,
+            protected=self._protected,
+            partner_genomes=partner_genomes)
+
+    @property
+    def _packed_size(self):
+        """Return number of bytes of a packed genome.
+        """
+        return (self.genome_size + 7) // 8
+
+    @property
+    def genome_size(self):
+        """Return number of genes in a genome.
+        """
+        return int(np.prod(self._genome_shape))
+
+    @property
+    def genome_dtype(self):
+        """Return data type of unpacked genes.
+        """
+        return np.dtype(np.uint8)
+
+    @property
+    def genomes(self):
+        """Return matrix of flattened genomes, unpacked into a new array of uint8.
+        """
+        return self._unpack(self._genomes)
+
+    @property
+    def packed_genomes(self):
+        """Return matrix of packed genomes, one row per individual.
+        """
+        return self._genomes
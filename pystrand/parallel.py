@@ -0,0 +1,311 @@
+"""Parallel evaluation of fitness functions.
+"""
+import concurrent.futures
+import multiprocessing as mp
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from pystrand.fitnessfunctions import supports_batch
+
+_worker_fitness_function = None
+_worker_shared_blocks = {}
+
+
+def _init_worker(fitness_function):
+    """Store fitness function in the worker process.
+    """
+    global _worker_fitness_function
+    _worker_fitness_function = fitness_function
+
+
+def _evaluate_in_worker(genotype):
+    """Evaluate genotype with fitness function of the worker process.
+    """
+    return _worker_fitness_function(genotype)
+
+
+def _attach_shared_block(name):
+    """Attach existing shared memory block.
+    The block is owned, and eventually unlinked, by the parent process.
+    Since Python 3.13 the worker attaches it without tracking.
+    Older versions register it with the resource tracker, which workers
+    share with the parent, as it is started before them. The registration
+    is therefore the one removed by the parent when it unlinks the block,
+    instead of one causing spurious cleanup at worker shutdown, see bpo-39959.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(  # pylint: disable=unexpected-keyword-arg
+            name=name, track=False)
+
+    return shared_memory.SharedMemory(name=name)
+
+
+def _attach_shared_array(name, shape, dtype):
+    """Return array backed by shared memory block 'name'.
+    Blocks are attached once and cached by the worker process,
+    blocks that are no longer used by the parent are detached.
+    """
+    if name not in _worker_shared_blocks:
+        _worker_shared_blocks[name] = _attach_shared_block(name)
+    return np.ndarray(shape, dtype=dtype, buffer=_worker_shared_blocks[name].buf)
+
+
+def _detach_shared_arrays(names):
+    """Close cached shared memory blocks not listed in 'names'.
+    """
+    for name in list(_worker_shared_blocks):
+        if name not in names:
+            _worker_shared_blocks.pop(name).close()
+
+
+def _evaluate_shared_range(task):
+    """Evaluate genomes in given index range of the shared genome matrix
+    and write results into the shared fitness vector.
+    """
+    genomes_name, fitness_name, shape, dtype, genome_shape, start, stop = task
+    _detach_shared_arrays((genomes_name, fitness_name))
+
+    genomes = _attach_shared_array(genomes_name, shape, dtype)[start:stop]
+    fitness = _attach_shared_array(fitness_name, (shape[0],), 'd')
+
+    if supports_batch(_worker_fitness_function):
+        fitness[start:stop] = _worker_fitness_function.evaluate_batch(genomes)
+    else:
+        fitness[start:stop] = [
+            _worker_fitness_function(genome)
+            for genome in genomes.reshape((-1,) + genome_shape)]
+
+
+class SharedMemoryEvaluator:
+    """Evaluates genome matrices in worker processes,
+    exchanging genomes and fitness values through shared memory.
+
+    Genome matrix is copied into a shared memory block and workers
+    receive only index ranges of genomes to evaluate. Fitness values
+    are written by workers directly into shared fitness vector.
+    Nothing but the fitness function, sent once at worker start,
+    is ever pickled.
+
+    Shared memory blocks are reused as long as the evaluated matrix fits.
+
+    Parameters
+    ----------
+    fitness_function : BaseFunction
+        Fitness function evaluated by the workers.
+    n_workers : int
+        Number of worker processes, by default number of CPUs.
+    chunk_size : int
+        Number of genomes evaluated by a worker in single task.
+        By default genomes are split evenly, into four tasks per worker.
+    """
+    def __init__(self, fitness_function, n_workers=None, chunk_size=None):
+        self._fitness_function = fitness_function
+        self._n_workers = n_workers or mp.cpu_count()
+        self._chunk_size = chunk_size
+        #Workers share the resource tracker of the parent, see _attach_shared_block.
+        resource_tracker.ensure_running()
+        self._worker_pool = mp.Pool(
+            self._n_workers,
+            initializer=_init_worker,
+            initargs=(fitness_function,))
+        self._genomes_block = None
+        self._fitness_block = None
+
+    def _allocate(self, genomes_size, fitness_size):
+        """Ensure shared memory blocks have at least requested size in bytes.
+        """
+        if self._genomes_block is None or self._genomes_block.size < genomes_size:
+            self._release(self._genomes_block)
+            self._genomes_block = shared_memory.SharedMemory(
+                create=True, size=max(genomes_size, 1))
+        if self._fitness_block is None or self._fitness_block.size < fitness_size:
+            self._release(self._fitness_block)
+            self._fitness_block = shared_memory.SharedMemory(
+                create=True, size=max(fitness_size, 1))
+
+    @staticmethod
+    def _release(block):
+        if block is not None:
+            block.close()
+            block.unlink()
+
+    def evaluate(self, genomes, genome_shape=None, timeout=None):
+        """Evaluate every genome of the matrix in worker processes.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Matrix of flattened genomes, one genome per row.
+        genome_shape : tuple
+            Shape of genomes passed to the fitness function,
+            if it doesn't evaluate them in batches, see `supports_batch`.
+            Flattened genomes are passed by default.
+        timeout : float
+            Seconds to wait for the workers.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of fitness values, one for each genome.
+
+        Raises
+        ------
+        multiprocessing.TimeoutError
+            If evaluation didn't finish in time.
+        """
+        pop_size = genomes.shape[0]
+        if genome_shape is None:
+            genome_shape = genomes.shape[1:]
+
+        self._allocate(genomes.nbytes, pop_size * np.dtype('d').itemsize)
+        shared_genomes = np.ndarray(
+            genomes.shape, dtype=genomes.dtype, buffer=self._genomes_block.buf)
+        shared_genomes[:] = genomes
+
+        chunk_size = self._chunk_size or max(1, -(-pop_size // (4*self._n_workers)))
+        tasks = [
+            (self._genomes_block.name, self._fitness_block.name,
+             genomes.shape, genomes.dtype.str, tuple(genome_shape),
+             start, min(start + chunk_size, pop_size))
+            for start in range(0, pop_size, chunk_size)]
+
+        self._worker_pool.map_async(_evaluate_shared_range, tasks).get(timeout)
+
+        return np.ndarray(
+            (pop_size,), dtype='d', buffer=self._fitness_block.buf).copy()
+
+    def close(self, terminate=False):
+        """Shut down workers and release shared memory.
+        Workers are given time to finish their tasks, unless 'terminate' is True.
+        """
+        if terminate:
+            self._worker_pool.terminate()
+        else:
+            self._worker_pool.close()
+        self._worker_pool.join()
+
+        self._release(self._genomes_block)
+        self._release(self._fitness_block)
+        self._genomes_block = None
+        self._fitness_block = None
+
+    @property
+    def fitness_function(self):
+        """Return fitness function evaluated by the workers.
+        """
+        return self._fitness_function
+
+
+class ThreadPoolEvaluator:
+    """Evaluates genomes in a persistent pool of threads.
+
+    Genomes are split into chunks, each evaluated by a single call
+    of the supplied chunk function in one of the threads.
+    Nothing is copied or pickled, so the pool suits fitness functions
+    spending most of their time in code releasing the GIL,
+    such as NumPy and BLAS routines.
+
+    Parameters
+    ----------
+    n_workers : int
+        Number of threads, by default number of CPUs.
+    chunk_size : int
+        Number of genomes evaluated by a thread in single task.
+        By default genomes are split evenly, into four tasks per thread.
+    """
+    def __init__(self, n_workers=None, chunk_size=None):
+        self._n_workers = n_workers or mp.cpu_count()
+        self._chunk_size = chunk_size
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            self._n_workers, thread_name_prefix='pystrand-evaluator')
+
+    def evaluate(self, genomes, evaluate_chunk, timeout=None):
+        """Evaluate genomes in chunks, using the pool threads.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+            Genome matrix, or array of genotypes, with one individual per row.
+        evaluate_chunk : callable
+            Function returning fitness values of a slice of 'genomes'.
+        timeout : float
+            Seconds to wait for the threads.
+
+        Returns
+        -------
+        np.ndarray
+            Vector of fitness values, one for each genome.
+
+        Raises
+        ------
+        multiprocessing.TimeoutError
+            If evaluation didn't finish in time.
+        """
+        pop_size = len(genomes)
+        if pop_size == 0:
+            return np.zeros(0)
+
+        chunk_size = self._chunk_size or max(1, -(-pop_size // (4*self._n_workers)))
+        futures = [
+            self._executor.submit(evaluate_chunk, genomes[start:start + chunk_size])
+            for start in range(0, pop_size, chunk_size)]
+
+        _, not_done = concurrent.futures.wait(futures, timeout)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            raise mp.TimeoutError(
+                "{} of {} chunks not evaluated in time.".format(len(not_done), len(futures)))
+
+        return np.concatenate(
+            [np.asarray(future.result(), dtype='d') for future in futures])
+
+    def close(self, terminate=False):
+        """Shut down the threads.
+        Threads are given time to finish their tasks, unless 'terminate' is True,
+        in which case running tasks are abandoned.
+        Tasks that timed out were already cancelled by `evaluate`.
+        """
+        self._executor.shutdown(wait=not terminate)
+
+
+def start_worker_pool(mode, fitness_function, n_workers=None, chunk_size=None):
+    """Return pool of workers evaluating 'fitness_function'.
+
+    Parameters
+    ----------
+    mode : bool, str
+        'shared_memory' for SharedMemoryEvaluator, 'threads' for ThreadPoolEvaluator,
+        multiprocessing.Pool otherwise.
+    fitness_function : BaseFunction
+        Sent to the worker processes when the pool starts.
+        Thread pool receives chunk functions with every evaluation instead.
+    n_workers : int
+        Number of workers, by default number of CPUs.
+    chunk_size : int
+        Number of genomes evaluated by a worker in single task.
+    """
+    if mode == 'shared_memory':
+        return SharedMemoryEvaluator(
+            fitness_function, n_workers=n_workers, chunk_size=chunk_size)
+    if mode == 'threads':
+        return ThreadPoolEvaluator(n_workers=n_workers, chunk_size=chunk_size)
+
+    return mp.Pool(n_workers, initializer=_init_worker, initargs=(fitness_function,))
+
+
+def close_worker_pool(pool, terminate=False):
+    """Shut down pool returned by `start_worker_pool`.
+    Workers are given time to finish their tasks, unless 'terminate' is True.
+    """
+    if isinstance(pool, (SharedMemoryEvaluator, ThreadPoolEvaluator)):
+        pool.close(terminate=terminate)
+        return
+
+    if terminate:
+        pool.terminate()
+    else:
+        pool.close()
+    pool.join()
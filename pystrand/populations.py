@@ -1,5 +1,6 @@
 import numpy as np
-from pystrand.genotypes import Genotype
+from pystrand.genotypes import INDIVIDUAL_DTYPE, Genotype, resolve_dtype
+from pystrand.operators.crossovers import UniformCrossover
 
 class BasePopulation:
     """Collection of individual genotypes.
@@ -21,6 +22,9 @@ class BasePopulation:
         if random_init = False
     seed_individuals : Population
         numpy array of evaluated inidividuals
+    dtype : str, np.dtype
+        data type of genes, if 'auto' the most compact type
+        able to represent all gene_vals is chosen
 
     """
 
@@ -32,15 +36,26 @@ class BasePopulation:
                  seed=None,
                  default_genome=None,
                  seed_individuals=None,
+                 dtype=None,
                  **kwargs):
         """New individuals are not generated if seed_individuals isn't None.
         """
-        self._dtype = np.dtype([('fitness', 'd'), ('genotype', 'O')])
+        self._dtype = INDIVIDUAL_DTYPE
         self._gene_values = gene_vals
         self._random_init = random_init
         self._seed = seed
         self._default_genome = default_genome
+        self._genome_dtype = resolve_dtype(
+            dtype, [0, 1] if gene_vals is None else gene_vals)
 
+        self._create_individuals(pop_size, genome_shapes, seed_individuals)
+
+        super().__init__(**kwargs)
+
+    def _create_individuals(self, pop_size, genome_shapes, seed_individuals):
+        """Set up individuals of new population, either from 'seed_individuals'
+        or generated according to the population settings.
+        """
         if isinstance(genome_shapes, tuple):
             self._genome_shapes = [genome_shapes for i in range(pop_size)]
         elif isinstance(genome_shapes, list):
@@ -55,16 +70,15 @@ class BasePopulation:
                         0.0,
                         Genotype(
                             shape,
-                            random_init,
-                            gene_vals,
-                            seed,
-                            default_genome
+                            self._random_init,
+                            self._gene_values,
+                            self._seed,
+                            self._default_genome,
+                            dtype=self._genome_dtype
                             ))
                     for shape, i in zip(self._genome_shapes, range(pop_size))],
                 dtype=self._dtype)
 
-        super().__init__(**kwargs)
-
     def replace_individuals(self, new_individuals):
         """Safely replace existing individuals in the population with 'new_individuals'.
 
@@ -96,6 +110,11 @@ class BasePopulation:
             Two available options are 'clone' and 'random'.
             The 'clone' strategy selects random existing individuals,
             while the 'random' strategy generates new ones.
+
+        Raises
+        ------
+        ValueError
+            If supplied unknown strategy.
         """
         size_difference = target_pop_size-self.population_size
 
@@ -116,7 +135,8 @@ class BasePopulation:
                             self._random_init,
                             self._gene_values,
                             self._seed,
-                            self._default_genome
+                            self._default_genome,
+                            dtype=self._genome_dtype
                             )
                         )]
 
@@ -124,6 +144,11 @@ class BasePopulation:
                 new_individuals,
                 dtype=self._dtype)
 
+        else:
+            raise ValueError(
+                'Unknown population expansion strategy.',
+                strategy)
+
         self._individuals = np.append(self._individuals, new_individuals)
 
     def mutate_genotypes(self, mutation_ops):
@@ -134,7 +159,7 @@ class BasePopulation:
         mutation_ops : list
             List of mutation operators
         """
-        for genotype in self._individuals['genotype']:
+        for genotype in self.genotypes:
             if not genotype.protected:
                 for mutation_op in mutation_ops:
                     genotype.mutate(mutation_op)
@@ -142,22 +167,101 @@ class BasePopulation:
     def cross_genomes(
             self,
             secondary_population=None,
-            crossover_prob=0.0):
+            crossover_prob=0.0,
+            crossover_op=None):
         """Crosses genome of inidividuals with those in 'secondary_population'.
+        Individuals are replaced by their offspring.
 
         Parameters
         ----------
         secondary_population : Population
         crossover_prob : float
+        crossover_op : BaseCrossover
+            Operator generating crossover masks.
+            If None, masks are generated by the Genotype.crossover.
         """
+        genotypes = self.genotypes
         if secondary_population is None:
-            secondary_population = self._individuals['genotype']
-        for individual in self._individuals['genotype']:
+            secondary_population = genotypes
+        for individual in genotypes:
             if not individual.protected:
                 if np.random.random_sample(1) < crossover_prob:
-                    individual = individual.crossover(np.random.choice(secondary_population))
+                    mask = None
+                    if crossover_op is not None:
+                        mask = crossover_op.mask(1, individual.size).reshape(individual.shape)
+                    individual[...] = individual.crossover(
+                        np.random.choice(secondary_population), mask)
+
+    def best_indices(self, size=1):
+        """Return indices of 'n' individuals with highest value of fitness,
+        ordered by ascending fitness.
+
+        Only the selected indices are sorted, after partitioning
+        the fitness column, taking O(n + k log k) time.
+
+        Parameters
+        ----------
+        size : int
+
+        Returns
+        -------
+        np.ndarray
+
+        """
+        fitness = self.fitness
+        size = min(size, fitness.size)
+        if size <= 0:
+            return np.empty(0, dtype=int)
+
+        indices = np.argpartition(fitness, fitness.size - size)[-size:]
+
+        return indices[np.argsort(fitness[indices], kind='stable')]
+
+    def worst_indices(self, size=1):
+        """Return indices of 'n' individuals with lowest value of fitness,
+        in no particular order.
+
+        Parameters
+        ----------
+        size : int
+
+        Returns
+        -------
+        np.ndarray
+
+        """
+        fitness = self.fitness
+        size = min(size, fitness.size)
+        if size <= 0:
+            return np.empty(0, dtype=int)
 
-    def retrieve_best(self, size=1):
+        return np.argpartition(fitness, size - 1)[:size]
+
+    def replace_worst(self, new_individuals):
+        """Replace individuals with lowest value of fitness by 'new_individuals',
+        such as migrants from other populations. New individuals are not protected.
+        Population size doesn't change, surplus individuals are ignored.
+
+        Parameters
+        ----------
+        new_individuals : np.ndarray
+
+        Raises
+        ------
+        TypeError
+            If new_individuals isn't numpy array of required dtype.
+        """
+        if not isinstance(new_individuals, np.ndarray) or new_individuals.dtype.type is not self._dtype.type:
+            raise TypeError()
+
+        indices = self.worst_indices(new_individuals.size)
+        new_individuals = new_individuals[:indices.size].copy()
+        for genotype in new_individuals['genotype']:
+            genotype.protected = False
+
+        self._individuals[indices] = new_individuals
+
+    def retrieve_best(self, size=1, copy=True):
         """Return 'n' individuals with highest value of fitness.
 
         Note
@@ -167,18 +271,23 @@ class BasePopulation:
         Parameters
         ----------
         size : int
+        copy : bool
+            If False, returned individuals share genotypes with the population.
+            Default is True.
 
         Returns
         -------
         np.ndarray
 
         """
-        indices = np.argsort(self._individuals['fitness'])[-size:]
+        best = self._individuals[self.best_indices(size)]
 
-        #Ugly but it works.
-        return np.array(
-            [(fitness, genotype.copy()) for fitness, genotype in self._individuals[indices]],
-            dtype=self._dtype)
+        if copy:
+            genotypes = best['genotype']
+            for index, genotype in enumerate(genotypes):
+                genotypes[index] = genotype.copy()
+
+        return best
 
     def append_individuals(self, new_individuals):
         """Append array of 'new_individuals' to existing
@@ -198,6 +307,62 @@ class BasePopulation:
 
         self._individuals = np.append(self._individuals, new_individuals)
 
+    def to_arrays(self):
+        """Return genomes, fitness and protection flags of individuals
+        as three arrays, with individuals along the first axis.
+
+        Returns
+        -------
+        tuple
+
+        Raises
+        ------
+        ValueError
+            If genomes differ in shape.
+        """
+        return (
+            self._stacked_genomes(),
+            np.array(self.fitness, dtype='d'),
+            np.array([genotype.protected for genotype in self.genotypes], dtype=bool))
+
+    def _stacked_genomes(self):
+        """Return genomes stacked into a new array, with individuals along the first axis.
+
+        Raises
+        ------
+        ValueError
+            If genomes differ in shape.
+        """
+        genotypes = self.genotypes
+        if len(set(genotype.shape for genotype in genotypes)) > 1:
+            raise ValueError("Genomes of different shapes can't be stacked.")
+        if genotypes.size > 0:
+            return np.stack([np.asarray(genotype) for genotype in genotypes])
+
+        return np.zeros((0,) + tuple(self._genome_shapes[0] if self._genome_shapes else ()))
+
+    def restore_arrays(self, genomes, fitness, protected):
+        """Replace individuals by those described by arrays,
+        as returned by `to_arrays`.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+        fitness : np.ndarray
+        protected : np.ndarray
+        """
+        self._individuals = np.array(
+            [(fitness_value,
+              Genotype(
+                  genome.shape,
+                  gene_vals=self._gene_values,
+                  default_genome=np.array(genome),
+                  protected=bool(protection)))
+             for genome, fitness_value, protection in zip(genomes, fitness, protected)],
+            dtype=self._dtype)
+        if len(genomes) > 0:
+            self._genome_shapes = [genome.shape for genome in genomes]
+
     #Properties for easier retrieval of frequently used values.
     @property
     def population_size(self):
@@ -217,32 +382,567 @@ class BasePopulation:
         """
         return self._gene_values
 
+    @property
+    def genome_dtype(self):
+        """Return data type of genes, or None if it wasn't set.
+        """
+        return self._genome_dtype
+
     @property
     def individuals(self):
         """Return _individuals ndarray.
         """
         return self._individuals
 
+    @property
+    def genotypes(self):
+        """Return genotype column of _individuals ndarray.
+        """
+        return self._individuals['genotype']
+
+    @property
+    def genomes(self):
+        """Return matrix of flattened genomes, one row per individual.
+        Genomes are stacked into a new array, changes of its values
+        are not reflected in the population.
+
+        Raises
+        ------
+        ValueError
+            If genomes differ in shape.
+        """
+        genomes = self._stacked_genomes()
+        return genomes.reshape(genomes.shape[0], int(np.prod(genomes.shape[1:])))
+
+    @property
+    def fitness(self):
+        """Return fitness column of _individuals ndarray.
+        Column is a view, assigning to its elements alters the population.
+        """
+        return self._individuals['fitness']
+
     @property
     def avg_fitness(self):
         """Return average fitness as float.
         """
-        return np.average([genotype['fitness'] for genotype in self._individuals])
+        return np.average(self.fitness)
 
     @property
     def max_fitness(self):
         """Return max fitness as float.
         """
-        return np.max([genotype['fitness'] for genotype in self._individuals])
+        return np.max(self.fitness)
 
     @property
     def min_fitness(self):
         """Return min fitness as float.
         """
-        return np.min([genotype['fitness'] for genotype in self._individuals])
+        return np.min(self.fitness)
 
     @property
     def fitness_std(self):
         """Return standard deviation of fitness as float.
         """
-        return np.std([genotype['fitness'] for genotype in self._individuals])
+        return np.std(self.fitness)
+
+    def fitness_statistics(self):
+        """Return fitness statistics of the population, computed together
+        on the fitness column.
+
+        Returns
+        -------
+        dict
+            Maximum, minimum, average and standard deviation of fitness,
+            under keys 'max_fitness', 'min_fitness', 'fitness_avg' and 'fitness_std'.
+        """
+        fitness = self.fitness
+        fitness_avg = fitness.mean()
+        deviation = fitness - fitness_avg
+
+        return {
+            'max_fitness': fitness.max(),
+            'min_fitness': fitness.min(),
+            'fitness_avg': fitness_avg,
+            'fitness_std': np.sqrt(np.dot(deviation, deviation) / fitness.size)}
+
+
+class MatrixPopulation(BasePopulation):
+    """Collection of genotypes sharing a single shape,
+    stored as one contiguous matrix.
+
+    Genomes of all individuals are kept in a single ndarray with
+    individuals along the first axis, fitness values and protection flags
+    are stored in separate vectors. The structured array of individuals,
+    as used by the `BasePopulation`, is still available through the
+    `individuals` property, with genotypes being views of the matrix rows.
+
+    Parameters
+    ----------
+    pop_size : int
+        number of individuals in given population
+    genome_shapes : tuple, list
+        shape of individual genomes, all shapes in list must be equal
+    random_init : bool
+        if the genomes are supposed to be randomized
+    gene_vals : list
+        possible values of genes for given population
+    seed : int
+    default_genome : Genotype
+        used as genome for entire population,
+        if random_init = False
+    seed_individuals : Population
+        numpy array of evaluated inidividuals
+    dtype : str, np.dtype
+        data type of genes, if 'auto' the most compact type
+        able to represent all gene_vals is chosen,
+        by default float64 unless determined by gene_vals
+    double_buffered : bool
+        If True, new generations are written into preallocated buffers,
+        which are then swapped with the current ones.
+        Arrays, and genotype views, obtained from the population
+        are overwritten two generations later.
+        Default is False.
+
+    Raises
+    ------
+    ValueError
+        If supplied genome shapes differ.
+    """
+
+    def __init__(self,
+                 pop_size,
+                 genome_shapes,
+                 random_init=None,
+                 gene_vals=None,
+                 seed=None,
+                 default_genome=None,
+                 seed_individuals=None,
+                 dtype=None,
+                 double_buffered=False,
+                 **kwargs):
+        """New individuals are not generated if seed_individuals isn't None.
+        """
+        self._double_buffered = double_buffered
+        self._buffers = None
+        self._rng = np.random.default_rng(seed)
+
+        super().__init__(
+            pop_size,
+            genome_shapes,
+            random_init=random_init,
+            gene_vals=[0, 1] if gene_vals is None else gene_vals,
+            seed=seed,
+            default_genome=default_genome,
+            seed_individuals=seed_individuals,
+            dtype=dtype,
+            **kwargs)
+
+    def _create_individuals(self, pop_size, genome_shapes, seed_individuals):
+        """Set up genome matrix, fitness and protection flags of new population,
+        either from 'seed_individuals' or generated according to the population settings.
+        """
+        if self._genome_dtype is None and self._random_init:
+            self._genome_dtype = np.asarray(self._gene_values).dtype
+
+        if isinstance(genome_shapes, list):
+            if len(set(genome_shapes)) != 1:
+                raise ValueError(
+                    "All genomes of MatrixPopulation must share one shape.",
+                    genome_shapes)
+            genome_shapes = genome_shapes[0]
+        self._genome_shape = tuple(genome_shapes)
+
+        if seed_individuals is not None:
+            self._set_individuals(seed_individuals)
+        else:
+            self._genomes = self._new_genomes(pop_size)
+            self._fitness = np.zeros(pop_size)
+            self._protected = np.zeros(pop_size, dtype=bool)
+
+    def _new_genomes(self, size):
+        """Return matrix of 'size' new genomes, created according
+        to the population settings.
+        """
+        shape = (size,) + self._genome_shape
+        if self._random_init:
+            return self._rng.choice(
+                np.asarray(self._gene_values, dtype=self._genome_dtype), shape)
+        if self._default_genome is not None:
+            return np.array(
+                np.broadcast_to(self._default_genome, shape), dtype=self._genome_dtype, order='C')
+        return np.zeros(shape, dtype=self._genome_dtype)
+
+    def _set_individuals(self, individuals):
+        """Replace genomes, fitness and protection flags
+        with values stored in the structured array of 'individuals'.
+        """
+        if individuals.size > 0:
+            genomes = np.array(
+                [np.asarray(genotype) for genotype in individuals['genotype']],
+                dtype=self._genome_dtype)
+        else:
+            genomes = np.zeros((0,) + self._genome_shape, dtype=self._genome_dtype)
+
+        if genomes.shape[1:] != self._genome_shape:
+            raise ValueError(
+                "Genome shape doesn't match the population.",
+                genomes.shape[1:])
+
+        self._genomes = genomes
+        self._fitness = np.array(individuals['fitness'], dtype='d')
+        self._protected = np.array(
+            [getattr(genotype, 'protected', False)
+             for genotype in individuals['genotype']],
+            dtype=bool)
+
+    def replace_individuals(self, new_individuals):
+        """Safely replace existing individuals in the population with 'new_individuals'.
+
+        Parameters
+        ----------
+        new_individuals: np.ndarray
+            new individuals array
+
+        Raises
+        ------
+        TypeError
+            If new_individuals isn't numpy array of required dtype.
+        """
+        if not isinstance(new_individuals, np.ndarray):
+            raise TypeError()
+        if new_individuals.dtype.type is not self._dtype.type:
+            raise TypeError("Invalid dtype of new_individuals ndarrays")
+        self._set_individuals(new_individuals)
+
+    def expand_population(self, target_pop_size, strategy='clone'):
+        """Increases number of indivuals in given population.
+
+        Parameters
+        ----------
+        target_pop_size : int
+            number of individuals we want in population.
+        strategy : str
+            Defines how are the new individuals created.
+            Two available options are 'clone' and 'random'.
+            The 'clone' strategy selects random existing individuals,
+            while the 'random' strategy generates new ones.
+
+        Raises
+        ------
+        ValueError
+            If supplied unknown strategy.
+        """
+        size_difference = target_pop_size-self.population_size
+
+        if strategy == 'clone':
+            sources = self._rng.choice(self.population_size, size_difference)
+            new_genomes = self._genomes[sources]
+            new_fitness = self._fitness[sources]
+        elif strategy == 'random':
+            new_genomes = self._new_genomes(size_difference)
+            new_fitness = np.zeros(size_difference)
+        else:
+            raise ValueError(
+                'Unknown population expansion strategy.',
+                strategy)
+
+        self._genomes = np.concatenate((self._genomes, new_genomes)).astype(
+            self._genomes.dtype, copy=False)
+        self._fitness = np.concatenate((self._fitness, new_fitness))
+        self._protected = np.concatenate(
+            (self._protected, np.zeros(size_difference, dtype=bool)))
+
+    def mutate_genotypes(self, mutation_ops):
+        """Apply mutation operators to individuals in order provided.
+        Each operator is applied on the whole genome matrix at once.
+
+        Parameters
+        ----------
+        mutation_ops : list
+            List of mutation operators
+        """
+        for mutation_op in mutation_ops:
+            mutation_op.mutate_batch(self._genomes, self._gene_values, self._protected)
+
+    def replace_generation(self, selections, target_pop_size=None):
+        """Replace individuals with a new generation, consisting of
+        selected individuals and random clones of them.
+        Clones are never protected.
+
+        If the population is double buffered, new generation is written
+        into preallocated buffers, which are then swapped with the current ones.
+
+        Parameters
+        ----------
+        selections : list
+            List of (indices, protect) tuples, where 'indices' are indices
+            of selected individuals and 'protect' determines whether they
+            will be protected from alteration by genetic operators.
+        target_pop_size : int
+            Size of new generation, by default the current population size.
+        """
+        if target_pop_size is None:
+            target_pop_size = self.population_size
+
+        sources = np.concatenate(
+            [np.asarray(indices, dtype=int) for indices, _ in selections])
+        protected = np.concatenate(
+            [np.full(len(indices), protect, dtype=bool) for indices, protect in selections])
+
+        size_difference = target_pop_size - sources.size
+        if size_difference > 0:
+            clones = self._rng.choice(sources.size, size_difference)
+            sources = np.concatenate((sources, sources[clones]))
+            protected = np.concatenate((protected, np.zeros(size_difference, dtype=bool)))
+
+        if not self._double_buffered:
+            self._genomes = self._genomes[sources]
+            self._fitness = self._fitness[sources]
+            self._protected = protected
+            return
+
+        if self._buffers is None or self._buffers[0].shape[0] != sources.size \
+                or self._buffers[0].dtype != self._genomes.dtype:
+            self._buffers = (
+                np.empty((sources.size,) + self._genomes.shape[1:], dtype=self._genomes.dtype),
+                np.empty(sources.size),
+                np.empty(sources.size, dtype=bool))
+
+        genomes, fitness, protected_flags = self._buffers
+        np.take(self._genomes, sources, axis=0, out=genomes)
+        np.take(self._fitness, sources, out=fitness)
+        protected_flags[:] = protected
+
+        self._buffers = (self._genomes, self._fitness, self._protected)
+        self._genomes, self._fitness, self._protected = genomes, fitness, protected_flags
+
+    def cross_genomes(
+            self,
+            secondary_population=None,
+            crossover_prob=0.0,
+            crossover_op=None):
+        """Crosses genome of inidividuals with those in 'secondary_population'.
+        Offspring of the whole population is generated at once,
+        and replaces the individuals in the genome matrix.
+
+        Parameters
+        ----------
+        secondary_population : MatrixPopulation
+        crossover_prob : float
+        crossover_op : BaseCrossover
+            Operator generating crossover masks.
+            If None, UniformCrossover is used.
+        """
+        if crossover_op is None:
+            crossover_op = UniformCrossover()
+        partner_genomes = None
+        if secondary_population is not None:
+            partner_genomes = secondary_population.genomes
+
+        crossover_op.cross_batch(
+            self._genomes,
+            crossover_prob,
+            protected=self._protected,
+            partner_genomes=partner_genomes)
+
+    def retrieve_best(self, size=1, copy=True):
+        """Return 'n' individuals with highest value of fitness.
+
+        Parameters
+        ----------
+        size : int
+        copy : bool
+            If False, returned genotypes are views of the genome matrix.
+            Default is True.
+
+        Returns
+        -------
+        np.ndarray
+
+        """
+        indices = self.best_indices(size)
+
+        if copy:
+            genomes = self._genomes[indices]
+        else:
+            genomes = [self._genomes[index] for index in indices]
+
+        best = np.empty(indices.size, dtype=self._dtype)
+        best['fitness'] = self._fitness[indices]
+        best['genotype'] = self._genotypes(genomes, self._protected[indices])
+
+        return best
+
+    def append_individuals(self, new_individuals):
+        """Append array of 'new_individuals' to existing
+        individuals managed by the Population object.
+
+        Parameters
+        ----------
+        new_individuals : np.ndarray
+
+        Raises
+        ------
+        TypeError
+            If new_individuals isn't numpy array of required dtype.
+        """
+        if not isinstance(new_individuals, np.ndarray) or new_individuals.dtype.type is not self._dtype.type:
+            raise TypeError()
+
+        genomes, fitness, protected = self._genomes, self._fitness, self._protected
+        self._set_individuals(new_individuals)
+
+        self._genomes = np.concatenate((genomes, self._genomes)).astype(
+            genomes.dtype if genomes.size else self._genomes.dtype, copy=False)
+        self._fitness = np.concatenate((fitness, self._fitness))
+        self._protected = np.concatenate((protected, self._protected))
+
+    def replace_worst(self, new_individuals):
+        """Replace individuals with lowest value of fitness by 'new_individuals',
+        such as migrants from other populations. New individuals are not protected.
+        Population size doesn't change, surplus individuals are ignored.
+
+        Parameters
+        ----------
+        new_individuals : np.ndarray
+
+        Raises
+        ------
+        TypeError
+            If new_individuals isn't numpy array of required dtype.
+        """
+        if not isinstance(new_individuals, np.ndarray) or new_individuals.dtype.type is not self._dtype.type:
+            raise TypeError()
+
+        indices = self.worst_indices(new_individuals.size)
+        new_individuals = new_individuals[:indices.size]
+
+        self._genomes[indices] = self._genome_matrix(new_individuals['genotype'])
+        self._fitness[indices] = new_individuals['fitness']
+        self._protected[indices] = False
+
+    def to_arrays(self):
+        """Return genome matrix, fitness vector and protection flags.
+        Arrays are not copied.
+
+        Returns
+        -------
+        tuple
+        """
+        return self._genomes, self._fitness, self._protected
+
+    def restore_arrays(self, genomes, fitness, protected):
+        """Replace genome matrix, fitness vector and protection flags
+        by arrays returned by `to_arrays`. Arrays are not copied,
+        memory mapped arrays have to be writable or copy-on-write.
+
+        Parameters
+        ----------
+        genomes : np.ndarray
+        fitness : np.ndarray
+        protected : np.ndarray
+
+        Raises
+        ------
+        ValueError
+            If genome matrix doesn't match the population.
+        """
+        if genomes.shape[1:] != self._genomes.shape[1:]:
+            raise ValueError(
+                "Genome shape doesn't match the population.",
+                genomes.shape[1:])
+
+        self._genomes = genomes
+        self._fitness = fitness
+        self._protected = protected
+        self._buffers = None
+
+    def _genome_matrix(self, genotypes):
+        """Return genotypes converted into rows of the genome matrix.
+        """
+        return np.array(
+            [np.asarray(genotype) for genotype in genotypes],
+            dtype=self._genomes.dtype).reshape((len(genotypes),) + self._genome_shape)
+
+    def _genotypes(self, genomes, protected=None):
+        """Return object array of Genotype views of 'genomes' matrix rows.
+        """
+        genotypes = np.empty(len(genomes), dtype=object)
+        for index, genome in enumerate(genomes):
+            genotype = genome.view(Genotype)
+            genotype.gene_vals = self._gene_values
+            genotype.protected = False if protected is None else bool(protected[index])
+            genotypes[index] = genotype
+
+        return genotypes
+
+    @property
+    def population_size(self):
+        """Return number of rows of the genome matrix as an integer.
+        """
+        return self._genomes.shape[0]
+
+    @property
+    def genome_shapes(self):
+        """Return list of genome shapes, one for each individual.
+        """
+        return [self._genome_shape] * self.population_size
+
+    @property
+    def genome_shape(self):
+        """Return shape shared by all genomes.
+        """
+        return self._genome_shape
+
+    @property
+    def genome_dtype(self):
+        """Return data type of genes.
+        """
+        return self._genomes.dtype
+
+    @property
+    def genomes(self):
+        """Return genome matrix with one row per individual.
+        Genomes are flattened, the returned array is a view.
+        """
+        return self._genomes.reshape(
+            self.population_size, int(np.prod(self._genome_shape)))
+
+    @property
+    def fitness(self):
+        """Return fitness vector.
+        """
+        return self._fitness
+
+    @property
+    def protected(self):
+        """Return vector of protection flags.
+        """
+        return self._protected
+
+    @property
+    def genotypes(self):
+        """Return object array of Genotype views of individual genomes.
+        Changes of genotype values are reflected in the population.
+        The array itself is built on every access and is read-only,
+        as replacing its elements wouldn't affect the population.
+        """
+        genotypes = self._genotypes(self._genomes, self._protected)
+        genotypes.flags.writeable = False
+
+        return genotypes
+
+    @property
+    def individuals(self):
+        """Return structured array of individuals.
+        Genotypes are views of the genome matrix, changes of their
+        values are reflected in the population. The array itself
+        is built on every access and is read-only, fitness values
+        and protection flags are set through `fitness` and `protected`.
+        """
+        individuals = np.empty(self.population_size, dtype=self._dtype)
+        individuals['fitness'] = self._fitness
+        individuals['genotype'] = self.genotypes
+        individuals.flags.writeable = False
+
+        return individuals
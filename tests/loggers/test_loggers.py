@@ -1,4 +1,8 @@
+import os
+import shutil
+import tempfile
 from unittest import TestCase, mock
+import numpy as np
 
 import pystrand.loggers as loggers
 
@@ -19,8 +23,7 @@ class TestCsvLogger(TestCase):
         self.assertEqual('foo/foo/bar', logger.log_path)
         self.assertEqual('fizz', logger.log_file_name)
 
-    @mock.patch(
-        'pystrand.loggers.csv_logger.pd.DataFrame')
+    @mock.patch('pandas.DataFrame')
     def test_save_history_success(self, mock_dataframe):
 
         logger = loggers.csv_logger.CsvLogger(
@@ -32,3 +35,40 @@ class TestCsvLogger(TestCase):
         logger.save_history(data, 'buzz')
 
         mock_dataframe.assert_called_once_with(data=data)
+
+
+class TestStreamLogger(TestCase):
+
+    def setUp(self):
+        super(TestStreamLogger, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def read_log(self, run_id):
+        with open(os.path.join(self.path, 'history_{}.log'.format(run_id))) as file:
+            return file.read().splitlines()
+
+    def test_write_record(self):
+        logger = loggers.stream_logger.StreamLogger(self.path, flush_interval=0)
+
+        logger.open('buzz', ['iteration', 'max_fitness'])
+        logger.write_record([0, 0.5])
+        logger.write_record([np.int64(1), np.float64(0.75)])
+
+        #Rows are on disk before the logger is closed.
+        self.assertEqual(self.read_log('buzz'), [',iteration,max_fitness', '0,0,0.5', '1,1,0.75'])
+        logger.close()
+        self.assertFalse(logger.is_open)
+
+    def test_flush_interval(self):
+        logger = loggers.stream_logger.StreamLogger(self.path, flush_interval=3600)
+
+        logger.open('buzz', ['iteration'])
+        logger.write_record([0])
+        self.assertEqual(self.read_log('buzz'), [])
+
+        logger.flush()
+        self.assertEqual(self.read_log('buzz'), [',iteration', '0,0'])
+        logger.write_record([1])
+        logger.close()
+        self.assertEqual(self.read_log('buzz'), [',iteration', '0,0', '1,1'])
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+import pystrand.operators.crossovers as cross
+from pystrand.populations import MatrixPopulation
+"""Tests for crossover operators.
+"""
+
+class TestCrossover(unittest.TestCase):
+    """Base class of crossover operator tests.
+    Population consists of two halves, one of zeros and one of ones,
+    so that inherited genes can be traced.
+    """
+    crossover_ops = [
+        cross.UniformCrossover(),
+        cross.OnePointCrossover(),
+        cross.TwoPointCrossover()]
+
+    def setUp(self):
+        self.genomes = np.zeros((200, 10, 2))
+        self.genomes[100:] = 1.0
+
+    def test_mask_shape(self):
+        for crossover_op in self.crossover_ops:
+            for genome_size in [1, 2, 10, 1000]:
+                mask = crossover_op.mask(50, genome_size)
+                self.assertEqual(mask.shape, (50, genome_size))
+                self.assertEqual(mask.dtype, bool)
+
+    def test_one_point_mask(self):
+        mask = cross.OnePointCrossover().mask(100, 20)
+
+        self.assertTrue(np.all(np.diff(mask.astype(int), axis=1) >= 0))
+        self.assertFalse(mask[:, 0].any())
+        self.assertTrue(mask[:, -1].all())
+
+    def test_two_point_mask(self):
+        mask = cross.TwoPointCrossover().mask(100, 20)
+
+        self.assertTrue(np.all(np.abs(np.diff(mask.astype(int), axis=1)).sum(axis=1) <= 2))
+
+    def test_cross_batch(self):
+        for crossover_op in self.crossover_ops:
+            genomes = self.genomes.copy()
+            crossover_op.cross_batch(genomes, 1.0)
+
+            self.assertEqual(genomes.shape, self.genomes.shape)
+            self.assertTrue(np.isin(genomes, [0.0, 1.0]).all())
+            self.assertFalse(np.array_equal(genomes, self.genomes))
+
+    def test_cross_batch_protected(self):
+        protected = np.ones(200, dtype=bool)
+        protected[0] = False
+
+        for crossover_op in self.crossover_ops:
+            genomes = self.genomes.copy()
+            crossover_op.cross_batch(genomes, 1.0, protected=protected)
+
+            self.assertTrue(np.array_equal(genomes[1:], self.genomes[1:]))
+
+    def test_cross_packed(self):
+        genomes = np.zeros((200, 21), dtype=np.uint8)
+        partners = np.ones((200, 21), dtype=np.uint8)
+
+        for crossover_op in self.crossover_ops:
+            packed_genomes = np.packbits(genomes, axis=1)
+            crossover_op.cross_packed(
+                packed_genomes, 21, 1.0, partner_genomes=np.packbits(partners, axis=1))
+            offspring = np.unpackbits(packed_genomes, axis=1, count=21)
+
+            self.assertGreater(offspring.sum(), 0)
+            self.assertLess(offspring.sum(), offspring.size)
+            self.assertTrue(np.all(packed_genomes[:, -1] & 0b111 == 0))
+
+        #Offspring of the two-point crossover has at most two switches.
+        self.assertTrue(np.all(np.abs(np.diff(offspring.astype(int), axis=1)).sum(axis=1) <= 2))
+
+    def test_cross_batch_probability(self):
+        genomes = self.genomes.copy()
+        cross.UniformCrossover().cross_batch(genomes, 0.0)
+
+        self.assertTrue(np.array_equal(genomes, self.genomes))
+
+    def test_population_crossover(self):
+        population = MatrixPopulation(
+            200, (10, 2), default_genome=np.zeros((10, 2)))
+        partners = MatrixPopulation(
+            200, (10, 2), default_genome=np.ones((10, 2)))
+
+        population.cross_genomes(partners, crossover_prob=1.0)
+
+        self.assertGreater(population.genomes.sum(), 0)
+        self.assertLess(population.genomes.sum(), population.genomes.size)
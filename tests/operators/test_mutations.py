@@ -124,3 +124,86 @@ class TestShiftMutation(TestMutation):
 
             self.assertTrue(
                 genome['genotype'].min() >= genome['gene_vals'].min())
+
+
+class TestBatchMutation(unittest.TestCase):
+    """Tests of the population-wide mutation interface,
+    shared by all mutation operators.
+    """
+
+    def setUp(self):
+        self.gene_vals = np.array([-2.0, 0.0, 1.0, 3.0])
+        self.mutation_ops = [
+            mut.PointMutation(1.0),
+            mut.BlockMutation(1.0, block_size=3),
+            mut.PermutationMutation(1.0),
+            mut.ShiftMutation(1.0, shift_scale=2)]
+
+    def _genomes(self):
+        return np.random.default_rng(0).choice(self.gene_vals, (100, 10, 3))
+
+    def test_batch_mutation_bounds(self):
+        for mutation_op in self.mutation_ops:
+            genomes = self._genomes()
+            original_genomes = genomes.copy()
+
+            mutation_op.mutate_batch(genomes, self.gene_vals)
+
+            self.assertEqual(genomes.shape, original_genomes.shape)
+            self.assertTrue(np.isin(genomes, self.gene_vals).all())
+            self.assertFalse(np.array_equal(genomes, original_genomes))
+
+    def test_batch_point_mutation(self):
+        genomes = self._genomes()
+        original_genomes = genomes.copy()
+
+        mut.PointMutation(1.0).mutate_batch(genomes, self.gene_vals)
+
+        changed_genes = (genomes != original_genomes).reshape(100, -1).sum(axis=1)
+        self.assertTrue(np.all(changed_genes == 1))
+
+    def test_batch_mutation_protected(self):
+        protected = np.zeros(100, dtype=bool)
+        protected[::2] = True
+
+        for mutation_op in self.mutation_ops:
+            genomes = self._genomes()
+            original_genomes = genomes.copy()
+
+            mutation_op.mutate_batch(genomes, self.gene_vals, protected)
+
+            self.assertTrue(np.array_equal(
+                genomes[protected], original_genomes[protected]))
+
+    def test_packed_point_mutation(self):
+        genomes = np.random.default_rng(0).integers(0, 2, (100, 21), dtype=np.uint8)
+        packed_genomes = np.packbits(genomes, axis=1)
+        protected = np.zeros(100, dtype=bool)
+        protected[:10] = True
+
+        mut.PointMutation(1.0).mutate_packed(packed_genomes, 21, protected)
+        changes = (np.unpackbits(packed_genomes, axis=1, count=21) != genomes).sum(axis=1)
+
+        self.assertTrue(np.all(changes[:10] == 0))
+        self.assertTrue(np.all(changes[10:] == 1))
+        self.assertTrue(np.all(packed_genomes[:, -1] & 0b111 == 0))
+
+    def test_packed_mutation_fallback(self):
+        genomes = np.zeros((100, 21), dtype=np.uint8)
+        packed_genomes = np.packbits(genomes, axis=1)
+
+        mut.BlockMutation(1.0, block_size=5).mutate_packed(packed_genomes, 21)
+        unpacked = np.unpackbits(packed_genomes, axis=1, count=21)
+
+        self.assertTrue(np.all(unpacked.sum(axis=1) <= 5))
+        self.assertGreater(unpacked.sum(), 0)
+        self.assertTrue(np.all(packed_genomes[:, -1] & 0b111 == 0))
+
+    def test_batch_mutation_probability(self):
+        for mutation_op in [mut.PointMutation(0.0), mut.BlockMutation(0.0)]:
+            genomes = self._genomes()
+            original_genomes = genomes.copy()
+
+            mutation_op.mutate_batch(genomes, self.gene_vals)
+
+            self.assertTrue(np.array_equal(genomes, original_genomes))
@@ -1,6 +1,10 @@
 import unittest
+import numpy as np
 from pystrand.operators.selections import *
-from pystrand.populations import BasePopulation
+from pystrand.fitnessfunctions import OneMaxFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
 from pystrand.genotypes import Genotype
 
 class Dummy_Selection_Test(unittest.TestCase):
@@ -199,3 +203,141 @@ class Elitism_Selection_Test(unittest.TestCase):
                     selected_population.population_size/self.test_population.population_size,
                     population_fraction
                     )
+
+class Roulette_Indices_Test(unittest.TestCase):
+
+    selection_types = [RouletteSelection, StochasticUniversalSelection]
+
+    def setUp(self):
+        self.test_population = BasePopulation(1000, (10,))
+        self.test_population.fitness[:] = 0.0
+        self.test_population.fitness[:100] = np.arange(1, 101)
+
+    def test_selection_indices(self):
+        for selection_type in self.selection_types:
+            selection = selection_type(0.5)
+            selected_indices = selection.select_indices(self.test_population)
+
+            self.assertEqual(selected_indices.size, 500)
+            self.assertTrue((selected_indices < 100).all())
+
+    def test_selection_negative(self):
+        self.test_population.fitness[:] -= 1000.0
+
+        for selection_type in self.selection_types:
+            selected_indices = selection_type(0.5).select_indices(self.test_population)
+
+            self.assertEqual(selected_indices.size, 500)
+            self.assertTrue((selected_indices < 100).all())
+
+    def test_selection_unevaluated(self):
+        self.test_population.fitness[:] = 0.0
+
+        for selection_type in self.selection_types:
+            selected_indices = selection_type(0.5).select_indices(self.test_population)
+
+            self.assertEqual(selected_indices.size, 500)
+            self.assertGreater(np.unique(selected_indices).size, 100)
+
+    def test_empty_population(self):
+        for population in [BasePopulation(0, (10,)), MatrixPopulation(0, (10,))]:
+            for selection_type in self.selection_types:
+                selected_indices = selection_type(0.5).select_indices(population)
+
+                self.assertEqual(selected_indices.size, 0)
+                self.assertEqual(len(selection_type(0.5).select(population)), 0)
+
+    def test_sus_spread(self):
+        """SUS selects every individual close to its expected number of times.
+        """
+        selection = StochasticUniversalSelection(5.05)
+        selected_indices = selection.select_indices(self.test_population)
+        counts = np.bincount(selected_indices, minlength=1000)
+
+        self.assertTrue(np.all(np.abs(counts[:100] - np.arange(1, 101)) <= 1))
+
+class Tournament_Selection_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.test_population = BasePopulation(1000, (10,))
+        self.test_population.fitness[:] = np.random.default_rng(0).permutation(1000)
+
+    def test_selection_init(self):
+        selection = TournamentSelection(0.5, tournament_size=3)
+        self.assertIsInstance(selection, TournamentSelection)
+
+    def test_selection(self):
+        for population_fraction in [0.1, 0.5, 0.9]:
+            selection = TournamentSelection(population_fraction)
+            selected_population = selection.select(self.test_population)
+
+            self.assertEqual(
+                selected_population.size,
+                int(population_fraction*self.test_population.population_size))
+
+    def test_selection_pressure(self):
+        """Larger tournaments select fitter individuals.
+        """
+        fitness = self.test_population.fitness
+        mean_fitness = []
+        for tournament_size in [1, 2, 8, 32]:
+            selection = TournamentSelection(1.0, tournament_size=tournament_size)
+            mean_fitness.append(
+                fitness[selection.select_indices(self.test_population)].mean())
+
+        self.assertTrue(np.all(np.diff(mean_fitness) > 0))
+
+    def test_whole_population_tournament(self):
+        selection = TournamentSelection(0.1, tournament_size=10000)
+        selected_indices = selection.select_indices(self.test_population)
+
+        self.assertTrue(np.all(self.test_population.fitness[selected_indices] == 999))
+
+
+class BestThreeSelection(BaseSelection):
+    """Selection overriding only __select__.
+    """
+    def __select__(self, population):
+        individuals = population.individuals
+        return individuals[np.argsort(individuals['fitness'], kind='stable')[-3:]]
+
+
+class Select_fallback_Test(unittest.TestCase):
+
+    def test_select_indices_fallback(self):
+        """
+        Selections overriding only __select__ are respected by select_indices,
+        and so by optimizers evaluating MatrixPopulation.
+        """
+        for population_type in [BasePopulation, MatrixPopulation, PackedBinaryPopulation]:
+            population = population_type(10, (8,), random_init=True, gene_vals=[0, 1])
+            optimizer = BaseOptimizer(
+                population,
+                fitness_function=OneMaxFunction(),
+                selection_ops=BestThreeSelection())
+            optimizer.evaluate_population()
+            best = set(np.argsort(population.fitness, kind='stable')[-3:].tolist())
+            best_genomes = {
+                np.asarray(population.genotypes[index]).tobytes() for index in best}
+
+            indices = BestThreeSelection().select_indices(population)
+            self.assertEqual(len(indices), 3)
+            self.assertEqual(
+                {np.asarray(population.genotypes[index]).tobytes() for index in indices},
+                best_genomes)
+
+            optimizer.select_genomes()
+            self.assertEqual(
+                {np.asarray(genotype).tobytes()
+                 for genotype in optimizer.population.genotypes},
+                best_genomes)
+
+    def test_unknown_individual(self):
+        class ForeignSelection(BaseSelection):
+            def __select__(self, population):
+                return BasePopulation(1, (8,), default_genome=np.full(8, 7)).individuals
+
+        self.assertRaises(
+            ValueError,
+            ForeignSelection().select_indices,
+            MatrixPopulation(5, (8,)))
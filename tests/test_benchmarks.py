@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCHMARK_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'benchmarks', 'run_benchmarks.py')
+
+
+class Test_benchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def run_benchmarks(self, *args):
+        return subprocess.run(
+            [sys.executable, BENCHMARK_SCRIPT,
+             '--sizes', '50', '100', '--lengths', '10', '--repeat', '1',
+             '--n-workers', '1'] + list(args),
+            cwd=self.path, capture_output=True, text=True)
+
+    def test_results_file(self):
+        """
+        Every benchmark is run and reported for every combination within the limit.
+        """
+        process = self.run_benchmarks('--max-genes', '500', '--output', 'results.json')
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+
+        with open(os.path.join(self.path, 'results.json')) as file:
+            results = json.load(file)
+
+        self.assertIn('commit', results['environment'])
+        self.assertEqual(
+            {result['benchmark'] for result in results['results']},
+            {'evaluate_population', 'evaluate_population_parallel',
+             'evaluate_population_pool', 'select_genomes', 'mutate_genotypes',
+             'cross_genomes', 'retrieve_best', 'evaluate_population_base',
+             'select_genomes_base', 'mutate_genotypes_base', 'cross_genomes_base',
+             'retrieve_best_base', 'power_poly_fitness'})
+        for result in results['results']:
+            self.assertEqual((result['population_size'], result['genome_length']), (50, 10))
+            self.assertGreater(result['individuals_per_second'], 0)
+            self.assertGreaterEqual(result['peak_memory_bytes'], 0)
+
+    def test_compare(self):
+        process = self.run_benchmarks(
+            '--benchmarks', 'retrieve_best', '--output', 'baseline.json')
+        self.assertEqual(process.returncode, 0, msg=process.stderr)
+
+        with open(os.path.join(self.path, 'baseline.json')) as file:
+            baseline = json.load(file)
+        for result in baseline['results']:
+            result['seconds'] = 1e-12
+        with open(os.path.join(self.path, 'baseline.json'), 'w') as file:
+            json.dump(baseline, file)
+
+        process = self.run_benchmarks(
+            '--benchmarks', 'retrieve_best', '--output', 'results.json',
+            '--compare', 'baseline.json')
+        self.assertEqual(process.returncode, 1)
+        self.assertIn('REGRESSION', process.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from pystrand.cache import FitnessCache
+from pystrand.fitnessfunctions import BaseFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+
+
+class SumFn(BaseFunction):
+    def __evaluate__(self, values):
+        return float(np.sum(values))
+
+
+class Test_fitness_cache(unittest.TestCase):
+
+    def test_genome_key(self):
+        genome = np.arange(10)
+
+        self.assertEqual(
+            FitnessCache.genome_key(genome),
+            FitnessCache.genome_key(genome.copy()))
+        self.assertNotEqual(
+            FitnessCache.genome_key(genome),
+            FitnessCache.genome_key(genome.reshape(2, 5)))
+        self.assertNotEqual(
+            FitnessCache.genome_key(genome),
+            FitnessCache.genome_key(genome.astype('d')))
+
+    def test_fill_and_store(self):
+        """
+        Identical genomes without cached fitness are grouped under one key.
+        """
+        cache = FitnessCache()
+        genomes = np.array([[0, 1], [1, 1], [0, 1], [1, 0]])
+        cache.put(FitnessCache.genome_key(genomes[1]), 2.0)
+        fitness = np.zeros(4)
+
+        missing = cache.fill(genomes, fitness)
+
+        self.assertEqual(list(missing.values()), [[0, 2], [3]])
+        self.assertEqual(fitness[1], 2.0)
+
+        cache.store(missing, [1.0, 1.5], fitness)
+
+        self.assertEqual(fitness.tolist(), [1.0, 2.0, 1.0, 1.5])
+        self.assertEqual(cache.fill(genomes, np.zeros(4)), {})
+
+    def test_lru_eviction(self):
+        cache = FitnessCache(max_size=2)
+        keys = [FitnessCache.genome_key(np.full(5, i)) for i in range(3)]
+
+        cache.put(keys[0], 0.0)
+        cache.put(keys[1], 1.0)
+        self.assertEqual(cache.get(keys[0]), 0.0)
+        cache.put(keys[2], 2.0)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]), 0.0)
+        self.assertEqual(cache.get(keys[2]), 2.0)
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.misses, 1)
+
+    def test_optimizer_cache(self):
+        for population_type in [BasePopulation, MatrixPopulation]:
+            population = population_type(100, (10,), random_init=True)
+            fitness_fn = SumFn()
+            new_optimizer = BaseOptimizer(
+                population,
+                fitness_function=fitness_fn,
+                cache_size=1000)
+
+            new_optimizer.evaluate_population()
+            fitness = population.fitness.copy()
+            evaluated = fitness_fn.evaluated
+            new_optimizer.evaluate_population()
+
+            self.assertLessEqual(evaluated, 100)
+            self.assertEqual(fitness_fn.evaluated, evaluated)
+            self.assertTrue(np.array_equal(fitness, population.fitness))
+            self.assertEqual(new_optimizer.fitness_cache.hits, 100)
+            self.assertTrue(np.array_equal(
+                population.fitness,
+                [np.sum(genotype) for genotype in population.genotypes]))
+
+
+if __name__ == '__main__':
+    unittest.main()
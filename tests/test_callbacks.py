@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+import numpy as np
+from pystrand.callbacks import (
+    BaseCallback, DiversityStopping, PlateauStopping, population_diversity)
+from pystrand.fitnessfunctions import OneMaxFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+
+
+class RecordingCallback(BaseCallback):
+    """Records events in order of calls.
+    """
+    def __init__(self):
+        self.events = []
+
+    def on_run_start(self, optimizer):
+        self.events.append(('run_start',))
+
+    def on_generation_start(self, optimizer, iteration):
+        self.events.append(('generation_start', iteration))
+
+    def on_evaluation(self, optimizer, iteration):
+        self.events.append(('evaluation', iteration))
+
+    def on_generation_end(self, optimizer, iteration, statistics):
+        self.events.append(('generation_end', iteration, statistics['max_fitness']))
+
+
+class ConstantFn:
+    def __call__(self, genotype):
+        return 0.5
+
+
+class Test_population_diversity(unittest.TestCase):
+
+    def test_diversity(self):
+        base_population = BasePopulation(2, (4,), gene_vals=[0, 1])
+        for genotype, genome in zip(
+                base_population.genotypes, [[0, 1, 0, 1], [1, 1, 0, 0]]):
+            genotype[:] = genome
+        self.assertAlmostEqual(population_diversity(base_population), 0.25)
+
+        for population_type in [BasePopulation, MatrixPopulation, PackedBinaryPopulation]:
+            population = population_type(
+                2, (4,), gene_vals=[0, 1], seed_individuals=base_population.individuals)
+            self.assertAlmostEqual(population_diversity(population), 0.25)
+
+            uniform = population_type(5, (4,), default_genome=np.ones(4), gene_vals=[0, 1])
+            self.assertEqual(population_diversity(uniform), 0.0)
+
+
+class Test_callbacks(unittest.TestCase):
+
+    def test_events(self):
+        callback = RecordingCallback()
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(10, (100,), random_init=True),
+            max_iterations=2,
+            fitness_function=OneMaxFunction(),
+            callbacks=[callback])
+
+        history = new_optimizer.fit(verbose=0)
+
+        self.assertEqual(callback.events, [
+            ('run_start',),
+            ('generation_start', 0), ('evaluation', 0),
+            ('generation_end', 0, history['max_fitness'][0]),
+            ('generation_start', 1), ('evaluation', 1),
+            ('generation_end', 1, history['max_fitness'][1])])
+        self.assertIsNone(new_optimizer.stop_reason)
+
+    def test_invalid_callback(self):
+        self.assertRaises(
+            TypeError,
+            BaseOptimizer, MatrixPopulation(10, (10,)), callbacks=[lambda: None])
+
+    def test_plateau_stopping(self):
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(10, (10,), random_init=True),
+            max_iterations=100,
+            fitness_function=ConstantFn(),
+            callbacks=[PlateauStopping(patience=5)])
+
+        for _ in range(2):
+            history = new_optimizer.fit(verbose=0)
+            #Best value of the first generation and 5 without improvement.
+            self.assertEqual(len(history['iteration']), 6)
+            self.assertIn('max_fitness', new_optimizer.stop_reason)
+
+    def test_plateau_stopping_async(self):
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(10, (10,), random_init=True),
+            max_iterations=100,
+            fitness_function=ConstantFn(),
+            callbacks=[PlateauStopping(patience=3)])
+
+        history = asyncio.run(new_optimizer.fit_async(verbose=0))
+
+        self.assertEqual(len(history['iteration']), 4)
+
+    def test_plateau_tolerance(self):
+        callback = PlateauStopping(patience=2, tolerance=0.1)
+        new_optimizer = BaseOptimizer(MatrixPopulation(10, (10,)))
+
+        callback.on_run_start(new_optimizer)
+        for iteration, value in enumerate([0.1, 0.3, 0.35, 0.45, 0.5]):
+            callback.on_generation_end(new_optimizer, iteration, {'max_fitness': value})
+            self.assertFalse(new_optimizer._stop_requested)
+        callback.on_generation_end(new_optimizer, 5, {'max_fitness': 0.5})
+        self.assertTrue(new_optimizer._stop_requested)
+
+    def test_diversity_stopping(self):
+        population = MatrixPopulation(20, (50,), random_init=True, gene_vals=[0, 1])
+        new_optimizer = BaseOptimizer(
+            population,
+            max_iterations=100,
+            fitness_function=ConstantFn(),
+            selection_ops='elitism',
+            selected_fraction=0.05,
+            mutation_prob=0.0,
+            crossover_prob=0.0,
+            callbacks=[DiversityStopping(min_diversity=0.01, patience=2)])
+
+        history = new_optimizer.fit(verbose=0)
+
+        #Population of clones of the single selected individual collapses at once.
+        self.assertEqual(len(history['iteration']), 3)
+        self.assertIn('Diversity', new_optimizer.stop_reason)
+        self.assertEqual(population_diversity(new_optimizer.population), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
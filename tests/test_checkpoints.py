@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from pystrand.callbacks import PlateauStopping
+from pystrand.checkpoints import save_checkpoint, load_checkpoint
+from pystrand.fitnessfunctions import OneMaxFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+import pystrand.operators.mutations as mut
+
+
+def make_optimizer(population_type, max_iterations, seed, **kwargs):
+    """Return optimizer with deterministic initial population
+    and random generators seeded by 'seed'.
+    """
+    population = population_type(
+        30, (200,), default_genome=np.zeros(200, dtype=int), gene_vals=[0, 1])
+    optimizer = BaseOptimizer(
+        population,
+        max_iterations=max_iterations,
+        mutation_ops=[mut.PointMutation(0.3), mut.ShiftMutation(0.1)],
+        selection_ops=['elitism', 'tournament'],
+        selected_fraction=0.2,
+        crossover_prob=0.5,
+        **kwargs)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(optimizer._random_generators()))
+    for generator, generator_seed in zip(optimizer._random_generators(), seeds):
+        generator.bit_generator.state = np.random.default_rng(generator_seed).bit_generator.state
+    np.random.seed(seed)
+
+    return optimizer
+
+
+class Test_checkpoint_files(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_save_load(self):
+        genomes = np.arange(20, dtype='uint8').reshape(4, 5)
+        save_checkpoint(
+            self.path, genomes, {'fitness': np.linspace(0, 1, 4)}, {'iteration': 3, 'seed': [1, 2]})
+
+        loaded_genomes, arrays, metadata = load_checkpoint(self.path)
+
+        self.assertIsInstance(loaded_genomes, np.memmap)
+        self.assertTrue(np.array_equal(loaded_genomes, genomes))
+        self.assertTrue(np.array_equal(arrays['fitness'], np.linspace(0, 1, 4)))
+        self.assertEqual(metadata, {'iteration': 3, 'seed': [1, 2]})
+
+        #Copy-on-write mapping doesn't alter the file.
+        loaded_genomes[:] = 0
+        self.assertTrue(np.array_equal(load_checkpoint(self.path)[0], genomes))
+
+    def test_replacement(self):
+        for iteration in range(3):
+            save_checkpoint(
+                self.path, np.full((2, 2), iteration), {}, {'iteration': iteration})
+
+        files = sorted(os.listdir(self.path))
+        self.assertEqual(len(files), 2)
+        self.assertTrue(files[0].startswith('genomes-2-'))
+        self.assertEqual(files[1], 'state.npz')
+        self.assertTrue(np.all(load_checkpoint(self.path, mmap_mode=None)[0] == 2))
+
+    def test_interrupted_save(self):
+        """
+        Save of the same iteration interrupted before replacing the state file
+        leaves the previous checkpoint intact.
+        """
+        save_checkpoint(self.path, np.zeros((2, 2)), {}, {'iteration': 2})
+
+        with mock.patch('os.replace', side_effect=KeyboardInterrupt):
+            self.assertRaises(
+                KeyboardInterrupt,
+                save_checkpoint, self.path, np.ones((2, 2)), {}, {'iteration': 2})
+
+        self.assertTrue(np.all(load_checkpoint(self.path, mmap_mode=None)[0] == 0))
+
+    def test_object_genomes(self):
+        self.assertRaises(
+            ValueError,
+            save_checkpoint, self.path, np.empty((2, 2), dtype=object), {}, {'iteration': 0})
+
+
+class Test_optimizer_resume(unittest.TestCase):
+
+    def make_path(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        return path
+
+    def test_resumed_trajectory(self):
+        """
+        Run resumed from checkpoint follows the same trajectory as uninterrupted run.
+        """
+        for population_type in [BasePopulation, MatrixPopulation, PackedBinaryPopulation]:
+            path = self.make_path()
+
+            uninterrupted = make_optimizer(population_type, 12, 7)
+            expected = uninterrupted.fit(OneMaxFunction(), verbose=0)
+
+            interrupted = make_optimizer(
+                population_type, 5, 7, checkpoint_path=path, checkpoint_interval=5)
+            interrupted.fit(OneMaxFunction(), verbose=0)
+
+            resumed = make_optimizer(population_type, 12, 99)
+            history = resumed.fit(OneMaxFunction(), verbose=0, resume_from=path)
+
+            for key, record in expected.items():
+                self.assertTrue(np.array_equal(history[key], record), msg=key)
+            for array, expected_array in zip(
+                    resumed.population.to_arrays(), uninterrupted.population.to_arrays()):
+                self.assertTrue(np.array_equal(array, expected_array))
+
+    def test_resume_without_history(self):
+        """
+        Run keeping only the last generation resumes from checkpoint with full history.
+        """
+        path = self.make_path()
+        expected = make_optimizer(MatrixPopulation, 8, 3).fit(OneMaxFunction(), verbose=0)
+        make_optimizer(
+            MatrixPopulation, 4, 3, checkpoint_path=path, checkpoint_interval=4
+            ).fit(OneMaxFunction(), verbose=0)
+
+        history = make_optimizer(MatrixPopulation, 8, 5, keep_history=False).fit(
+            OneMaxFunction(), verbose=0, resume_from=path)
+
+        for key, record in expected.items():
+            self.assertTrue(np.array_equal(history[key], record[-1:]), msg=key)
+
+    def test_resumed_callbacks(self):
+        """
+        Resumed run stops at the same generation as uninterrupted one,
+        with stalled generations counted before the checkpoint.
+        """
+        path = self.make_path()
+        uninterrupted = make_optimizer(
+            MatrixPopulation, 40, 7, callbacks=[PlateauStopping(patience=2)])
+        expected = uninterrupted.fit(OneMaxFunction(), verbose=0)
+        make_optimizer(
+            MatrixPopulation, 35, 7, checkpoint_path=path, checkpoint_interval=35,
+            callbacks=[PlateauStopping(patience=2)]).fit(OneMaxFunction(), verbose=0)
+
+        resumed = make_optimizer(
+            MatrixPopulation, 40, 99, callbacks=[PlateauStopping(patience=2)])
+        history = resumed.fit(OneMaxFunction(), verbose=0, resume_from=path)
+
+        self.assertEqual(len(history['iteration']), len(expected['iteration']))
+        self.assertEqual(resumed.stop_reason, uninterrupted.stop_reason)
+
+        self.assertRaises(
+            ValueError,
+            make_optimizer(MatrixPopulation, 40, 7).fit,
+            OneMaxFunction(), verbose=0, resume_from=path)
+
+    def test_resumed_best_individual(self):
+        """
+        Best individual found before the checkpoint is kept by resumed run.
+        """
+        path = self.make_path()
+        interrupted = make_optimizer(
+            MatrixPopulation, 6, 1, checkpoint_path=path, checkpoint_interval=6)
+        interrupted.fit(OneMaxFunction(), verbose=0)
+
+        resumed = make_optimizer(MatrixPopulation, 6, 2)
+        resumed.fit(OneMaxFunction(), verbose=0, resume_from=path)
+        best = resumed.best_individual
+
+        self.assertEqual(best['fitness'], interrupted.best_individual['fitness'])
+        self.assertTrue(np.array_equal(best['genotype'], interrupted.best_individual['genotype']))
+        self.assertEqual(best['genotype'].gene_vals, [0, 1])
+
+    def test_checkpoint_interval(self):
+        path = self.make_path()
+        optimizer = make_optimizer(
+            MatrixPopulation, 7, 0, checkpoint_path=path, checkpoint_interval=3)
+        optimizer.fit(OneMaxFunction(), verbose=0)
+
+        _, arrays, metadata = load_checkpoint(path)
+
+        self.assertEqual(metadata['iteration'], 6)
+        self.assertEqual(arrays['history_iteration'].tolist(), list(range(6)))
+
+    def test_resumed_limits(self):
+        """
+        Evaluations and time used before the checkpoint count towards the limits.
+        """
+        path = self.make_path()
+        make_optimizer(
+            MatrixPopulation, 4, 0, checkpoint_path=path, checkpoint_interval=4
+            ).fit(OneMaxFunction(), verbose=0)
+        genomes, arrays, metadata = load_checkpoint(path, mmap_mode=None)
+        self.assertEqual(metadata['evaluations'], 120)
+        self.assertGreater(metadata['elapsed_time'], 0.0)
+
+        fitness_function = OneMaxFunction()
+        optimizer = make_optimizer(MatrixPopulation, -1, 0, max_evaluations=150)
+        history = optimizer.fit(fitness_function, verbose=0, resume_from=path)
+
+        self.assertEqual(fitness_function.evaluated, 30)
+        self.assertEqual(len(history['iteration']), 5)
+        self.assertIn('Budget', optimizer.stop_reason)
+
+        metadata['elapsed_time'] = 100.0
+        save_checkpoint(path, genomes, arrays, metadata)
+        fitness_function = OneMaxFunction()
+        optimizer = make_optimizer(MatrixPopulation, -1, 0, time_limit=50.0)
+        history = optimizer.fit(fitness_function, verbose=0, resume_from=path)
+
+        self.assertEqual(fitness_function.evaluated, 0)
+        self.assertEqual(len(history['iteration']), 4)
+        self.assertIn('Time limit', optimizer.stop_reason)
+
+    def test_mismatched_checkpoint(self):
+        path = self.make_path()
+        optimizer = make_optimizer(
+            MatrixPopulation, 1, 0, checkpoint_path=path, checkpoint_interval=1)
+        optimizer.fit(OneMaxFunction(), verbose=0)
+
+        for population_type in [BasePopulation, PackedBinaryPopulation]:
+            self.assertRaises(
+                ValueError,
+                make_optimizer(population_type, 2, 0).fit,
+                OneMaxFunction(), verbose=0, resume_from=path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import multiprocessing as mp
+import os
+import signal
+import time
+import unittest
+import numpy as np
+from pystrand.distributed import (
+    DistributedEvaluator, run_worker, _decode_array, _encode_array, _frame, _FrameBuffer,
+    BATCH, HEARTBEAT)
+from pystrand.fitnessfunctions import BaseFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+
+
+class SumFn:
+    """Fitness function without batch evaluation, checking shape of genomes.
+    """
+    def __init__(self, genome_shape, delay=0.0):
+        self.genome_shape = genome_shape
+        self.delay = delay
+
+    def __call__(self, genome):
+        time.sleep(self.delay)
+        if genome.shape != self.genome_shape:
+            raise ValueError("Unexpected genome shape.", genome.shape)
+        return float(np.sum(genome))
+
+
+class BatchSumFn(BaseFunction):
+    """Fitness function with batch evaluation.
+    """
+    def __evaluate_batch__(self, genomes):
+        return genomes.sum(axis=1)
+
+
+class ShapeFn(BaseFunction):
+    """Fitness function without batch evaluation, returning 1 for genomes of shape (3, 4).
+    """
+    def __evaluate__(self, values):
+        return float(values.shape == (3, 4))
+
+
+class Test_framing(unittest.TestCase):
+
+    def test_array_encoding(self):
+        for array in [
+                np.arange(12, dtype='uint8').reshape(3, 4),
+                np.linspace(0, 1, 7),
+                np.zeros((0, 5), dtype='int16')]:
+            decoded = _decode_array(_encode_array(array))
+            self.assertEqual(decoded.dtype, array.dtype)
+            self.assertTrue(np.array_equal(decoded, array))
+
+        self.assertRaises(ValueError, _encode_array, np.empty(3, dtype=object))
+
+    def test_frame_buffer(self):
+        payload = _encode_array(np.arange(10))
+        data = _frame(BATCH, 7, payload) + _frame(HEARTBEAT)
+        buffer = _FrameBuffer()
+
+        buffer.feed(data[:5])
+        self.assertEqual(list(buffer.messages()), [])
+        buffer.feed(data[5:])
+        self.assertEqual(
+            list(buffer.messages()),
+            [(BATCH, 7, payload), (HEARTBEAT, 0, b'')])
+
+
+class Test_distributed_evaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = np.random.default_rng(0).choice([0, 1], (200, 12)).astype('uint8')
+        self.coordinator = DistributedEvaluator(heartbeat_timeout=1.0, batch_size=10)
+        self.workers = []
+
+    def tearDown(self):
+        self.coordinator.close()
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+
+    def start_workers(self, fitness_fn, n_workers):
+        for _ in range(n_workers):
+            worker = mp.Process(
+                target=run_worker,
+                args=(self.coordinator.address, fitness_fn),
+                kwargs={'heartbeat_interval': 0.1},
+                daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def test_evaluation(self):
+        self.start_workers(SumFn((3, 4)), 2)
+        self.start_workers(BatchSumFn(), 1)
+
+        for _ in range(2):
+            fitness = self.coordinator.evaluate(self.genomes, genome_shape=(3, 4), timeout=10)
+            self.assertTrue(np.array_equal(fitness, self.genomes.sum(axis=1)))
+
+        self.assertEqual(self.coordinator.n_workers, 3)
+
+    def test_genome_shape(self):
+        self.start_workers(ShapeFn(), 1)
+
+        fitness = self.coordinator.evaluate(self.genomes, genome_shape=(3, 4), timeout=10)
+
+        self.assertTrue(np.all(fitness == 1.0))
+
+    def test_lost_worker(self):
+        """
+        Batches of killed workers, and of workers not sending heartbeats, are reassigned.
+        """
+        self.start_workers(SumFn((12,), delay=0.005), 3)
+        while self.coordinator.n_workers < 3:
+            time.sleep(0.01)
+
+        os.kill(self.workers[0].pid, signal.SIGSTOP)
+        self.workers[1].kill()
+        try:
+            fitness = self.coordinator.evaluate(self.genomes, timeout=20)
+        finally:
+            os.kill(self.workers[0].pid, signal.SIGKILL)
+
+        self.assertTrue(np.array_equal(fitness, self.genomes.sum(axis=1)))
+        self.assertEqual(self.coordinator.n_workers, 1)
+
+    def test_worker_error(self):
+        self.start_workers(SumFn((5,)), 1)
+
+        with self.assertRaises(RuntimeError):
+            self.coordinator.evaluate(self.genomes, timeout=10)
+
+    def test_timeout(self):
+        with self.assertRaises(mp.TimeoutError):
+            self.coordinator.evaluate(self.genomes, timeout=0.2)
+
+    def test_optimizer_run(self):
+        self.start_workers(BatchSumFn(), 2)
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(100, (12,), random_init=True),
+            max_iterations=5,
+            parallelize=self.coordinator,
+            evaluation_timeout=10)
+
+        history = new_optimizer.fit(verbose=0)
+
+        self.assertEqual(len(history['iteration']), 5)
+        new_optimizer.evaluate_population()
+        self.assertTrue(np.array_equal(
+            new_optimizer.population.fitness,
+            new_optimizer.population.genomes.sum(axis=1)))
+
+        self.assertRaises(
+            TypeError,
+            BaseOptimizer, BasePopulation(10, (10,)), parallelize=self.coordinator)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import asyncio
+import unittest
+from unittest import mock
+import numpy as np
+import pystrand.fitnessfunctions as fn
+from pystrand.optimizers import BaseOptimizer
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+
+
+class SumFn(fn.BaseFunction):
+    """Fitness function with only per-individual evaluation.
+    """
+    def __evaluate__(self, values):
+        return float(np.sum(values))
+
+
+class ShapeFn(fn.BaseFunction):
+    """Fitness function checking shape of evaluated genomes.
+    """
+    def __evaluate__(self, values):
+        return float(values.shape == (2, 3))
+
+
+class CalledFn(fn.BaseFunction):
+    """Fitness function overriding __call__.
+    """
+    def __call__(self, values):
+        return 0.5
+
+
+class AsyncSumFn(fn.AsyncBaseFunction):
+    """Fitness function evaluated by a coroutine.
+    """
+    async def __evaluate_async__(self, values):
+        await asyncio.sleep(0)
+        return float(np.sum(values))
+
+
+class Test_batch_evaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = np.random.default_rng(0).choice(
+            np.arange(-1, 1, 0.1), (50, 5))
+
+    def test_batch_fallback(self):
+        for inverted in [False, True]:
+            fitness_fn = SumFn(inverted=inverted)
+
+            evaluation = fitness_fn.evaluate_batch(np.abs(self.genomes))
+            expected = [fitness_fn(genome) for genome in np.abs(self.genomes)]
+
+            self.assertTrue(np.allclose(evaluation, expected))
+            self.assertEqual(fitness_fn.evaluated, 100)
+
+    def test_power_poly_batch(self):
+        for metric in fn.METRICS:
+            fitness_fn = fn.PowerPolyFitnessFn(inverted=True, metric=metric)
+            fitness_fn.data = np.arange(-5, 5, 0.5)
+            fitness_fn.labels = 5 + 5*fitness_fn.data + 2*fitness_fn.data**2
+
+            evaluation = fitness_fn.evaluate_batch(self.genomes)
+            expected = [fitness_fn(genome) for genome in self.genomes]
+
+            self.assertEqual(evaluation.shape, (50,))
+            self.assertTrue(np.allclose(evaluation, expected))
+
+    def test_squashed_dims_batch(self):
+        fitness_fn = fn.SquashedDimsFunction(False, 5)
+        fitness_fn.__evaluate__ = lambda values: float(values.max())
+        genomes = np.repeat(self.genomes, 4, axis=1)
+
+        evaluation = fitness_fn.evaluate_batch(genomes)
+        expected = [fitness_fn(genome) for genome in genomes]
+
+        self.assertTrue(np.allclose(evaluation, expected))
+
+    def test_optimizer_batch_evaluation(self):
+        population = MatrixPopulation(50, (5,), random_init=True)
+        fitness_fn = SumFn()
+        optimizer = BaseOptimizer(population, fitness_function=fitness_fn)
+
+        optimizer.evaluate_population()
+
+        self.assertEqual(fitness_fn.evaluated, 50)
+        self.assertTrue(np.array_equal(
+            population.fitness,
+            population.genomes.sum(axis=1)))
+
+    def test_base_population_batch_evaluation(self):
+        """
+        Genomes of BasePopulation sharing one shape are evaluated at once,
+        genomes of different shapes one by one.
+        """
+        fitness_fn = fn.OneMaxFunction()
+        population = BasePopulation(20, (2, 5), random_init=True, gene_vals=[0, 1])
+        optimizer = BaseOptimizer(population, fitness_function=fitness_fn)
+
+        with mock.patch.object(
+                fitness_fn, 'evaluate_batch', wraps=fitness_fn.evaluate_batch) as evaluate_batch:
+            optimizer.evaluate_population()
+
+        evaluate_batch.assert_called_once()
+        self.assertEqual(evaluate_batch.call_args[0][0].shape, (20, 10))
+        self.assertTrue(np.array_equal(population.fitness, population.genomes.mean(axis=1)))
+
+        population = BasePopulation(4, [(3,), (3,), (4,), (4,)], random_init=True)
+        optimizer = BaseOptimizer(population, fitness_function=fitness_fn)
+        optimizer.evaluate_population()
+
+        self.assertEqual(
+            population.fitness.tolist(),
+            [float(np.mean(genotype)) for genotype in population.genotypes])
+
+
+    def test_supports_batch(self):
+        self.assertTrue(fn.supports_batch(fn.OneMaxFunction()))
+        self.assertTrue(fn.supports_batch(fn.PowerPolyFitnessFn()))
+        self.assertTrue(fn.supports_batch(fn.SquashedDimsFunction(False, 5)))
+        self.assertFalse(fn.supports_batch(SumFn()))
+        self.assertFalse(fn.supports_batch(fn.AsyncBaseFunction()))
+        self.assertFalse(fn.supports_batch(lambda genome: 0.0))
+
+        self.assertTrue(fn.supports_packed(fn.OneMaxFunction()))
+        self.assertTrue(fn.supports_packed(fn.PowerPolyFitnessFn()))
+        self.assertFalse(fn.supports_packed(SumFn()))
+
+    def test_genome_shape(self):
+        """
+        Functions without batch evaluation get genomes of their shape,
+        through __call__, regardless of population type and evaluation mode.
+        """
+        for parallelize in [False, 'threads', 'shared_memory', True]:
+            for population_type in [MatrixPopulation, PackedBinaryPopulation]:
+                for fitness_fn, expected in [(ShapeFn(), 1.0), (CalledFn(), 0.5)]:
+                    population = population_type(10, (2, 3), random_init=True)
+                    with BaseOptimizer(
+                            population,
+                            fitness_function=fitness_fn,
+                            parallelize=parallelize,
+                            n_workers=2) as optimizer:
+                        optimizer.evaluate_population()
+
+                    self.assertTrue(
+                        np.all(population.fitness == expected),
+                        msg=(parallelize, population_type, fitness_fn))
+
+
+class Test_packed_evaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = np.random.default_rng(0).integers(0, 2, (50, 21), dtype=np.uint8)
+        self.packed_genomes = np.packbits(self.genomes, axis=1)
+
+    def test_popcount(self):
+        self.assertTrue(np.array_equal(
+            fn.popcount(self.packed_genomes, axis=1),
+            self.genomes.sum(axis=1)))
+        self.assertTrue(np.array_equal(
+            fn.hamming_distance(self.packed_genomes, self.packed_genomes[0], axis=1),
+            (self.genomes != self.genomes[0]).sum(axis=1)))
+
+    def test_packed_fallback(self):
+        fitness_fn = SumFn()
+
+        evaluation = fitness_fn.evaluate_packed(self.packed_genomes, 21)
+
+        self.assertTrue(np.array_equal(evaluation, self.genomes.sum(axis=1)))
+        self.assertEqual(fitness_fn.evaluated, 50)
+
+    def test_one_max(self):
+        for target in [None, self.genomes[0]]:
+            fitness_fn = fn.OneMaxFunction(target=target)
+
+            evaluation = fitness_fn.evaluate_packed(self.packed_genomes, 21)
+            expected = [fitness_fn(genome) for genome in self.genomes]
+
+            self.assertTrue(np.allclose(evaluation, expected))
+            self.assertTrue(np.allclose(fitness_fn.evaluate_batch(self.genomes), expected))
+
+        self.assertEqual(evaluation[0], 1.0)
+        self.assertTrue(fitness_fn.optimum_reached(self.genomes[0]))
+
+    def test_knapsack(self):
+        values = np.arange(1, 22)
+        for weights, capacity in [(None, None), (np.arange(21) % 4, 15)]:
+            fitness_fn = fn.KnapsackFunction(values, weights, capacity)
+
+            evaluation = fitness_fn.evaluate_packed(self.packed_genomes, 21)
+            expected = [fitness_fn(genome) for genome in self.genomes]
+
+            self.assertTrue(np.allclose(evaluation, expected))
+            self.assertTrue(np.allclose(fitness_fn.evaluate_batch(self.genomes), expected))
+
+        overweight = (self.genomes @ weights) > capacity
+        self.assertTrue(overweight.any())
+        self.assertTrue(np.all(evaluation[overweight] == 0.0))
+
+    def test_optimizer_packed_evaluation(self):
+        population = PackedBinaryPopulation(50, (3, 7), random_init=True)
+        fitness_fn = fn.OneMaxFunction()
+        optimizer = BaseOptimizer(population, fitness_function=fitness_fn)
+
+        optimizer.evaluate_population()
+
+        self.assertEqual(fitness_fn.evaluated, 50)
+        self.assertTrue(np.allclose(
+            population.fitness,
+            population.genomes.mean(axis=1)))
+
+
+class Test_async_evaluation(unittest.TestCase):
+
+    def test_synchronous_call(self):
+        fitness_fn = AsyncSumFn(inverted=True)
+
+        self.assertEqual(fitness_fn(np.ones(3)), 0.25)
+        self.assertEqual(fitness_fn.evaluated, 1)
+
+    def test_call_in_running_loop(self):
+        """
+        Synchronous evaluation inside a running event loop is rejected,
+        evaluate_async is awaited instead.
+        """
+        fitness_fn = AsyncSumFn()
+
+        async def evaluate():
+            with self.assertRaises(RuntimeError):
+                fitness_fn(np.ones(3))
+            return await fitness_fn.evaluate_async(np.ones(3))
+
+        self.assertEqual(asyncio.run(evaluate()), 3.0)
+        self.assertEqual(fitness_fn.evaluated, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from pystrand.genotypes import Genotype
+from pystrand.genotypes import Genotype, gene_dtype
 
 
 class Test_genotype_manipulation(unittest.TestCase):
@@ -44,6 +44,37 @@ class Test_genotype_manipulation(unittest.TestCase):
 
                 self.assertTrue(genome.min() >= gene_vals.min())
 
+    def test_gene_dtype(self):
+        """
+        Checks selection of compact gene data types.
+        """
+        expected_dtypes = [
+            ([0, 1], np.uint8),
+            ([-1, 0, 1], np.int8),
+            ([0, 255], np.uint8),
+            ([-129, 0], np.int16),
+            ([0.0, 2.0, 70000.0], np.int32),
+            ([0.5, -0.25], np.float32),
+            ([0.1, 0.2], np.float64),
+            ([np.nan, 1.0], np.float64)]
+
+        for gene_vals, dtype in expected_dtypes:
+            self.assertEqual(gene_dtype(gene_vals), dtype)
+
+    def test_genotype_initiation_dtype(self):
+        """
+        Checks data type of genomes and preservation of gene values.
+        """
+        for gene_vals in self.test_gene_vals[:10]:
+            genome = Genotype((10, 10), random_init=True, gene_vals=gene_vals, dtype='auto')
+
+            self.assertEqual(genome.dtype, gene_dtype(gene_vals))
+            self.assertTrue(np.isin(genome, gene_vals).all())
+
+        self.assertEqual(Genotype((10,), dtype='auto').dtype, np.uint8)
+        self.assertEqual(Genotype((10,), dtype='float32').dtype, np.float32)
+        self.assertEqual(Genotype((10,)).dtype, np.float64)
+
     def test_genotype_crossover_binary(self):
 
         for shape in self.test_shapes:
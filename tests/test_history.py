@@ -0,0 +1,53 @@
+from pystrand.history import (
+    PhaseTimer, TIMING_KEYS, allocate_history, grow_history, restore_history)
+import time
+import unittest
+import numpy as np
+
+
+class History_test(unittest.TestCase):
+
+    def test_allocation(self):
+        history = allocate_history(5)
+
+        self.assertEqual(
+            list(history),
+            ['iteration', 'max_fitness', 'min_fitness', 'fitness_avg', 'fitness_std'])
+        self.assertTrue(set(TIMING_KEYS).isdisjoint(history))
+        self.assertTrue(set(TIMING_KEYS).issubset(allocate_history(5, timed=True)))
+
+        history["iteration"][:] = np.arange(5)
+        history = grow_history(history)
+
+        self.assertEqual(history["iteration"].tolist(), [0, 1, 2, 3, 4] + [0]*5)
+
+    def test_restoration(self):
+        saved_history = {'iteration': np.arange(6), 'max_fitness': np.linspace(0, 1, 6)}
+
+        history = restore_history(saved_history, 8, timed=True)
+
+        self.assertEqual(history['iteration'].tolist(), [0, 1, 2, 3, 4, 5, 0, 0])
+        self.assertEqual(history['max_fitness'][5], 1.0)
+        self.assertEqual(history['evaluation_time'].tolist(), [0.0] * 8)
+
+        history = restore_history(saved_history, 1)
+
+        self.assertEqual(history['iteration'].tolist(), [5])
+
+    def test_phase_timer(self):
+        timer = PhaseTimer()
+        with timer.phase('evaluation'):
+            time.sleep(0.01)
+        timer.count_evaluations(10)
+
+        timings = timer.timings()
+
+        self.assertEqual(set(timings), set(TIMING_KEYS))
+        self.assertGreater(timings['evaluation_time'], 0.0)
+        self.assertAlmostEqual(
+            timings['evaluations_per_second'], 10 / timings['evaluation_time'])
+        self.assertEqual(timings['selection_time'], 0.0)
+
+        timer.reset()
+
+        self.assertEqual(set(timer.timings().values()), {0.0})
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(statement):
+    """Return names of modules imported by executing 'statement' in a new interpreter.
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', statement + '\nimport sys\nprint(" ".join(sys.modules))'],
+        check=True, capture_output=True, text=True).stdout
+
+    return set(output.split())
+
+
+class Test_lazy_imports(unittest.TestCase):
+
+    def test_import_pystrand(self):
+        """
+        Importing the package doesn't import its submodules or dependencies.
+        """
+        modules = imported_modules('import pystrand')
+
+        self.assertIn('pystrand', modules)
+        for module in [
+                'numpy', 'pandas', 'pystrand.optimizers',
+                'pystrand.loggers', 'pystrand.models', 'pystrand.operators']:
+            self.assertNotIn(module, modules)
+
+    def test_optimizer_without_pandas(self):
+        """
+        Optimizer and loggers are usable without importing pandas,
+        until history is saved by CsvLogger.
+        """
+        modules = imported_modules(
+            'import pystrand\n'
+            'pystrand.optimizers.BaseOptimizer\n'
+            'pystrand.loggers.CsvLogger')
+
+        self.assertIn('pystrand.optimizers', modules)
+        self.assertIn('pystrand.loggers.csv_logger', modules)
+        self.assertNotIn('pandas', modules)
+
+    def test_public_api(self):
+        import pystrand
+
+        self.assertIs(pystrand.loggers.CsvLogger, pystrand.loggers.csv_logger.CsvLogger)
+        self.assertIs(
+            pystrand.models.polymodels, sys.modules['pystrand.models.polymodels'])
+        self.assertTrue(hasattr(pystrand.operators, 'PointMutation'))
+        self.assertTrue(set(pystrand.__all__) <= set(dir(pystrand)))
+        self.assertRaises(AttributeError, getattr, pystrand, 'foo')
+        self.assertRaises(AttributeError, getattr, pystrand.loggers, 'foo')
+
+
+if __name__ == '__main__':
+    unittest.main()
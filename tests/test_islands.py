@@ -0,0 +1,96 @@
+from pystrand.islands import IslandOptimizer
+from pystrand.fitnessfunctions import OneMaxFunction
+from pystrand.populations import BasePopulation, MatrixPopulation
+import unittest
+import numpy as np
+
+
+def half_ones_fn(genotype):
+    """Fitness function never reaching the optimum.
+    """
+    return 0.5*np.mean(genotype)
+
+
+def failing_fn(genotype):
+    raise ValueError("Evaluation failed.")
+
+
+class Island_optimizer_test(unittest.TestCase):
+
+    def test_migration(self):
+        """
+        Without variation operators, only migrants can bring ones to islands of zeros.
+        """
+        populations = [MatrixPopulation(20, (10,), default_genome=np.zeros(10)) for _ in range(3)]
+        populations[0] = MatrixPopulation(20, (10,), default_genome=np.ones(10))
+
+        new_optimizer = IslandOptimizer(
+            populations,
+            max_iterations=4,
+            fitness_function=half_ones_fn,
+            migration_interval=1,
+            migration_size=2,
+            mutation_prob=0.0,
+            crossover_prob=0.0,
+            selection_ops='elitism',
+            selected_fraction=0.5)
+        history = new_optimizer.fit(verbose=0)
+
+        self.assertEqual(history['iteration'].tolist(), [0, 1, 2, 3])
+        for island in new_optimizer.island_histories:
+            self.assertEqual(island['iteration'].size, 4)
+        for population in new_optimizer.populations:
+            self.assertEqual(population.population_size, 20)
+            self.assertTrue(np.any(population.genomes.sum(axis=1) == 10))
+
+    def test_reproducibility(self):
+        histories = []
+        for _ in range(2):
+            new_optimizer = IslandOptimizer(
+                [MatrixPopulation(30, (50,), random_init=True, seed=i) for i in range(3)],
+                max_iterations=10,
+                fitness_function=OneMaxFunction(),
+                migration_interval=3,
+                topology='random',
+                seed=42)
+            histories.append(new_optimizer.fit(verbose=0))
+
+        for key in histories[0]:
+            self.assertTrue(np.array_equal(histories[0][key], histories[1][key]))
+
+    def test_random_destinations(self):
+        """
+        Every island receives migrants of exactly one other island.
+        """
+        new_optimizer = IslandOptimizer(
+            [BasePopulation(10, (10,)) for _ in range(5)], topology='random', seed=0)
+
+        for _ in range(50):
+            destinations = new_optimizer._destinations()
+            self.assertEqual(sorted(destinations), list(range(5)))
+            self.assertFalse(np.any(destinations == np.arange(5)))
+
+    def test_combined_statistics(self):
+        new_optimizer = IslandOptimizer(
+            [BasePopulation(10, (20,), random_init=True, gene_vals=[0, 1]) for _ in range(2)],
+            max_iterations=1,
+            fitness_function=OneMaxFunction())
+        history = new_optimizer.fit(verbose=0)
+
+        fitness = np.concatenate([
+            population.fitness for population in new_optimizer.populations])
+        self.assertAlmostEqual(history['max_fitness'][0], fitness.max())
+        self.assertAlmostEqual(history['fitness_avg'][0], fitness.mean())
+        self.assertAlmostEqual(history['fitness_std'][0], fitness.std())
+        self.assertEqual(new_optimizer.retrieve_best(3)['fitness'].tolist(), sorted(fitness)[-3:])
+
+    def test_validation(self):
+        populations = [BasePopulation(10, (10,))]
+        self.assertRaises(ValueError, IslandOptimizer, [])
+        self.assertRaises(ValueError, IslandOptimizer, populations, topology='star')
+        self.assertRaises(ValueError, IslandOptimizer, populations, migration_interval=0)
+        self.assertRaises(RuntimeError, IslandOptimizer(populations, max_iterations=1).fit)
+        self.assertRaises(
+            RuntimeError,
+            IslandOptimizer(populations, max_iterations=1, fitness_function=failing_fn).fit,
+            verbose=0)
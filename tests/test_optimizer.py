@@ -1,6 +1,15 @@
 from pystrand.optimizers import BaseOptimizer
+from pystrand.history import TIMING_KEYS
+from pystrand.fitnessfunctions import AsyncBaseFunction, OneMaxFunction
 from pystrand.genotypes import Genotype
-from pystrand.populations import BasePopulation
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.operators.crossovers import BaseCrossover, TwoPointCrossover
+import asyncio
+import csv
+import os
+import shutil
+import tempfile
+import time
 import unittest
 import numpy as np
 
@@ -98,6 +107,236 @@ class Optimizer_init_test(unittest.TestCase):
 
             self.assertEqual(new_optimizer._fitness_function, fitness_fn)
 
+    def test_optimizer_init_crossover(self):
+        """
+        Optimizer init test. Checks crossover operator validation.
+        """
+        population = BasePopulation(10, (10,))
+
+        for crossover_op in ['uniform', 'one_point', 'two_point', TwoPointCrossover()]:
+            new_optimizer = BaseOptimizer(population, crossover_op=crossover_op)
+            self.assertIsInstance(new_optimizer._crossover_op, BaseCrossover)
+
+        self.assertRaises(ValueError, BaseOptimizer, population, crossover_op='foo')
+        self.assertRaises(TypeError, BaseOptimizer, population, crossover_op=1)
+
+
+class CountdownFn:
+    """Fitness function reaching optimum after given number of calls.
+    """
+    def __init__(self, n_calls):
+        self.n_calls = n_calls
+
+    def __call__(self, individual):
+        self.n_calls -= 1
+        return 1.0 if self.n_calls < 0 else 0.0
+
+
+class Optimizer_history_test(unittest.TestCase):
+
+    def test_history_growth(self):
+        """
+        History of unlimited run grows past the preallocated capacity.
+        """
+        population = BasePopulation(10, (10,), random_init=True)
+        new_optimizer = BaseOptimizer(population, max_iterations=-1)
+
+        history = new_optimizer.fit(CountdownFn(1000), verbose=0)
+
+        self.assertEqual(len(history['iteration']), 101)
+        self.assertTrue(np.array_equal(history['iteration'], np.arange(101)))
+        self.assertEqual(history['max_fitness'][-1], 1.0)
+        self.assertEqual(history['max_fitness'][:-1].max(), 0.0)
+
+    def test_history_preallocation(self):
+        """
+        History of limited run is trimmed to the number of generations.
+        """
+        population = BasePopulation(10, (10,), random_init=True)
+        new_optimizer = BaseOptimizer(population, max_iterations=50)
+
+        history = new_optimizer.fit(CountdownFn(100), verbose=0)
+
+        for record in history.values():
+            self.assertEqual(len(record), 11)
+
+    def test_phase_timing(self):
+        """
+        Durations of generation phases are recorded and passed to the hook.
+        """
+        population = MatrixPopulation(100, (1000,), random_init=True)
+        timings = []
+        new_optimizer = BaseOptimizer(
+            population,
+            max_iterations=5,
+            fitness_function=OneMaxFunction(),
+            crossover_prob=0.5,
+            phase_timing=True,
+            timing_hook=lambda iteration, timing: timings.append((iteration, timing)))
+
+        history = new_optimizer.fit(verbose=0)
+
+        self.assertEqual(len(history['iteration']), 5)
+        self.assertEqual([iteration for iteration, _ in timings], list(range(5)))
+        for key in TIMING_KEYS:
+            self.assertTrue(np.all(history[key] >= 0.0), msg=key)
+            self.assertTrue(np.array_equal(
+                history[key], [timing[key] for _, timing in timings]), msg=key)
+
+        self.assertTrue(np.all(history['evaluation_time'] > 0.0))
+        self.assertTrue(np.allclose(
+            history['evaluations_per_second'], 100 / history['evaluation_time']))
+        #First generation isn't bred, and no generation was logged before it.
+        for key in ['selection_time', 'mutation_time', 'crossover_time', 'logging_time']:
+            self.assertEqual(history[key][0], 0.0, msg=key)
+            self.assertTrue(np.all(history[key][1:] > 0.0), msg=key)
+
+    def test_phase_timing_disabled(self):
+        population = MatrixPopulation(10, (10,), random_init=True)
+        new_optimizer = BaseOptimizer(
+            population, max_iterations=2, fitness_function=OneMaxFunction())
+
+        history = new_optimizer.fit(verbose=0)
+
+        self.assertTrue(set(TIMING_KEYS).isdisjoint(history))
+
+    def test_step(self):
+        """
+        Stepping through generations records the same history as `fit`.
+        """
+        histories = []
+        for stepped in (False, True):
+            population = MatrixPopulation(20, (50,), random_init=True, seed=0)
+            new_optimizer = BaseOptimizer(
+                population, max_iterations=5, fitness_function=OneMaxFunction())
+            new_optimizer.seed_generators(np.random.SeedSequence(1))
+            if stepped:
+                records = [new_optimizer.step(i, breed=i > 0) for i in range(5)]
+                histories.append({key: [record[key] for record in records] for key in records[0]})
+            else:
+                history = new_optimizer.fit(verbose=0)
+                histories.append({key: record.tolist() for key, record in history.items()})
+
+        self.assertEqual(histories[0]['iteration'], list(range(5)))
+        self.assertEqual(histories[0], histories[1])
+
+    def test_streamed_history(self):
+        """
+        Streamed log holds every generation, even if only the last one is kept in memory.
+        """
+        log_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_path)
+        population = BasePopulation(10, (10,), random_init=True)
+        new_optimizer = BaseOptimizer(
+            population,
+            max_iterations=-1,
+            log_path=log_path,
+            stream_history=True,
+            keep_history=False)
+
+        history = new_optimizer.fit(CountdownFn(1000), verbose=0)
+
+        self.assertEqual(history['iteration'].tolist(), [100])
+        self.assertEqual(history['max_fitness'].tolist(), [1.0])
+        self.assertFalse(new_optimizer.stream_logger.is_open)
+
+        log_files = os.listdir(log_path)
+        self.assertEqual(len(log_files), 1)
+        with open(os.path.join(log_path, log_files[0])) as file:
+            rows = list(csv.reader(file))
+
+        self.assertEqual(rows[0], [''] + list(history.keys()))
+        self.assertEqual([int(row[1]) for row in rows[1:]], list(range(101)))
+        self.assertEqual(float(rows[-1][2]), 1.0)
+
+
+class SlowOneMaxFn(OneMaxFunction):
+    """OneMax function sleeping before every evaluation,
+    including each genome of evaluated batch.
+    """
+    def __init__(self, delay):
+        self.delay = delay
+        super().__init__()
+
+    def __evaluate__(self, values):
+        time.sleep(self.delay)
+        return super().__evaluate__(values)
+
+    def __evaluate_batch__(self, genomes):
+        time.sleep(self.delay * len(genomes))
+        return super().__evaluate_batch__(genomes)
+
+
+class Optimizer_limits_test(unittest.TestCase):
+
+    def test_time_limit(self):
+        """
+        Slow generation is cut short, best evaluated individual is kept.
+        """
+        for limit_check_size in [None, 5]:
+            new_optimizer = BaseOptimizer(
+                BasePopulation(100, (100,), random_init=True),
+                max_iterations=-1,
+                fitness_function=SlowOneMaxFn(0.01),
+                time_limit=0.25,
+                limit_check_size=limit_check_size)
+
+            start = time.monotonic()
+            history = new_optimizer.fit(verbose=0)
+            elapsed = time.monotonic() - start
+
+            self.assertIn('Time limit', new_optimizer.stop_reason)
+            best = new_optimizer.best_individual
+            self.assertEqual(best['fitness'], OneMaxFunction()(best['genotype']))
+            if limit_check_size is None:
+                #Limit is checked only once the first generation is evaluated.
+                self.assertEqual(len(history['iteration']), 1)
+                self.assertEqual(best['fitness'], history['max_fitness'][0])
+            else:
+                self.assertEqual(len(history['iteration']), 0)
+                #Whole generation would take at least a second.
+                self.assertLess(elapsed, 0.75)
+                fitness = new_optimizer.population.fitness
+                self.assertTrue(np.any(fitness == -np.inf))
+                self.assertEqual(best['fitness'], fitness.max())
+
+    def test_evaluation_budget(self):
+        for limit_check_size, n_evaluations, n_records in [(None, 60, 3), (10, 55, 2)]:
+            fitness_function = OneMaxFunction()
+            new_optimizer = BaseOptimizer(
+                MatrixPopulation(20, (100,), random_init=True),
+                max_iterations=-1,
+                fitness_function=fitness_function,
+                max_evaluations=55,
+                limit_check_size=limit_check_size)
+
+            history = new_optimizer.fit(verbose=0)
+
+            self.assertEqual(fitness_function.evaluated, n_evaluations)
+            self.assertEqual(len(history['iteration']), n_records)
+            self.assertIn('Budget', new_optimizer.stop_reason)
+            self.assertGreaterEqual(
+                new_optimizer.best_individual['fitness'], history['max_fitness'].max())
+
+            #Limits don't apply outside of the run.
+            new_optimizer.evaluate_population()
+            self.assertTrue(np.all(new_optimizer.population.fitness >= 0.0))
+
+    def test_budget_with_cache(self):
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(20, (100,), random_init=True),
+            max_iterations=-1,
+            fitness_function=OneMaxFunction(),
+            cache_size=1000,
+            max_evaluations=25,
+            limit_check_size=10)
+
+        new_optimizer.fit(verbose=0)
+
+        self.assertEqual(new_optimizer._run_evaluations, 25)
+        self.assertLessEqual(len(new_optimizer.fitness_cache), 25)
+        self.assertTrue(np.isfinite(new_optimizer.best_individual['fitness']))
+
 
 class Optimizer_Run_test_sequential(unittest.TestCase):
 
@@ -547,3 +786,143 @@ class Optimizer_Run_test_parallel(unittest.TestCase):
                     np.diff(history['max_fitness']).min(),
                     msg="\nTarget genotype: %s \nMax_fitness: %s" %(target_genotype, history['max_fitness'])
                     )
+
+
+class Optimizer_worker_pool_test(unittest.TestCase):
+
+    def setUp(self):
+        target_genotype = target_genotypes_small[1]
+        self.fitness_fn = FitnessFn(target_genotype)
+        self.population = BasePopulation(
+            pop_size = target_genotype.size*10,
+            genome_shapes = target_genotype.shape,
+            gene_vals = np.unique(target_genotype),
+            random_init = True)
+
+    def test_worker_pool_persistence(self):
+        """
+        Worker pool is created once and reused between generations.
+        """
+        new_optimizer = BaseOptimizer(
+            self.population,
+            fitness_function=self.fitness_fn,
+            parallelize=True,
+            n_workers=2,
+            chunk_size=10)
+
+        new_optimizer.evaluate_population()
+        worker_pool = new_optimizer._worker_pool
+        new_optimizer.evaluate_population()
+
+        self.assertIsNotNone(worker_pool)
+        self.assertIs(worker_pool, new_optimizer._worker_pool)
+
+        new_optimizer.close()
+        self.assertIsNone(new_optimizer._worker_pool)
+
+    def test_worker_pool_shutdown(self):
+        """
+        Worker pool is shut down at the end of the run,
+        unless the optimizer is used as a context manager.
+        """
+        new_optimizer = BaseOptimizer(
+            self.population,
+            max_iterations=3,
+            parallelize=True,
+            n_workers=2)
+
+        new_optimizer.fit(self.fitness_fn, verbose=0)
+        self.assertIsNone(new_optimizer._worker_pool)
+
+        with new_optimizer as optimizer:
+            optimizer.fit(self.fitness_fn, verbose=0)
+            worker_pool = optimizer._worker_pool
+            optimizer.fit(self.fitness_fn, verbose=0)
+            self.assertIs(worker_pool, optimizer._worker_pool)
+
+        self.assertIsNone(new_optimizer._worker_pool)
+
+
+class ServiceFn(AsyncBaseFunction):
+    """Fitness function waiting on a local stand-in of simulator service.
+    Service replies with the fraction of ones in the genome.
+    """
+    def __init__(self, port):
+        self.port = port
+        super().__init__()
+
+    async def __evaluate_async__(self, values):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(np.asarray(values, dtype=np.uint8).tobytes() + b'\n')
+        await writer.drain()
+        reply = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+
+        return float(reply)
+
+
+class Optimizer_async_test(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handle(reader, writer):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            genome = np.frombuffer((await reader.readline())[:-1], dtype=np.uint8)
+            await asyncio.sleep(0.01)
+            writer.write(str(genome.mean()).encode() + b'\n')
+            await writer.drain()
+            writer.close()
+            self.in_flight -= 1
+
+        self.server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        self.fitness_fn = ServiceFn(self.server.sockets[0].getsockname()[1])
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_concurrent_evaluation(self):
+        population = BasePopulation(50, (10,), random_init=True, gene_vals=[0, 1])
+        new_optimizer = BaseOptimizer(
+            population,
+            fitness_function=self.fitness_fn,
+            max_concurrency=20)
+
+        await new_optimizer.evaluate_population_async()
+
+        self.assertEqual(self.fitness_fn.evaluated, 50)
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLessEqual(self.max_in_flight, 20)
+        for individual in population.individuals:
+            self.assertEqual(individual['fitness'], individual['genotype'].mean())
+
+    async def test_fit_async(self):
+        population = BasePopulation(20, (10,), random_init=True, gene_vals=[0, 1])
+        new_optimizer = BaseOptimizer(
+            population,
+            max_iterations=5,
+            selection_ops='elitism',
+            cache_size=100)
+
+        history = await new_optimizer.fit_async(self.fitness_fn, verbose=0)
+
+        self.assertEqual(set(history.keys()), {
+            'iteration', 'max_fitness', 'min_fitness', 'fitness_avg', 'fitness_std'})
+        self.assertGreater(history['iteration'].size, 0)
+        self.assertGreaterEqual(np.diff(history['max_fitness']).min(initial=0), 0)
+
+    async def test_fit_async_timeout(self):
+        population = BasePopulation(20, (10,), random_init=True, gene_vals=[0, 1])
+        new_optimizer = BaseOptimizer(
+            population,
+            max_iterations=5,
+            max_concurrency=1,
+            evaluation_timeout=0.05)
+
+        history = await new_optimizer.fit_async(self.fitness_fn, verbose=0)
+
+        self.assertEqual(history['iteration'].size, 0)
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from pystrand.populations import MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+import pystrand.operators.mutations as mut
+
+
+class Test_packed_population(unittest.TestCase):
+
+    def test_individual_generation(self):
+        for shape in [(8,), (3, 7), (1,)]:
+            population = PackedBinaryPopulation(50, shape, random_init=True, seed=0)
+            genome_size = int(np.prod(shape))
+
+            self.assertEqual(population.packed_genomes.shape, (50, (genome_size + 7) // 8))
+            self.assertEqual(population.genomes.shape, (50, genome_size))
+            self.assertTrue(np.array_equal(
+                np.packbits(population.genomes, axis=1),
+                population.packed_genomes))
+
+            for genotype in population.genotypes:
+                self.assertEqual(genotype.shape, shape)
+
+    def test_default_genome(self):
+        population = PackedBinaryPopulation(10, (3, 7), default_genome=np.ones((3, 7)))
+
+        self.assertTrue(np.all(population.genomes == 1))
+        self.assertTrue(np.all(population.packed_genomes[:, -1] == 0b11111000))
+
+    def test_gene_values(self):
+        with self.assertRaises(ValueError):
+            PackedBinaryPopulation(10, (10,), gene_vals=[0, 1, 2])
+
+    def test_seed_individuals(self):
+        seed = MatrixPopulation(20, (3, 7), random_init=True)
+        population = PackedBinaryPopulation(
+            0, (3, 7), seed_individuals=seed.individuals)
+        population.append_individuals(seed.retrieve_best(5))
+
+        self.assertEqual(population.population_size, 25)
+        self.assertTrue(np.array_equal(population.genomes[:20], seed.genomes))
+
+    def test_genetic_operators(self):
+        population = PackedBinaryPopulation(100, (3, 7), random_init=True)
+        population.replace_generation([(population.best_indices(10), True)])
+        original = population.genomes
+
+        population.mutate_genotypes([mut.PointMutation(1.0), mut.ShiftMutation(1.0, 3)])
+        population.cross_genomes(crossover_prob=1.0)
+
+        self.assertTrue(np.array_equal(population.genomes[:10], original[:10]))
+        self.assertFalse(np.array_equal(population.genomes, original))
+        self.assertTrue(np.all(population.packed_genomes[:, -1] & 0b111 == 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import warnings
+import multiprocessing as mp
+import numpy as np
+from pystrand.fitnessfunctions import BaseFunction
+from pystrand.optimizers import BaseOptimizer
+from pystrand.fitnessfunctions import OneMaxFunction
+from pystrand.parallel import SharedMemoryEvaluator, ThreadPoolEvaluator
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+
+
+class SumFn:
+    """Fitness function without batch evaluation.
+    """
+    def __call__(self, genome):
+        return float(np.sum(genome))
+
+
+class BatchSumFn(BaseFunction):
+    """Fitness function with batch evaluation.
+    """
+    def __evaluate_batch__(self, genomes):
+        return genomes.sum(axis=1)
+
+
+class Test_shared_memory_evaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = np.random.default_rng(0).choice([0, 1], (1000, 100)).astype('uint8')
+
+    def test_evaluation(self):
+        for fitness_fn in [SumFn(), BatchSumFn()]:
+            evaluator = SharedMemoryEvaluator(fitness_fn, n_workers=2)
+            try:
+                fitness = evaluator.evaluate(self.genomes, timeout=10)
+                self.assertTrue(np.array_equal(fitness, self.genomes.sum(axis=1)))
+
+                fitness = evaluator.evaluate(self.genomes[:10], genome_shape=(10, 10), timeout=10)
+                self.assertTrue(np.array_equal(fitness, self.genomes[:10].sum(axis=1)))
+            finally:
+                evaluator.close()
+
+    def test_block_reallocation(self):
+        evaluator = SharedMemoryEvaluator(SumFn(), n_workers=2, chunk_size=7)
+        try:
+            for pop_size in [10, 100, 1000]:
+                fitness = evaluator.evaluate(self.genomes[:pop_size], timeout=10)
+                self.assertTrue(np.array_equal(
+                    fitness, self.genomes[:pop_size].sum(axis=1)))
+        finally:
+            evaluator.close()
+
+    def test_resource_tracker(self):
+        """
+        Blocks attached by workers are neither leaked nor cleaned up twice,
+        the resource tracker doesn't report anything once the evaluator is closed.
+        """
+        script = (
+            "import numpy as np\n"
+            "from pystrand.parallel import SharedMemoryEvaluator\n"
+            "from pystrand.fitnessfunctions import OneMaxFunction\n"
+            "for _ in range(2):\n"
+            "    evaluator = SharedMemoryEvaluator(OneMaxFunction(), n_workers=2)\n"
+            "    for pop_size in [10, 1000]:\n"
+            "        evaluator.evaluate(np.ones((pop_size, 10)), timeout=10)\n"
+            "    evaluator.close()\n")
+
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertEqual(result.stderr, '')
+
+
+class Test_shared_memory_optimizer(unittest.TestCase):
+
+    def test_optimizer_run(self):
+        population = MatrixPopulation(200, (20,), random_init=True)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', ResourceWarning)
+            new_optimizer = BaseOptimizer(
+                population,
+                max_iterations=5,
+                parallelize='shared_memory',
+                n_workers=2,
+                evaluation_timeout=10)
+            history = new_optimizer.fit(SumFn(), verbose=0)
+
+        self.assertIsNone(new_optimizer._worker_pool)
+        self.assertGreater(len(history['iteration']), 0)
+        self.assertLessEqual(max(history['max_fitness']), 20)
+        self.assertGreater(min(history['min_fitness']), 0)
+
+    def test_optimizer_validation(self):
+        self.assertRaises(
+            TypeError,
+            BaseOptimizer, BasePopulation(10, (10,)), parallelize='shared_memory')
+        self.assertRaises(
+            ValueError,
+            BaseOptimizer, MatrixPopulation(10, (10,)), parallelize='foo')
+
+
+class Test_thread_pool_evaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = np.random.default_rng(0).choice([0, 1], (1000, 100)).astype('uint8')
+
+    def test_evaluation(self):
+        threads = set()
+
+        def evaluate_chunk(genomes):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return genomes.sum(axis=1)
+
+        evaluator = ThreadPoolEvaluator(n_workers=4, chunk_size=37)
+        try:
+            fitness = evaluator.evaluate(self.genomes, evaluate_chunk, timeout=10)
+            self.assertTrue(np.array_equal(fitness, self.genomes.sum(axis=1)))
+            self.assertEqual(evaluator.evaluate(self.genomes[:0], evaluate_chunk).size, 0)
+        finally:
+            evaluator.close()
+
+        self.assertGreater(len(threads), 1)
+
+    def test_timeout(self):
+        evaluator = ThreadPoolEvaluator(n_workers=1, chunk_size=1)
+        try:
+            with self.assertRaises(mp.TimeoutError):
+                evaluator.evaluate(
+                    self.genomes[:10],
+                    lambda genomes: time.sleep(0.1) or genomes.sum(axis=1),
+                    timeout=0.05)
+        finally:
+            evaluator.close(terminate=True)
+
+
+class Test_thread_pool_optimizer(unittest.TestCase):
+
+    def test_optimizer_evaluation(self):
+        populations = [
+            (BasePopulation(100, (20,), random_init=True), SumFn(), 1),
+            (MatrixPopulation(100, (20,), random_init=True), BatchSumFn(), 1),
+            (PackedBinaryPopulation(100, (20,), random_init=True), OneMaxFunction(), 1/20)]
+
+        for population, fitness_fn, scale in populations:
+            with BaseOptimizer(
+                    population,
+                    fitness_function=fitness_fn,
+                    parallelize='threads',
+                    n_workers=2,
+                    chunk_size=9) as new_optimizer:
+                new_optimizer.evaluate_population()
+                self.assertIsInstance(new_optimizer._worker_pool, ThreadPoolEvaluator)
+
+            expected = [scale*genotype.sum() for genotype in population.genotypes]
+            self.assertTrue(np.allclose(population.fitness, expected))
+            self.assertIsNone(new_optimizer._worker_pool)
+
+    def test_evaluation_count(self):
+        """
+        Evaluations of chunks running in several threads are all counted.
+        """
+        fitness_fn = BatchSumFn()
+        population = MatrixPopulation(2000, (5,), random_init=True)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with BaseOptimizer(
+                    population,
+                    fitness_function=fitness_fn,
+                    parallelize='threads',
+                    n_workers=8,
+                    chunk_size=1) as new_optimizer:
+                for _ in range(5):
+                    new_optimizer.evaluate_population()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(fitness_fn.evaluated, 10000)
+
+        #Counting waits for the lock held by another thread.
+        counting = threading.Thread(
+            target=fitness_fn.evaluate_batch, args=(np.ones((1, 5)),))
+        with fitness_fn._evaluated_lock:
+            counting.start()
+            counting.join(timeout=0.1)
+            self.assertTrue(counting.is_alive())
+            self.assertEqual(fitness_fn.evaluated, 10000)
+        counting.join()
+        self.assertEqual(fitness_fn.evaluated, 10001)
+
+        fitness_fn = pickle.loads(pickle.dumps(fitness_fn))
+        fitness_fn.evaluate_batch(np.ones((3, 5)))
+        self.assertEqual(fitness_fn.evaluated, 10004)
+
+    def test_optimizer_run(self):
+        new_optimizer = BaseOptimizer(
+            MatrixPopulation(200, (20,), random_init=True),
+            max_iterations=5,
+            parallelize='threads',
+            n_workers=2)
+        history = new_optimizer.fit(BatchSumFn(), verbose=0)
+
+        self.assertIsNone(new_optimizer._worker_pool)
+        self.assertEqual(len(history['iteration']), 5)
+        self.assertLessEqual(max(history['max_fitness']), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
-from pystrand.populations import BasePopulation
+import numpy as np
+from pystrand.populations import BasePopulation, MatrixPopulation
+from pystrand.packed import PackedBinaryPopulation
+import pystrand.operators.mutations as mut
 from pystrand.genotypes import Genotype
 
 class Test_population(unittest.TestCase):
@@ -26,5 +29,173 @@ class Test_population(unittest.TestCase):
             for individual_fitness in population.individuals['fitness']:
                 self.assertTrue(individual_fitness == 0.0)
 
+    def test_fitness_statistics(self):
+        for population_type in [BasePopulation, MatrixPopulation]:
+            population = population_type(100, (10,))
+            population.fitness[:] = np.random.default_rng(0).normal(size=100)
+
+            statistics = population.fitness_statistics()
+
+            self.assertAlmostEqual(statistics['max_fitness'], population.max_fitness)
+            self.assertAlmostEqual(statistics['min_fitness'], population.min_fitness)
+            self.assertAlmostEqual(statistics['fitness_avg'], population.avg_fitness)
+            self.assertAlmostEqual(statistics['fitness_std'], population.fitness_std)
+
+    def test_retrieve_best(self):
+        for population_type in [BasePopulation, MatrixPopulation]:
+            population = population_type(100, (10,), random_init=True)
+            population.fitness[:] = np.random.default_rng(0).permutation(100)
+
+            for size in [0, 1, 10, 100, 200]:
+                indices = population.best_indices(size)
+                self.assertTrue(np.array_equal(
+                    population.fitness[indices],
+                    np.arange(100)[100 - min(size, 100):]))
+
+            best = population.retrieve_best(10)
+            self.assertTrue(np.array_equal(best['fitness'], np.arange(90, 100)))
+            best['genotype'][-1][:] = 2
+            self.assertFalse((population.genotypes[population.best_indices()[0]] == 2).any())
+
+            best = population.retrieve_best(10, copy=False)
+            best['genotype'][-1][:] = 2
+            self.assertTrue((population.genotypes[population.best_indices()[0]] == 2).all())
+
+    def test_replace_worst(self):
+        for population_type in [BasePopulation, MatrixPopulation, PackedBinaryPopulation]:
+            population = population_type(20, (3, 7), random_init=True, gene_vals=[0, 1])
+            population.fitness[:] = np.arange(20)
+            migrants = population_type(5, (3, 7), default_genome=np.ones((3, 7)))
+            migrants.fitness[:] = 100
+            individuals = migrants.individuals
+            for genotype in individuals['genotype']:
+                genotype.protected = True
+
+            population.replace_worst(individuals)
+
+            self.assertEqual(population.population_size, 20)
+            self.assertEqual(sorted(population.worst_indices(3)), [5, 6, 7])
+            self.assertTrue(np.all(population.fitness[:5] == 100))
+            for genotype in population.genotypes[:5]:
+                self.assertTrue(np.all(genotype == 1))
+                self.assertFalse(genotype.protected)
+
+
+class Test_matrix_population(unittest.TestCase):
+    pop_sizes = [i for i in range(0, 100, 10)]
+
+    def test_individual_generation(self):
+        for pop_size in self.pop_sizes:
+            population = MatrixPopulation(
+                pop_size,
+                (10, 2),
+                random_init=True,
+                gene_vals=[-1, 1])
+
+            self.assertEqual(population.population_size, pop_size)
+            self.assertEqual(population.genomes.shape, (pop_size, 20))
+            self.assertEqual(population.fitness.shape, (pop_size,))
+            self.assertFalse(population.protected.any())
+
+            for individual in population.individuals:
+                self.assertIsInstance(individual['genotype'], Genotype)
+                self.assertEqual(individual['genotype'].shape, (10, 2))
+
+    def test_genotype_views(self):
+        population = MatrixPopulation(10, (5,))
+
+        population.individuals['genotype'][3][:] = 1.0
+        population.fitness[3] = 0.5
+
+        self.assertTrue(np.array_equiv(population.genomes[3], 1.0))
+        self.assertEqual(population.max_fitness, 0.5)
+        self.assertEqual(population.individuals['fitness'][3], 0.5)
+
+        #Writes into arrays built on access would be lost, they are rejected.
+        with self.assertRaises(ValueError):
+            population.individuals['fitness'][3] = 1.0
+        with self.assertRaises(ValueError):
+            population.genotypes[3] = population.genotypes[4]
+
+    def test_seed_individuals(self):
+        population = BasePopulation(10, (5,), random_init=True)
+        population.individuals['fitness'] = np.arange(10)
+        population.individuals['genotype'][0].protected = True
+
+        matrix_population = MatrixPopulation(
+            10, (5,), seed_individuals=population.individuals)
+
+        self.assertTrue(np.array_equal(
+            matrix_population.genomes,
+            np.stack(population.individuals['genotype'])))
+        self.assertEqual(matrix_population.max_fitness, 9.0)
+        self.assertTrue(matrix_population.protected[0])
+        self.assertEqual(matrix_population.protected.sum(), 1)
+
+    def test_expand_population(self):
+        population = MatrixPopulation(10, (5,), random_init=True)
+        population.protected[:] = True
+
+        for strategy in ['clone', 'random']:
+            population.expand_population(
+                population.population_size + 10, strategy=strategy)
+
+        self.assertEqual(population.population_size, 30)
+        self.assertEqual(population.protected.sum(), 10)
+
+        for population in [BasePopulation(10, (5,)), MatrixPopulation(10, (5,))]:
+            self.assertRaises(ValueError, population.expand_population, 20, strategy='copy')
+            self.assertEqual(population.population_size, 10)
+
+    def test_replace_generation(self):
+        for double_buffered in [False, True]:
+            population = MatrixPopulation(
+                10, (5,), random_init=True, double_buffered=double_buffered)
+            population.fitness[:] = np.arange(10)
+            genomes = population.genomes.copy()
+
+            population.replace_generation([([9, 8], True), ([0], False)])
+
+            self.assertEqual(population.population_size, 10)
+            self.assertTrue(np.array_equal(population.genomes[:3], genomes[[9, 8, 0]]))
+            self.assertTrue(np.array_equal(population.protected[:3], [True, True, False]))
+            self.assertFalse(population.protected[3:].any())
+            self.assertTrue(np.isin(population.fitness[3:], [9, 8, 0]).all())
+            for genome, fitness in zip(population.genomes, population.fitness):
+                self.assertTrue(np.array_equal(genome, genomes[int(fitness)]))
+
+    def test_buffer_swap(self):
+        population = MatrixPopulation(10, (5,), double_buffered=True)
+        genomes = population.genomes
+
+        population.replace_generation([(np.arange(5), False)])
+        self.assertFalse(np.shares_memory(genomes, population.genomes))
+
+        population.replace_generation([(np.arange(5), False)])
+        self.assertTrue(np.shares_memory(genomes, population.genomes))
+
+    def test_genome_dtype(self):
+        for population_type in [BasePopulation, MatrixPopulation]:
+            population = population_type(
+                100, (10,), random_init=True, gene_vals=[-1, 0, 1], dtype='auto')
+
+            for genotype in population.genotypes:
+                self.assertEqual(genotype.dtype, np.int8)
+            self.assertEqual(population.genome_dtype, np.int8)
+
+        population = MatrixPopulation(
+            100, (10,), random_init=True, gene_vals=[-1, 0, 1], dtype='auto')
+        population.mutate_genotypes([mut.PointMutation(1.0), mut.ShiftMutation(1.0)])
+        population.cross_genomes(crossover_prob=1.0)
+        population.replace_generation([(np.arange(10), True)])
+        population.expand_population(200, strategy='random')
+
+        self.assertEqual(population.genomes.dtype, np.int8)
+        self.assertTrue(np.isin(population.genomes, [-1, 0, 1]).all())
+
+    def test_mixed_shapes(self):
+        self.assertRaises(ValueError, MatrixPopulation, 2, [(5,), (6,)])
+
+
 if __name__ == '__main__':
     unittest.main()